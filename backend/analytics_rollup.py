@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""Compactação do histórico de eventos (data/analytics.db) em colunas tipadas por dia/jogo.
+
+Cada partição `<saida>/day=AAAA-MM-DD/game=<slug>-<hash>/` guarda um `.npy` por coluna
+(ts, event, tipo, severidade, gap_h, gap_a, clock_delta_s, latency_ms) e um `meta.json`.
+Os `.npy` são lidos com `np.load(mmap_mode="r")`, sem parse de JSON por linha.
+`_state.json` é o commit: guarda quantas linhas de cada partição valem, e o que
+passar disso (crash entre as colunas e o estado) é cortado na leitura e na próxima escrita.
+
+Uso: `python -m backend.analytics_rollup [--db data/analytics.db] [--out data/rollups]`
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+import numpy as np
+
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+DEFAULT_DB = ROOT_DIR / "data" / "analytics.db"
+DEFAULT_OUT = ROOT_DIR / "data" / "rollups"
+
+NO_GAME = "_sem_jogo"
+SEVERITY_CODES = {"BAIXA": 0, "MEDIA": 1, "ALTA": 2, "CRITICA": 3}
+
+COLUMNS: dict[str, np.dtype] = {
+    "ts": np.dtype("float64"),
+    "event": np.dtype("int16"),
+    "tipo": np.dtype("int16"),
+    "severidade": np.dtype("int8"),
+    "gap_h": np.dtype("float32"),
+    "gap_a": np.dtype("float32"),
+    "clock_delta_s": np.dtype("float32"),
+    "latency_ms": np.dtype("float32"),
+}
+
+
+def _slug(game: str) -> str:
+    # nomes diferentes podem sanitizar igual ("A/B" e "A B"): o hash do nome original desempata
+    readable = re.sub(r"[^A-Za-z0-9._-]+", "_", game).strip("_")[:48] or NO_GAME
+    return f"{readable}-{hashlib.sha1(game.encode('utf-8')).hexdigest()[:10]}"
+
+
+def _part_key(day: str, game: str) -> str:
+    return f"day={day}/game={_slug(game)}"
+
+
+def _num(*values: Any) -> float:
+    for value in values:
+        if value is None or isinstance(value, bool):
+            continue
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            continue
+        if number == number:  # NaN não conta como valor presente
+            return number
+    return float("nan")
+
+
+def _diff(a: Any, b: Any) -> float:
+    return _num(a) - _num(b)
+
+
+def extract_row(payload: dict[str, Any]) -> dict[str, Any]:
+    """Campos tipados de um evento (payloads do bot e JSONs do Oráculo). Ausente = NaN/-1."""
+    diagnosis = payload.get("diagnostico_saas") or {}
+    metrics = payload.get("server_metrics") or {}
+
+    gap_h = _num(payload.get("diff_a"), payload.get("gap_h"))
+    gap_a = _num(payload.get("diff_b"), payload.get("gap_a"))
+    if np.isnan(gap_h):
+        gap_h = _num(_diff(payload.get("target_a"), payload.get("bet_a")), _diff(payload.get("t_a"), payload.get("b_a")))
+    if np.isnan(gap_a):
+        gap_a = _num(_diff(payload.get("target_b"), payload.get("bet_b")), _diff(payload.get("t_b"), payload.get("b_b")))
+
+    return {
+        "tipo": diagnosis.get("tipo") or payload.get("tipo") or payload.get("tipo_pontuacao"),
+        "severidade": SEVERITY_CODES.get(diagnosis.get("severidade") or payload.get("severidade") or "", -1),
+        "gap_h": gap_h,
+        "gap_a": gap_a,
+        "clock_delta_s": _num(payload.get("clock_delta_s"), payload.get("delta_s"), payload.get("age_seconds")),
+        "latency_ms": _num(
+            metrics.get("latencia_processamento_ms"), payload.get("latencia_ms"), payload.get("latency_ms")
+        ),
+    }
+
+
+class _Dictionary:
+    """Códigos estáveis para strings (evento, tipo), compartilhados por todas as partições."""
+
+    def __init__(self, names: list[str] | None = None) -> None:
+        self.names = list(names or [])
+        self._codes = {name: i for i, name in enumerate(self.names)}
+
+    def code(self, name: str | None) -> int:
+        if not name:
+            return -1
+        code = self._codes.get(name)
+        if code is None:
+            code = self._codes[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+class RollupWriter:
+    """Compacta incrementalmente: só eventos com id acima do último compactado entram."""
+
+    def __init__(self, out_dir: str | Path = DEFAULT_OUT) -> None:
+        self.out_dir = Path(out_dir)
+        self._state_path = self.out_dir / "_state.json"
+        state = json.loads(self._state_path.read_text(encoding="utf-8")) if self._state_path.exists() else {}
+        self.last_id = int(state.get("last_id", 0))
+        self.events = _Dictionary(state.get("events"))
+        self.tipos = _Dictionary(state.get("tipos"))
+        # linhas confirmadas por partição (o que passar disso nos .npy é resto de crash)
+        self.rows: dict[str, int] = {k: int(v) for k, v in (state.get("rows") or {}).items()}
+
+    def compact(self, db_path: str | Path = DEFAULT_DB) -> dict[str, Any]:
+        partitions: dict[tuple[str, str], dict[str, list]] = {}
+        last_id = self.last_id
+        with sqlite3.connect(f"file:{db_path}?mode=ro", uri=True) as conn:
+            rows = conn.execute(
+                "SELECT id, ts, event_name, game, payload_json FROM events WHERE id > ? ORDER BY id",
+                (self.last_id,),
+            )
+            for event_id, ts, event_name, game, payload_json in rows:
+                try:
+                    payload = json.loads(payload_json)
+                except ValueError:
+                    payload = {}
+                if not isinstance(payload, dict):
+                    payload = {}
+                row = extract_row(payload)
+                day = datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%d")
+                cols = partitions.setdefault((day, game or NO_GAME), {name: [] for name in COLUMNS})
+                cols["ts"].append(ts)
+                cols["event"].append(self.events.code(event_name))
+                cols["tipo"].append(self.tipos.code(row["tipo"]))
+                for name in ("severidade", "gap_h", "gap_a", "clock_delta_s", "latency_ms"):
+                    cols[name].append(row[name])
+                last_id = event_id
+
+        for (day, game), cols in partitions.items():
+            self._append(day, game, cols)
+
+        self.last_id = last_id
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        _write_atomic(
+            self._state_path,
+            json.dumps(
+                {"last_id": self.last_id, "events": self.events.names, "tipos": self.tipos.names, "rows": self.rows},
+                ensure_ascii=False,
+            ).encode("utf-8"),
+        )
+        return {
+            "partitions": len(partitions),
+            "rows": sum(len(c["ts"]) for c in partitions.values()),
+            "last_id": self.last_id,
+        }
+
+    def _append(self, day: str, game: str, cols: dict[str, list]) -> None:
+        key = _part_key(day, game)
+        part = self.out_dir / key
+        part.mkdir(parents=True, exist_ok=True)
+        committed = self.rows.get(key, 0)
+        for name, dtype in COLUMNS.items():
+            new = np.asarray(cols[name], dtype=dtype)
+            path = part / f"{name}.npy"
+            if path.exists() and committed:
+                new = np.concatenate([np.load(path)[:committed], new])
+            tmp = part / f"{name}.npy.tmp"
+            with open(tmp, "wb") as fh:
+                np.save(fh, new)
+            os.replace(tmp, path)
+        self.rows[key] = committed + len(cols["ts"])
+        _write_atomic(
+            part / "meta.json",
+            json.dumps({"day": day, "game": game, "rows": self.rows[key]}, ensure_ascii=False).encode("utf-8"),
+        )
+
+
+class RollupReader:
+    """Leitura memory-mapped das partições (agregações direto em NumPy)."""
+
+    def __init__(self, out_dir: str | Path = DEFAULT_OUT) -> None:
+        self.out_dir = Path(out_dir)
+        state_path = self.out_dir / "_state.json"
+        state = json.loads(state_path.read_text(encoding="utf-8")) if state_path.exists() else {}
+        self.event_names: list[str] = state.get("events", [])
+        self.tipo_names: list[str] = state.get("tipos", [])
+        self.rows: dict[str, int] = {k: int(v) for k, v in (state.get("rows") or {}).items()}
+
+    def _rows(self, part: Path) -> int:
+        return self.rows.get(f"{part.parent.name}/{part.name}", 0)
+
+    def partitions(self, *, day_from: str | None = None, day_to: str | None = None, game: str | None = None) -> Iterator[Path]:
+        for day_dir in sorted(self.out_dir.glob("day=*")):
+            day = day_dir.name[4:]
+            if (day_from and day < day_from) or (day_to and day > day_to):
+                continue
+            # só partições com linhas confirmadas no _state.json
+            if game is not None:
+                part = day_dir / f"game={_slug(game)}"
+                if part.is_dir() and self._rows(part):
+                    yield part
+            else:
+                yield from sorted(p for p in day_dir.glob("game=*") if p.is_dir() and self._rows(p))
+
+    def _column(self, part: Path, name: str) -> np.ndarray:
+        return np.load(part / f"{name}.npy", mmap_mode="r")[: self._rows(part)]
+
+    def load(self, part: Path) -> dict[str, np.ndarray]:
+        return {name: self._column(part, name) for name in COLUMNS}
+
+    def games(self, **filters: Any) -> list[str]:
+        return sorted({json.loads((p / "meta.json").read_text(encoding="utf-8"))["game"] for p in self.partitions(**filters)})
+
+    def column(self, name: str, **filters: Any) -> np.ndarray:
+        parts = [self._column(p, name) for p in self.partitions(**filters)]
+        if not parts:
+            return np.empty(0, dtype=COLUMNS[name])
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def event_code(self, name: str) -> int:
+        return self.event_names.index(name) if name in self.event_names else -1
+
+    def distribution(self, column: str, *, event: str | None = None, **filters: Any) -> dict[str, Any]:
+        """Contagem e percentis de uma coluna numérica (ex.: clock_delta_s por jogo no mês)."""
+        values = self.column(column, **filters)
+        if event is not None:
+            values = values[self.column("event", **filters) == self.event_code(event)]
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return {"count": 0}
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        return {
+            "count": int(len(values)),
+            "mean": round(float(values.mean()), 3),
+            "p50": round(float(p50), 3),
+            "p95": round(float(p95), 3),
+            "p99": round(float(p99), 3),
+            "max": round(float(values.max()), 3),
+        }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compacta data/analytics.db em colunas .npy por dia/jogo")
+    parser.add_argument("--db", default=str(DEFAULT_DB))
+    parser.add_argument("--out", default=str(DEFAULT_OUT))
+    parser.add_argument("--report", default="clock_delta_s", help="coluna para o resumo por jogo")
+    args = parser.parse_args()
+
+    print(f"🗜️ {RollupWriter(args.out).compact(args.db)}")
+    reader = RollupReader(args.out)
+    for game in reader.games():
+        print(f"  {game}: {args.report} {reader.distribution(args.report, game=game)}")
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from core.game_clock import GameClock
+from core.game_timeline import GameTimeline
+from core.line_store import LineStore
+from core.score_fusion import ScoreFusion
+
+
+DEFAULT_GAME = "default"
+
+
+def shard_for(game_id: str, num_shards: int) -> int:
+    """Shard estável do jogo (crc32, igual em todos os workers)."""
+    if num_shards <= 1:
+        return 0
+    return zlib.crc32(game_id.encode("utf-8")) % num_shards
+
+
+@dataclass(slots=True)
+class GameSession:
+    game_id: str
+    shard: int
+    timeline: GameTimeline = field(default_factory=GameTimeline)
+    clock: GameClock = field(default_factory=GameClock)
+    fusion: ScoreFusion = field(default_factory=ScoreFusion)
+    lines: LineStore = field(default_factory=LineStore)
+    latest: dict[str, Any] | None = None
+    updated_at: float | None = None
+    ticks: int = 0
+    seq: int = 0
+
+
+class GameSessionManager:
+    """Estado por jogo (timeline, fusão, último resultado), particionado em shards.
+
+    Cada worker é dono de um shard (`shard_index`): só ele processa os ticks dos jogos
+    daquele shard. O último resultado de qualquer jogo chega a todos os workers via broker.
+    Cada resultado gravado recebe um `seq` crescente (por worker), usado em ETag e long-poll.
+    """
+
+    def __init__(self, *, num_shards: int = 1, shard_index: int | None = 0) -> None:
+        self.num_shards = max(1, num_shards)
+        self.shard_index = shard_index
+        self._sessions: dict[str, GameSession] = {}
+        self.latest: dict[str, Any] | None = None
+        self.seq = 0
+        self._changed: asyncio.Condition | None = None
+
+    def assign(self, num_shards: int, shard_index: int | None) -> None:
+        self.num_shards = max(1, num_shards)
+        self.shard_index = shard_index
+        for session in self._sessions.values():
+            session.shard = shard_for(session.game_id, self.num_shards)
+
+    def shard_of(self, game_id: str) -> int:
+        return shard_for(game_id, self.num_shards)
+
+    def owns(self, game_id: str) -> bool:
+        # sem shard atribuído (broker fora) o worker processa tudo localmente
+        return self.shard_index is None or self.num_shards == 1 or self.shard_of(game_id) == self.shard_index
+
+    def get(self, game_id: str) -> GameSession | None:
+        return self._sessions.get(game_id)
+
+    def session(self, game_id: str | None) -> GameSession:
+        key = game_id or DEFAULT_GAME
+        session = self._sessions.get(key)
+        if session is None:
+            session = self._sessions[key] = GameSession(game_id=key, shard=self.shard_of(key))
+        return session
+
+    def record(self, game_id: str | None, result: dict[str, Any]) -> GameSession:
+        """Guarda o resultado mais recente do jogo (local ou vindo de outro worker)."""
+        session = self.session(game_id)
+        session.latest = result
+        session.updated_at = time.time()
+        session.ticks += 1
+        self.seq += 1
+        session.seq = self.seq
+        self.latest = result
+        return session
+
+    def seq_of(self, game_id: str | None) -> int:
+        """Sequência do último resultado do jogo (ou de qualquer jogo, sem `game_id`)."""
+        if not game_id:
+            return self.seq
+        session = self._sessions.get(game_id)
+        return session.seq if session is not None else 0
+
+    def _condition(self) -> asyncio.Condition:
+        if self._changed is None:
+            self._changed = asyncio.Condition()
+        return self._changed
+
+    async def notify(self) -> None:
+        """Acorda os long-polls parados em `wait_newer` (chamar depois de `record`)."""
+        changed = self._condition()
+        async with changed:
+            changed.notify_all()
+
+    async def wait_newer(self, game_id: str | None, since: int, timeout_s: float) -> int:
+        """Espera até existir resultado com seq > `since` ou o timeout; devolve o seq atual."""
+        if self.seq_of(game_id) > since or timeout_s <= 0:
+            return self.seq_of(game_id)
+        changed = self._condition()
+        try:
+            async with changed:
+                await asyncio.wait_for(changed.wait_for(lambda: self.seq_of(game_id) > since), timeout_s)
+        except asyncio.TimeoutError:
+            pass
+        return self.seq_of(game_id)
+
+    def sessions(self) -> list[GameSession]:
+        return list(self._sessions.values())
+
+    def snapshot(self, keep: Callable[[str], bool] | None = None) -> dict[str, Any]:
+        """Estado dos jogos (todos, ou os aceitos por `keep`) para o snapshot em disco (ver backend.session_snapshot)."""
+        wall_offset = time.time() - time.monotonic()
+        return {
+            "seq": self.seq,
+            "latest": self.latest,
+            "games": [
+                {
+                    "game_id": s.game_id,
+                    "latest": s.latest,
+                    "updated_at": s.updated_at,
+                    "ticks": s.ticks,
+                    "seq": s.seq,
+                    "timeline": s.timeline.snapshot(wall_offset),
+                    "fusion": s.fusion.snapshot(wall_offset),
+                    "clock": s.clock.snapshot(wall_offset),
+                    "lines": s.lines.snapshot(),
+                }
+                for s in self._sessions.values()
+                if keep is None or keep(s.game_id)
+            ],
+        }
+
+    def restore(self, state: dict[str, Any]) -> int:
+        """Recria as sessões de um snapshot; devolve quantos jogos voltaram."""
+        wall_offset = time.time() - time.monotonic()
+        for game in state.get("games") or []:
+            session = self.session(game["game_id"])
+            session.latest = game.get("latest")
+            session.updated_at = game.get("updated_at")
+            session.ticks = int(game.get("ticks") or 0)
+            session.seq = int(game.get("seq") or 0)
+            session.timeline.restore(game.get("timeline") or {}, wall_offset)
+            session.fusion.restore(game.get("fusion") or {}, wall_offset)
+            session.clock.restore(game.get("clock") or {}, wall_offset)
+            session.lines.extend(game.get("lines") or [])
+        self.seq = max(self.seq, int(state.get("seq") or 0))
+        self.latest = state.get("latest", self.latest)
+        return len(state.get("games") or [])
+
+    def drop(self, game_id: str) -> bool:
+        return self._sessions.pop(game_id, None) is not None
@@ -3,40 +3,228 @@
 Gemini knowledge helper for strategic guidance.
 """
 
-import google.generativeai as genai
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+
+FALLBACK_MODELS = [
+    "gemini-2.5-flash",
+    "gemini-2.0-flash",
+    "gemini-1.5-flash",
+]
+RATE_LIMIT_TOKENS = ("429", "quota", "rate limit", "resource exhausted")
+SKIP_TOKENS = RATE_LIMIT_TOKENS + ("not found", "not supported")
+
+
+def _try_import_glm():
+    try:
+        from google.ai import generativelanguage as glm  # type: ignore
+
+        return glm
+    except Exception:
+        return None
+
+
+def _service_client(api_key: str) -> Any:
+    """Cliente público do SDK (GenerativeServiceClient) com a key desta instância, sem `genai.configure`."""
+    glm = _try_import_glm()
+    if glm is None:
+        raise RuntimeError("Dependência ausente: google-generativeai. Instale: pip install google-generativeai")
+    return glm.GenerativeServiceClient(client_options={"api_key": api_key})
+
+
+def to_contents(contents: Any) -> list[dict[str, Any]]:
+    """Conteúdo do payload (textos + blobs {mime_type, data}) -> `contents` do GenerateContentRequest."""
+    if isinstance(contents, (str, dict)):
+        contents = [contents]
+    if all(isinstance(c, dict) and "parts" in c for c in contents):
+        return list(contents)
+    parts = [{"text": c} if isinstance(c, str) else {"inline_data": c} for c in contents]
+    return [{"role": "user", "parts": parts}]
+
+
+def response_text(response: Any) -> str:
+    """Texto do primeiro candidato da resposta (soma das partes de texto)."""
+    for candidate in getattr(response, "candidates", None) or []:
+        content = getattr(candidate, "content", None)
+        text = "".join(getattr(part, "text", "") or "" for part in getattr(content, "parts", None) or [])
+        if text:
+            return text
+    return ""
+
+
+def payload_hash(payload: Any) -> str:
+    """Hash estável do payload de entrada (chave do cache de respostas)."""
+    if isinstance(payload, (bytes, bytearray)):
+        data = bytes(payload)
+    else:
+        data = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+class GeminiClient:
+    """Camada de acesso ao Gemini com handles reutilizados, cache e single-flight.
+
+    - A key fica no cliente de serviço desta instância (GenerativeServiceClient, API pública
+      do SDK), não no `genai.configure` (global do processo): dois clientes com keys
+      diferentes não vazam um para o outro. O cliente (canal gRPC) é criado uma vez só.
+    - Respostas ficam num cache TTL+LRU indexado por (modelo, hash do prompt, hash do payload).
+    - Prompts idênticos em voo ao mesmo tempo compartilham a mesma chamada (`ask_async`).
+    - Modelos que retornaram 429/quota ficam em cooldown e vão para o fim da fila de fallback.
+
+    `service_factory(api_key)` permite injetar um stub no lugar do cliente do SDK.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        service_factory: Callable[[str], Any] | None = None,
+        cache_ttl_s: float = 30.0,
+        cache_max_entries: int = 256,
+        rate_limit_cooldown_s: float = 60.0,
+    ) -> None:
+        if not api_key:
+            raise RuntimeError("GEMINI_API_KEY nao configurada.")
+
+        self._service = (service_factory or _service_client)(api_key)
+        self._cooldown_until: dict[str, float] = {}
+        self._cache: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self.cache_ttl_s = cache_ttl_s
+        self.cache_max_entries = cache_max_entries
+        self.rate_limit_cooldown_s = rate_limit_cooldown_s
+
+    @staticmethod
+    def cache_key(model_name: str, prompt_sha256: str, payload_sha256: str = "") -> str:
+        return f"{model_name}:{prompt_sha256}:{payload_sha256}"
+
+    def _generate_content(self, name: str, contents: Any) -> str:
+        model = name if name.startswith(("models/", "tunedModels/")) else f"models/{name}"
+        response = self._service.generate_content(request={"model": model, "contents": to_contents(contents)})
+        return response_text(response)
+
+    def _candidates(self, model_name: str) -> list[str]:
+        now = time.monotonic()
+        ordered = list(dict.fromkeys([model_name, *FALLBACK_MODELS]))
+        ready = [m for m in ordered if self._cooldown_until.get(m, 0.0) <= now]
+        cooling = sorted((m for m in ordered if m not in ready), key=lambda m: self._cooldown_until[m])
+        return ready + cooling
+
+    def generate(self, model_name: str, contents: Any) -> str:
+        """Chamada direta (sem cache), percorrendo o fallback de modelos."""
+        tried = []
+        last_exception = None
+
+        for candidate in self._candidates(model_name):
+            tried.append(candidate)
+            try:
+                text = self._generate_content(candidate, contents)
+                if text:
+                    self._cooldown_until.pop(candidate, None)
+                    return text
+            except Exception as exc:
+                last_exception = exc
+                error_text = str(exc).lower()
+                if any(token in error_text for token in SKIP_TOKENS):
+                    self._cooldown_until[candidate] = time.monotonic() + self.rate_limit_cooldown_s
+                    continue
+                raise
+
+        if last_exception:
+            raise RuntimeError(f"Falha Gemini em todos os modelos tentados {tried}: {last_exception}")
+        return "Sem resposta da Gemini."
+
+    def cached(self, key: str) -> str | None:
+        with self._lock:
+            item = self._cache.get(key)
+            if item is None:
+                return None
+            expires_at, text = item
+            if expires_at < time.monotonic():
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return text
+
+    def _store(self, key: str, text: str) -> None:
+        with self._lock:
+            self._cache[key] = (time.monotonic() + self.cache_ttl_s, text)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_max_entries:
+                self._cache.popitem(last=False)
+
+    def ask(self, model_name: str, contents: Any, *, key: str | None = None) -> str:
+        """Versão síncrona com cache (sem single-flight)."""
+        if key is not None:
+            hit = self.cached(key)
+            if hit is not None:
+                return hit
+        text = self.generate(model_name, contents)
+        if key is not None:
+            self._store(key, text)
+        return text
+
+    async def ask_async(self, model_name: str, contents: Any, *, key: str | None = None) -> str:
+        """Versão assíncrona: cache + coalescência de prompts idênticos em voo.
+
+        A chamada ao SDK (bloqueante) roda em thread, sem travar o event loop. A chamada
+        compartilhada é uma task própria e cada chamador espera via `asyncio.shield`:
+        cancelar um chamador (inclusive o primeiro) não cancela os outros.
+        """
+        if key is None:
+            return await asyncio.to_thread(self.generate, model_name, contents)
+
+        hit = self.cached(key)
+        if hit is not None:
+            return hit
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(asyncio.to_thread(self.generate, model_name, contents))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if task.cancelled():
+            return
+        # lê a exceção mesmo sem ninguém esperando (evita "exception was never retrieved")
+        if task.exception() is None:
+            self._store(key, task.result())
+
+
+MAX_CLIENTS = 8
+_clients: OrderedDict[str, GeminiClient] = OrderedDict()
+_clients_lock = threading.Lock()
+
+
+def get_gemini_client(api_key: str) -> GeminiClient:
+    """Cliente compartilhado por API key (LRU de até MAX_CLIENTS, indexado pelo hash da key)."""
+    slot = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+    with _clients_lock:
+        client = _clients.get(slot)
+        if client is None:
+            client = GeminiClient(api_key)
+            _clients[slot] = client
+            while len(_clients) > MAX_CLIENTS:
+                _clients.popitem(last=False)
+        else:
+            _clients.move_to_end(slot)
+    return client
 
 
 def ask_gemini(api_key: str, model_name: str, prompt: str) -> str:
     if not api_key:
         raise RuntimeError("GEMINI_API_KEY nao configurada.")
-
-    genai.configure(api_key=api_key)
-
-    fallback_models = [
-        model_name,
-        "gemini-2.5-flash",
-        "gemini-2.0-flash",
-        "gemini-1.5-flash",
-    ]
-    tried = []
-    last_exception = None
-
-    for candidate in fallback_models:
-        if candidate in tried:
-            continue
-        tried.append(candidate)
-        try:
-            model = genai.GenerativeModel(model_name=candidate)
-            response = model.generate_content(prompt)
-            if response and getattr(response, "text", None):
-                return response.text
-        except Exception as exc:
-            last_exception = exc
-            error_text = str(exc).lower()
-            if any(token in error_text for token in ["429", "quota", "rate limit", "resource exhausted", "not found", "not supported"]):
-                continue
-            raise
-
-    if last_exception:
-        raise RuntimeError(f"Falha Gemini em todos os modelos tentados {tried}: {last_exception}")
-    return "Sem resposta da Gemini."
+    return get_gemini_client(api_key).generate(model_name, prompt)
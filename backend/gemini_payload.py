@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+from dataclasses import dataclass
+from typing import Any
+
+from core.vision_bllsport import crop_image_pil, decode_base64_image
+
+
+# Instrução fixa: faz parte do prefixo estável (prompt + instrução), igual em toda chamada.
+JSON_ONLY_INSTRUCTION = "RETORNE APENAS JSON VÁLIDO (SEM TEXTO EXTRA)."
+
+FRAME_MAX_SIDE = 640
+FRAME_MAX_BYTES = 48_000
+FRAME_QUALITIES = (80, 65, 50, 35)
+
+
+@dataclass
+class FramePart:
+    mime_type: str
+    data: bytes
+    width: int
+    height: int
+    original_bytes: int
+
+    def as_content(self) -> dict[str, Any]:
+        return {"mime_type": self.mime_type, "data": self.data}
+
+
+@dataclass
+class GeminiPayload:
+    contents: list[Any]
+    payload_sha256: str
+    request_bytes: int
+    frame: FramePart | None = None
+    frame_error: str | None = None
+
+
+def build_prompt_prefix(prompt_text: str) -> str:
+    """Prefixo estável (prompt principal + instrução) reutilizado entre chamadas."""
+    return f"{prompt_text}\n\n{JSON_ONLY_INSTRUCTION}\n"
+
+
+def prepare_frame_part(
+    frame_base64: str,
+    crop: dict[str, int] | None = None,
+    *,
+    max_side: int = FRAME_MAX_SIDE,
+    max_bytes: int = FRAME_MAX_BYTES,
+) -> FramePart:
+    """Recorta no ROI do placar, reduz e re-encoda em JPEG com tamanho limitado."""
+    original_bytes = len(frame_base64)
+    img = crop_image_pil(decode_base64_image(frame_base64), crop)
+    if max(img.size) > max_side:
+        img.thumbnail((max_side, max_side))
+
+    data = b""
+    for quality in FRAME_QUALITIES:
+        buf = io.BytesIO()
+        img.save(buf, format="JPEG", quality=quality, optimize=True)
+        data = buf.getvalue()
+        if len(data) <= max_bytes:
+            break
+    else:
+        # ainda grande: reduz resolução pela metade uma última vez
+        img.thumbnail((max(1, img.width // 2), max(1, img.height // 2)))
+        buf = io.BytesIO()
+        img.save(buf, format="JPEG", quality=FRAME_QUALITIES[-1], optimize=True)
+        data = buf.getvalue()
+
+    return FramePart(
+        mime_type="image/jpeg",
+        data=data,
+        width=img.width,
+        height=img.height,
+        original_bytes=original_bytes,
+    )
+
+
+def build_gemini_payload(
+    prompt_text: str,
+    inputs: dict[str, Any],
+    *,
+    frame_base64: str | None = None,
+    frame_crop: dict[str, int] | None = None,
+) -> GeminiPayload:
+    """Monta o conteúdo multimodal: [prefixo estável, frame (imagem), INPUT_JSON].
+
+    O frame vai como parte de imagem (bytes JPEG), nunca como base64 dentro do texto.
+    """
+    frame: FramePart | None = None
+    frame_error: str | None = None
+    if frame_base64:
+        try:
+            frame = prepare_frame_part(frame_base64, frame_crop)
+        except Exception as exc:
+            frame_error = str(exc)
+
+    body = dict(inputs)
+    if frame is not None:
+        body["FRAME"] = f"anexo {frame.mime_type} {frame.width}x{frame.height}"
+    elif frame_error:
+        body["FRAME_ERRO"] = frame_error
+    input_text = "INPUT_JSON:\n" + json.dumps(body, ensure_ascii=False, sort_keys=True)
+
+    contents: list[Any] = [build_prompt_prefix(prompt_text)]
+    if frame is not None:
+        contents.append(frame.as_content())
+    contents.append(input_text)
+
+    digest = hashlib.sha256(input_text.encode("utf-8"))
+    if frame is not None:
+        digest.update(frame.data)
+
+    request_bytes = sum(len(c.encode("utf-8")) if isinstance(c, str) else len(c["data"]) for c in contents)
+    return GeminiPayload(
+        contents=contents,
+        payload_sha256=digest.hexdigest(),
+        request_bytes=request_bytes,
+        frame=frame,
+        frame_error=frame_error,
+    )
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from core.oracle_nba import ERROR_PRIORITY
+
+
+PRIORITY_CLASSES = ["CRITICA", "ALTA", "MEDIA", "BAIXA"]
+_SEVERITY_RANK = {name: rank for rank, name in enumerate(PRIORITY_CLASSES)}
+
+# Ticks destas classes (jogo "quieto") podem ser coalescidos: só o mais recente importa.
+COALESCE_FROM = _SEVERITY_RANK["MEDIA"]
+
+
+class IngestShed(Exception):
+    """Tick descartado porque a fila estourou (sobrecarga)."""
+
+
+def estimate_priority(latest: dict[str, Any] | None, *, score_gap: int = 0) -> int:
+    """Classe de prioridade (0=CRITICA .. 3=BAIXA) do próximo tick de um jogo.
+
+    Usa o último diagnóstico do jogo (tipo na ordem de ERROR_PRIORITY + severidade)
+    e o gap de placar aberto no tick recebido (vídeo vs Bet365).
+    """
+    rank = _SEVERITY_RANK["BAIXA"]
+    diagnosis = (latest or {}).get("diagnostico_saas") or {}
+    if diagnosis.get("erro_detectado"):
+        rank = _SEVERITY_RANK.get(diagnosis.get("severidade") or "", rank)
+        tipo = diagnosis.get("tipo")
+        if tipo in ERROR_PRIORITY:
+            # os dois primeiros tipos da hierarquia são sempre tratados como críticos
+            rank = min(rank, 0 if ERROR_PRIORITY.index(tipo) < 2 else 1)
+    if score_gap >= 4:
+        rank = min(rank, _SEVERITY_RANK["CRITICA"])
+    elif score_gap >= 2:
+        rank = min(rank, _SEVERITY_RANK["ALTA"])
+    return rank
+
+
+@dataclass(slots=True)
+class _Job:
+    game_id: str
+    priority: int
+    payload: Any
+    enqueued_at: float
+    future: asyncio.Future
+    request_ids: list[str] = field(default_factory=list)
+    merged: list[asyncio.Future] = field(default_factory=list)
+    coalesce: bool = True
+
+
+@dataclass
+class _ClassStats:
+    submitted: int = 0
+    processed: int = 0
+    coalesced: int = 0
+    shed: int = 0
+    delays_ms: deque = field(default_factory=lambda: deque(maxlen=1024))
+
+    def snapshot(self) -> dict[str, Any]:
+        ordered = sorted(self.delays_ms)
+
+        def pct(p: float) -> float | None:
+            if not ordered:
+                return None
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 2)
+
+        return {
+            "submitted": self.submitted,
+            "processed": self.processed,
+            "coalesced": self.coalesced,
+            "shed": self.shed,
+            "queue_delay_ms": {"p50": pct(0.50), "p95": pct(0.95), "p99": pct(0.99), "max": pct(1.0)},
+        }
+
+
+Handler = Callable[[Any, list[str]], Awaitable[dict[str, Any]]]
+
+
+class IngestScheduler:
+    """Fila de ingest com prioridade por jogo, na frente do oráculo + broadcast.
+
+    - Cada jogo tem sua fila FIFO e é processado em série (timeline/fusão têm estado).
+    - Jogos prontos saem de um heap pela melhor prioridade pendente (CRITICA primeiro).
+    - Em jogos quietos (MEDIA/BAIXA) o tick novo substitui o pendente ainda não iniciado;
+      `coalesce=False` (lotes NDJSON/WS, onde cada tick traz linhas e um ack próprio) desliga isso.
+    - Acima de `max_pending` ticks, descarta o pendente mais velho da pior classe.
+    """
+
+    def __init__(self, handler: Handler, *, workers: int = 4, max_pending: int = 2000) -> None:
+        self.handler = handler
+        self.workers = workers
+        self.max_pending = max_pending
+        self._queues: dict[str, deque[_Job]] = {}
+        self._running: set[str] = set()
+        self._ready: list[tuple[int, int, str]] = []
+        self._seq = itertools.count()
+        self._pending = 0
+        self._wakeup: asyncio.Condition | None = None
+        self._tasks: list[asyncio.Task] = []
+        self.stats = [_ClassStats() for _ in PRIORITY_CLASSES]
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Condition()
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"ingest-scheduler-{i}") for i in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        for queue in self._queues.values():
+            for job in queue:
+                for future in (job.future, *job.merged):
+                    if not future.done():
+                        future.cancel()
+        self._queues.clear()
+        self._ready.clear()
+        self._pending = 0
+
+    async def submit(
+        self,
+        game_id: str,
+        payload: Any,
+        *,
+        priority: int,
+        request_id: str | None = None,
+        coalesce: bool = True,
+    ) -> dict[str, Any]:
+        request_ids = [request_id] if request_id else []
+        if not self.running:
+            return await self.handler(payload, request_ids)
+
+        priority = max(0, min(priority, len(PRIORITY_CLASSES) - 1))
+        stats = self.stats[priority]
+        stats.submitted += 1
+        loop = asyncio.get_running_loop()
+        queue = self._queues.get(game_id)
+
+        # jogo quieto: substitui o tick pendente (ainda não iniciado) pelo mais novo
+        if coalesce and priority >= COALESCE_FROM and queue and queue[-1].coalesce and queue[-1].priority >= COALESCE_FROM:
+            job = queue[-1]
+            stats.coalesced += 1
+            job.payload = payload
+            job.request_ids.extend(request_ids)
+            future = loop.create_future()
+            job.merged.append(future)
+            return await future
+
+        if self._pending >= self.max_pending and not self._shed_one(priority):
+            stats.shed += 1
+            raise IngestShed(f"Fila de ingest cheia ({self._pending}); tick {PRIORITY_CLASSES[priority]} descartado")
+
+        job = _Job(
+            game_id=game_id,
+            priority=priority,
+            payload=payload,
+            enqueued_at=time.perf_counter(),
+            future=loop.create_future(),
+            request_ids=request_ids,
+            coalesce=coalesce,
+        )
+        # só depois do descarte: ele pode ter esvaziado (e removido) a fila deste mesmo jogo
+        queue = self._queues.setdefault(game_id, deque())
+        queue.append(job)
+        self._pending += 1
+        if game_id not in self._running:
+            heapq.heappush(self._ready, (priority, next(self._seq), game_id))
+        async with self._wakeup:
+            self._wakeup.notify()
+        return await job.future
+
+    def _shed_one(self, incoming_priority: int) -> bool:
+        """Descarta o tick pendente mais velho da pior classe (se for pior que o novo)."""
+        victim: tuple[int, float, str] | None = None
+        for game_id, queue in self._queues.items():
+            for job in queue:
+                key = (job.priority, -job.enqueued_at, game_id)
+                if job.priority > incoming_priority and (victim is None or key > victim):
+                    victim = key
+        if victim is None:
+            return False
+        queue = self._queues[victim[2]]
+        for job in queue:
+            if job.priority == victim[0] and -job.enqueued_at == victim[1]:
+                queue.remove(job)
+                self._pending -= 1
+                self.stats[job.priority].shed += 1
+                error = IngestShed(f"Tick {PRIORITY_CLASSES[job.priority]} descartado por sobrecarga")
+                for future in (job.future, *job.merged):
+                    if not future.done():
+                        future.set_exception(error)
+                break
+        # fila vazia de jogo parado sai do dict (se estiver rodando, o worker remove no fim)
+        if not queue and victim[2] not in self._running:
+            del self._queues[victim[2]]
+        return True
+
+    def _next_game(self) -> str | None:
+        while self._ready:
+            _, _, game_id = heapq.heappop(self._ready)
+            if game_id not in self._running and self._queues.get(game_id):
+                return game_id
+        return None
+
+    async def _worker(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            async with self._wakeup:
+                game_id = self._next_game()
+                while game_id is None:
+                    await self._wakeup.wait()
+                    game_id = self._next_game()
+                self._running.add(game_id)
+
+            queue = self._queues[game_id]
+            job = queue.popleft()
+            self._pending -= 1
+            stats = self.stats[job.priority]
+            stats.delays_ms.append((time.perf_counter() - job.enqueued_at) * 1000.0)
+            try:
+                result = await self.handler(job.payload, job.request_ids)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                for future in (job.future, *job.merged):
+                    if not future.done():
+                        future.set_exception(exc)
+            else:
+                stats.processed += 1
+                for future in (job.future, *job.merged):
+                    if not future.done():
+                        future.set_result(result)
+            finally:
+                self._running.discard(game_id)
+                if queue:
+                    heapq.heappush(self._ready, (min(j.priority for j in queue), next(self._seq), game_id))
+                    async with self._wakeup:
+                        self._wakeup.notify()
+                else:
+                    self._queues.pop(game_id, None)
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "pending": self._pending,
+            "games_queued": sum(1 for q in self._queues.values() if q),
+            "workers": self.workers,
+            "classes": {name: self.stats[i].snapshot() for i, name in enumerate(PRIORITY_CLASSES)},
+        }
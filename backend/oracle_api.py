@@ -1,45 +1,144 @@
 from __future__ import annotations
 
-import hashlib
+import asyncio
 import json
+import os
+import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-
-from backend.gemini_knowledge import ask_gemini
+from pydantic import BaseModel, ValidationError
+
+from backend.gemini_knowledge import GeminiClient, get_gemini_client
+from backend.game_sessions import DEFAULT_GAME, GameSession, GameSessionManager
+from backend.gemini_payload import build_gemini_payload
+from backend.ingest_scheduler import IngestScheduler, IngestShed, estimate_priority
+from backend.oracle_schema import FeedV2, OracleAnalyzeRequest, OracleTickV2, make_feed, tick_from_v1
+from backend.prompt_registry import PromptEntry, PromptRegistry
+from backend.pubsub_broker import BrokerClient
+from backend.runtime_config import get_runtime_config
+from backend.session_snapshot import SessionSnapshotter
 from core.oracle_nba import build_oracle_output
-from core.vision_bllsport import analyze_bllsport_frame
-from core.nba_official import fetch_balldontlie_game
+from core.score_fusion import ScoreFusion
+from core.ocr_engines import close_ocr_pool
+from core.vision_bllsport import analyze_bllsport_frame_async
+from core.nba_official import BalldontlieClient, OfficialResult, close_shared_clients
+from core.official_poller import OfficialScorePoller, OfficialScoreStore
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
-PROMPT_PATH = ROOT_DIR / "prompts" / "ORACLE_PROMPT_PRINCIPAL.txt"
+PROMPTS_DIR = ROOT_DIR / "prompts"
+PROMPT_PATH = PROMPTS_DIR / "ORACLE_PROMPT_PRINCIPAL.txt"
+DEFAULT_PROMPT = "principal"
 
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).astimezone().isoformat(timespec="seconds")
 
 
-def _load_prompt() -> str:
-    if not PROMPT_PATH.exists():
-        raise RuntimeError(f"Prompt principal não encontrado: {PROMPT_PATH}")
-    return PROMPT_PATH.read_text(encoding="utf-8")
+prompt_registry = PromptRegistry()
+prompt_registry.register(DEFAULT_PROMPT, PROMPT_PATH)
+for _extra in sorted(PROMPTS_DIR.glob("*.txt")):
+    if _extra != PROMPT_PATH:
+        prompt_registry.register(_extra.stem.lower(), _extra)
 
 
-def _prompt_meta(prompt: str) -> dict[str, Any]:
-    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
-    stat = PROMPT_PATH.stat() if PROMPT_PATH.exists() else None
-    return {
-        "sha256": digest,
-        "chars": len(prompt),
-        "updated_at": datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc).astimezone().isoformat(timespec="seconds") if stat else None,
-    }
+def _prompt_entry(name: str = DEFAULT_PROMPT) -> PromptEntry:
+    try:
+        return prompt_registry.get(name)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Prompt não encontrado: {name}")
+
+
+def _load_prompt(name: str = DEFAULT_PROMPT) -> str:
+    return _prompt_entry(name).text
+
 
+runtime_config = get_runtime_config()
 
-app = FastAPI(title="Oracle NBA API", version="1.0.0")
+official_client = BalldontlieClient(
+    base_url=os.getenv("BALLDONTLIE_BASE_URL", "https://api.balldontlie.io/v1"),
+    api_key=os.getenv("BALLDONTLIE_API_KEY"),
+    timeout_s=float(runtime_config.current.get("http_timeout_seconds", 5.0)),
+)
+# timeout por requisição: muda com a config sem recriar o pool de conexões
+runtime_config.subscribe(
+    lambda snap: setattr(official_client, "timeout_s", float(snap.get("http_timeout_seconds", 5.0)))
+)
+official_store = OfficialScoreStore()
+official_poller = OfficialScorePoller(official_client, official_store)
+
+# Multi-worker: ORACLE_BROKER=unix:/tmp/oracle.sock (ou tcp:127.0.0.1:8765) + ORACLE_SHARDS=<n workers>
+BROKER_ADDRESS = os.getenv("ORACLE_BROKER")
+WORKER_ID = str(os.getpid())
+FORWARD_TIMEOUT_S = 2.0
+LATEST_MAX_WAIT_MS = 30_000
+sessions = GameSessionManager(num_shards=int(os.getenv("ORACLE_SHARDS", "1")), shard_index=None if BROKER_ADDRESS else 0)
+# Warm restart: ORACLE_SNAPSHOT_INTERVAL_S=0 desliga. ORACLE_SNAPSHOT_PATH é a base: cada shard
+# grava o próprio arquivo (sessions.shard<i>.json.gz) e restaura só os jogos dele
+snapshotter = SessionSnapshotter(
+    sessions,
+    Path(os.getenv("ORACLE_SNAPSHOT_PATH", str(ROOT_DIR / "data" / "snapshots" / "sessions.json.gz"))),
+    interval_s=float(os.getenv("ORACLE_SNAPSHOT_INTERVAL_S", "5")),
+    poller=official_poller,
+    shard=None if BROKER_ADDRESS else (1, 0),
+)
+broker_client: BrokerClient | None = None
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _on_assign(num_shards: int, shard_index: int | None) -> None:
+    sessions.assign(num_shards, shard_index)
+    # jogos rastreados que mudaram de shard passam a ser polidos (e salvos) pelo novo dono
+    for game in official_poller.tracked():
+        if not sessions.owns(game.game_id):
+            official_poller.untrack(game.game_id)
+    if snapshotter.interval_s > 0:
+        snapshotter.assign(num_shards, shard_index)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global broker_client
+    if snapshotter.interval_s > 0:
+        # sem broker roda antes do uvicorn abrir a porta: o primeiro tick já encontra o estado
+        # anterior; com broker o shard só chega no welcome (_on_assign)
+        snapshotter.restore()
+    runtime_config.start()
+    await official_client.start()
+    official_poller.start()
+    ingest_scheduler.start()
+    snapshotter.start()
+    if BROKER_ADDRESS:
+        # todo worker é candidato: quem ganha a eleição hospeda o broker e, se ele cair,
+        # outro assume na reconexão
+        broker_client = BrokerClient(
+            BROKER_ADDRESS,
+            worker_id=WORKER_ID,
+            on_message=_on_broker_message,
+            on_assign=_on_assign,
+            host_shards=sessions.num_shards,
+        )
+        broker_client.start()
+    try:
+        yield
+    finally:
+        if broker_client is not None:
+            await broker_client.stop()
+        await ingest_scheduler.stop()
+        if snapshotter.interval_s > 0:
+            await snapshotter.stop()
+        await official_poller.stop()
+        await official_client.aclose()
+        await close_shared_clients()
+        await runtime_config.stop()
+        close_ocr_pool()
+
+
+app = FastAPI(title="Oracle NBA API", version="1.0.0", lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -68,21 +167,24 @@ def debug_routes() -> dict[str, Any]:
 
 class _WSManager:
     def __init__(self) -> None:
-        self._connections: set[WebSocket] = set()
+        # websocket -> filtro de jogo (None = todos os jogos)
+        self._connections: dict[WebSocket, str | None] = {}
 
-    async def connect(self, websocket: WebSocket) -> None:
+    async def connect(self, websocket: WebSocket, game_id: str | None = None) -> None:
         await websocket.accept()
-        self._connections.add(websocket)
+        self._connections[websocket] = game_id
 
     def disconnect(self, websocket: WebSocket) -> None:
-        self._connections.discard(websocket)
+        self._connections.pop(websocket, None)
 
-    async def broadcast_json(self, payload: dict[str, Any]) -> None:
+    async def broadcast_json(self, payload: dict[str, Any], game_id: str | None = None) -> None:
         if not self._connections:
             return
         message = json.dumps(payload, ensure_ascii=False)
         dead: list[WebSocket] = []
-        for ws in list(self._connections):
+        for ws, wanted in list(self._connections.items()):
+            if wanted is not None and wanted != game_id:
+                continue
             try:
                 await ws.send_text(message)
             except Exception:
@@ -92,7 +194,6 @@ class _WSManager:
 
 
 ws_manager = _WSManager()
-latest_oracle: dict[str, Any] | None = None
 
 
 @app.get("/api/status")
@@ -101,108 +202,380 @@ def status() -> dict[str, Any]:
         "status": "ok",
         "timestamp": _now_iso(),
         "service": "oracle-nba",
-        "prompt": _prompt_meta(_load_prompt()),
+        "prompt": _prompt_entry().meta(),
+        "snapshot": snapshotter.stats(),
+        "config": runtime_config.stats(),
     }
 
 
 @app.get("/api/oracle/prompt")
-def oracle_prompt(include_text: bool = False) -> dict[str, Any]:
-    prompt = _load_prompt()
+def oracle_prompt(include_text: bool = False, name: str = DEFAULT_PROMPT) -> dict[str, Any]:
+    entry = _prompt_entry(name)
     data: dict[str, Any] = {
         "status": "ok",
         "timestamp": _now_iso(),
-        "prompt_meta": _prompt_meta(prompt),
+        "prompt_meta": entry.meta(),
+        "available": prompt_registry.names(),
+        "versions": prompt_registry.versions(name),
     }
     if include_text:
-        data["prompt_text"] = prompt
+        data["prompt_text"] = entry.text
     return data
 
 
-class OracleAnalyzeRequest(BaseModel):
-    video_live: dict | None = None
-    frame_base64: str | None = None
-    frame_crop: dict | None = None
-    bet365: dict | None = None
-    nba_oficial: dict | None = None
-    system: dict | None = None
-
-
 @app.post("/api/oracle/analyze")
 def oracle_analyze(request: OracleAnalyzeRequest) -> dict[str, Any]:
-    video = request.video_live or {}
-    bet = request.bet365 or {}
-    official = request.nba_oficial or {}
-    system = request.system or {}
+    """Schema v1 (aliases livres); normaliza uma vez para o v2 e segue o mesmo pipeline.
+
+    Análise avulsa: não escreve no estado do jogo (isso é papel do ingest).
+    """
+    return analyze_tick(tick_from_v1(request))
+
+
+async def _tick_from_body(request: Request) -> OracleTickV2:
+    # caminho rápido: valida os bytes do corpo direto no pydantic-core (sem dict intermediário)
+    try:
+        return OracleTickV2.model_validate_json(await request.body())
+    except ValidationError as exc:
+        raise HTTPException(status_code=422, detail=exc.errors(include_url=False, include_context=False))
 
-    video_score = video.get("placar") or video.get("placar_video") or video.get("score")
-    video_clock = video.get("tempo") or video.get("tempo_video")
 
-    bet_score = bet.get("placar_geral") or bet.get("placar") or bet.get("score")
-    bet_clock = bet.get("tempo_bet") or bet.get("tempo")
-    bet_lines = bet.get("linhas") or bet.get("lines") or []
+@app.post("/api/v2/oracle/analyze")
+async def oracle_analyze_v2(request: Request) -> dict[str, Any]:
+    """Schema v2 (OracleTickV2): placares inteiros e relógio em segundos já estruturados (sem estado)."""
+    return analyze_tick(await _tick_from_body(request))
 
-    official_score = official.get("placar") or official.get("score")
-    official_clock = official.get("tempo")
 
-    latency_ms = system.get("latencia_ms") or system.get("latency_ms")
-    status_stream = system.get("status_stream") or system.get("stream") or "OK"
+def _score_of(feed: FeedV2 | None) -> dict[str, int] | None:
+    return feed.score.as_dict() if feed is not None and feed.score is not None else None
+
+
+def _clock_of(feed: FeedV2 | None) -> str | None:
+    return feed.clock_text if feed is not None else None
+
+
+def analyze_tick(tick: OracleTickV2, *, session: GameSession | None = None) -> dict[str, Any]:
+    """Roda o oráculo sobre um tick.
+
+    Com `session` (ingest, sempre no event loop) alimenta timeline, fusão, relógio e linhas
+    do jogo. Sem ela (endpoints de análise, que rodam no threadpool) só lê: a fusão é
+    descartável e usa apenas as fontes do próprio tick.
+    """
+    official = tick.official
+    official_observed_at = None
+    if official is None and tick.game_id:
+        # placar oficial empurrado pelo poller (sem I/O no caminho do ingest)
+        stored = official_store.as_oracle_input(tick.game_id)
+        if stored:
+            official = make_feed(stored.get("placar"), stored.get("tempo"))
+            official_observed_at = official_store.observed_at(tick.game_id)
+
+    video, bet, fallback = tick.video, tick.bet, tick.fallback
+    video_score, video_clock = _score_of(video), _clock_of(video)
+    official_score, official_clock = _score_of(official), _clock_of(official)
+
+    fusion = session.fusion if session is not None else ScoreFusion()
+
+    # Leitura de vídeo impossível (placar caiu, salto > 3, relógio voltou/saltou) => mantém o último placar válido
+    verdict = session.timeline.observe(video_score, video_clock) if session is not None and video_score is not None else None
+    rejected = verdict is not None and not verdict.accepted
+    if rejected:
+        video_score = verdict.score
+    else:
+        fusion.update("video", video_score, video_clock, confidence=video.confidence if video is not None else 1.0)
+    fusion.update("official", official_score, official_clock, observed_at=official_observed_at)
+    fusion.update(
+        "fallback",
+        _score_of(fallback),
+        _clock_of(fallback),
+        latency_ms=fallback.latency_ms if fallback is not None else None,
+    )
+    fused = fusion.fuse()
+
+    # relógio do vídeo: toda leitura que a timeline não rejeitou reancora o modelo (inclusive
+    # só relógio, sem placar); sem leitura ou leitura rejeitada, usa o relógio extrapolado
+    if session is not None:
+        if video_clock is not None and not rejected:
+            session.clock.observe(video_clock)
+        else:
+            video_clock = session.clock.label()
 
     return build_oracle_output(
         video_score=video_score,
         video_clock=video_clock,
-        bet_score=bet_score,
-        bet_clock=bet_clock,
-        bet_lines=bet_lines,
+        bet_score=_score_of(bet),
+        bet_clock=_clock_of(bet),
+        bet_lines=tick.bet_lines,
         official_score=official_score,
         official_clock=official_clock,
-        system_status_stream=status_stream,
-        latency_ms=float(latency_ms) if latency_ms is not None else None,
+        system_status_stream=tick.status_stream or "OK",
+        latency_ms=tick.latency_ms,
+        truth_score=fused.score,
+        line_store=session.lines if session is not None else None,
     )
 
 
+def _score_gap(tick: OracleTickV2) -> int:
+    """Gap de placar (vídeo à frente da Bet365) já visível no tick, sem rodar o oráculo."""
+    v = tick.video.score if tick.video is not None else None
+    b = tick.bet.score if tick.bet is not None else None
+    if v is None or b is None:
+        return 0
+    return max(v.H - b.H, v.A - b.A, 0)
+
+
+async def _schedule_ingest(tick: OracleTickV2, *, request_id: str | None = None, coalesce: bool = True) -> dict[str, Any]:
+    game_key = tick.game_id or DEFAULT_GAME
+    session = sessions.get(game_key)
+    priority = estimate_priority(session.latest if session else None, score_gap=_score_gap(tick))
+    return await ingest_scheduler.submit(game_key, tick, priority=priority, request_id=request_id, coalesce=coalesce)
+
+
 @app.post("/api/oracle/ingest")
 async def oracle_ingest(request: OracleAnalyzeRequest) -> dict[str, Any]:
     """Ingestão em tempo real: calcula o JSON do Oráculo e faz broadcast via WebSocket."""
-    global latest_oracle
-    started = datetime.now(timezone.utc)
-    # Se vier frame_base64 e não veio video_live, tenta OCR (bllsport)
-    if request.frame_base64 and not request.video_live:
-        vision = analyze_bllsport_frame(request.frame_base64, crop=request.frame_crop)
+    try:
+        return await _ingest_one(tick_from_v1(request))
+    except IngestShed as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+
+
+@app.post("/api/v2/oracle/ingest")
+async def oracle_ingest_v2(request: Request) -> dict[str, Any]:
+    """Ingestão em tempo real com o schema v2 (OracleTickV2)."""
+    tick = await _tick_from_body(request)
+    try:
+        return await _ingest_one(tick)
+    except IngestShed as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+
+
+async def _ingest_one(tick: OracleTickV2, *, coalesce: bool = True) -> dict[str, Any]:
+    game_key = tick.game_id or DEFAULT_GAME
+    if broker_client is not None and broker_client.connected and not sessions.owns(game_key):
+        # o jogo pertence a outro shard: OCR aqui (o frame não atravessa o broker), encaminha
+        # só os campos extraídos e espera o resultado publicado pelo dono
+        started = datetime.now(timezone.utc)
+        ocr = bool(tick.frame_base64 and tick.video is None)
+        await _apply_ocr(tick)
+        if ocr and tick.latency_ms is None:
+            # o OCR é o grosso do processamento e rodou aqui, não no dono
+            tick.latency_ms = float(int((datetime.now(timezone.utc) - started).total_seconds() * 1000))
+        try:
+            result = await broker_client.request(
+                {
+                    "type": "ingest",
+                    "game_id": game_key,
+                    "shard": sessions.shard_of(game_key),
+                    "coalesce": coalesce,
+                    "payload": tick.model_dump(mode="json", exclude_defaults=True, exclude={"frame_base64", "frame_crop"}),
+                },
+                request_id=uuid.uuid4().hex,
+                timeout_s=FORWARD_TIMEOUT_S,
+            )
+        except asyncio.TimeoutError:
+            # o dono aceitou o tick: processar aqui também duplicaria o estado do jogo
+            raise IngestShed(f"Tick encaminhado ao shard {sessions.shard_of(game_key)} sem resposta")
+        if result is not None:
+            return result
+        # ninguém aceitou (dono fora do ar): o pedido foi cancelado e roda localmente
+    return await _schedule_ingest(tick, coalesce=coalesce)
+
+
+async def _iter_ndjson(request: Request):
+    """Linhas NDJSON do corpo, lidas incrementalmente (chunked)."""
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if buffer.strip():
+        yield buffer
+
+
+def _parse_line(line: bytes, schema: str) -> OracleTickV2:
+    if schema == "v2":
+        return OracleTickV2.model_validate_json(line)
+    return tick_from_v1(OracleAnalyzeRequest.model_validate_json(line))
+
+
+async def _ingest_batch(batch: list[tuple[int, bytes]], *, schema: str = "v1") -> dict[str, Any]:
+    ticks: list[tuple[int, OracleTickV2]] = []
+    errors: list[dict[str, Any]] = []
+    for line_no, line in batch:
+        try:
+            ticks.append((line_no, _parse_line(line, schema)))
+        except Exception as exc:
+            errors.append({"line": line_no, "error": str(exc)[:300]})
+
+    # ordem de submissão preservada => cada jogo continua FIFO no scheduler; sem coalescer,
+    # cada tick do lote roda (linhas e checagens intermediárias) e tem o próprio resultado
+    outcomes = await asyncio.gather(*(_ingest_one(tick, coalesce=False) for _, tick in ticks), return_exceptions=True)
+    games: dict[str, str] = {}
+    for (line_no, tick), outcome in zip(ticks, outcomes):
+        if isinstance(outcome, BaseException):
+            errors.append({"line": line_no, "error": str(outcome)[:300]})
+        else:
+            games[tick.game_id or DEFAULT_GAME] = outcome["diagnostico_saas"]["tipo"]
+    return {"accepted": len(ticks) - sum(isinstance(o, BaseException) for o in outcomes), "errors": errors, "games": games}
+
+
+def _ack_line(payload: dict[str, Any]) -> str:
+    return json.dumps(payload, ensure_ascii=False) + "\n"
+
+
+@app.post("/api/oracle/ingest/bulk")
+async def oracle_ingest_bulk(
+    request: Request,
+    batch_size: int = Query(100, ge=1, le=5000),
+    schema: str = Query("v1", pattern="^v[12]$"),
+) -> Response:
+    """Ingestão em lote: corpo NDJSON (um tick por linha, vários jogos; `schema=v1|v2`).
+
+    O corpo é lido incrementalmente e cada lote de `batch_size` ticks roda assim que
+    completa; a resposta traz um ack NDJSON por lote. Para acks em tempo real use `/ws/oracle/ingest`.
+    """
+    acks: list[str] = []
+    batch: list[tuple[int, bytes]] = []
+    line_no = 0
+    total = 0
+    async for line in _iter_ndjson(request):
+        line_no += 1
+        batch.append((line_no, line))
+        if len(batch) >= batch_size:
+            ack = await _ingest_batch(batch, schema=schema)
+            total += ack["accepted"]
+            acks.append(_ack_line({"type": "ack", "batch": len(acks) + 1, "lines": len(batch), **ack}))
+            batch = []
+    if batch:
+        ack = await _ingest_batch(batch, schema=schema)
+        total += ack["accepted"]
+        acks.append(_ack_line({"type": "ack", "batch": len(acks) + 1, "lines": len(batch), **ack}))
+    acks.append(_ack_line({"type": "done", "batches": len(acks), "lines": line_no, "accepted": total, "timestamp": _now_iso()}))
+    return Response(content="".join(acks), media_type="application/x-ndjson")
+
+
+@app.websocket("/ws/oracle/ingest")
+async def ws_oracle_ingest(websocket: WebSocket, schema: str = "v1"):
+    """Ingestão persistente: cada mensagem de texto é um lote NDJSON; responde um ack por lote."""
+    await websocket.accept()
+    batch_no = 0
+    try:
+        while True:
+            text = await websocket.receive_text()
+            batch = [(i, line.encode("utf-8")) for i, line in enumerate(text.split("\n"), start=1) if line.strip()]
+            if not batch:
+                continue
+            ack = await _ingest_batch(batch, schema="v2" if schema == "v2" else "v1")
+            batch_no += 1
+            await websocket.send_text(json.dumps({"type": "ack", "batch": batch_no, "lines": len(batch), **ack}, ensure_ascii=False))
+    except WebSocketDisconnect:
+        pass
+
+
+async def _apply_ocr(tick: OracleTickV2) -> None:
+    """Se vier frame_base64 e não veio placar de vídeo, tenta OCR (bllsport)."""
+    if tick.frame_base64 and tick.video is None:
+        crop = tick.frame_crop.model_dump() if tick.frame_crop is not None else None
+        vision = await analyze_bllsport_frame_async(tick.frame_base64, crop=crop)
         if vision.ok:
-            request.video_live = {
-                "placar": vision.placar,
-                "tempo": vision.tempo_video,
-                "ocr": {"raw_text": vision.raw_text[:2000]},
-            }
+            tick.video = make_feed(vision.placar, vision.tempo_video, ocr_raw_text=vision.raw_text)
         else:
             # Marca stream como fallback (mantém pipeline vivo)
-            system = request.system or {}
-            system.setdefault("status_stream", "FALLBACK")
-            system.setdefault("stream_error", vision.error)
-            request.system = system
+            tick.status_stream = tick.status_stream or "FALLBACK"
+            tick.stream_error = tick.stream_error or vision.error
+
+
+async def _process_ingest(tick: OracleTickV2, request_ids: list[str] | None = None) -> dict[str, Any]:
+    started = datetime.now(timezone.utc)
+    await _apply_ocr(tick)
 
     # Se latência não foi informada pelo client, usa tempo de processamento do servidor
-    system = request.system or {}
-    if system.get("latencia_ms") is None and system.get("latency_ms") is None:
-        elapsed_ms = int((datetime.now(timezone.utc) - started).total_seconds() * 1000)
-        system["latencia_ms"] = elapsed_ms
-        request.system = system
-
-    result = oracle_analyze(request)
-    latest_oracle = result
-    await ws_manager.broadcast_json(result)
+    if tick.latency_ms is None:
+        tick.latency_ms = float(int((datetime.now(timezone.utc) - started).total_seconds() * 1000))
+
+    result = analyze_tick(tick, session=sessions.session(tick.game_id))
+    if tick.game_id:
+        result["game_id"] = tick.game_id
+    await _publish_result(tick.game_id, result, request_ids=request_ids)
     return result
 
 
+ingest_scheduler = IngestScheduler(_process_ingest)
+
+
+async def _publish_result(game_id: str | None, result: dict[str, Any], *, request_ids: list[str] | None = None) -> None:
+    """Registra o resultado na sessão, faz broadcast local e repassa aos outros workers."""
+    sessions.record(game_id, result)
+    await sessions.notify()
+    await ws_manager.broadcast_json(result, game_id)
+    if broker_client is not None:
+        await broker_client.publish(
+            {"type": "result", "game_id": game_id, "request_ids": request_ids or [], "payload": result}
+        )
+
+
+async def _on_broker_message(message: dict[str, Any]) -> None:
+    kind = message.get("type")
+    if kind == "result":
+        game_id = message.get("game_id")
+        payload = message.get("payload") or {}
+        sessions.record(game_id, payload)
+        await sessions.notify()
+        await ws_manager.broadcast_json(payload, game_id)
+        if broker_client is not None:
+            for request_id in message.get("request_ids") or []:
+                broker_client.resolve(request_id, payload)
+    elif kind == "official_result":
+        if broker_client is not None:
+            broker_client.resolve(message.get("request_id"), message.get("payload") or {})
+    elif kind == "official" and message.get("shard") == sessions.shard_index:
+        if broker_client is not None and not await broker_client.claim(message.get("request_id")):
+            return
+        payload = _apply_official(message.get("action"), message.get("game_id") or "", message.get("official_game_id"))
+        if broker_client is not None:
+            await broker_client.publish({"type": "official_result", "request_id": message.get("request_id"), "payload": payload})
+    elif kind == "ingest" and message.get("shard") == sessions.shard_index:
+        try:
+            tick = OracleTickV2.model_validate(message.get("payload") or {})
+        except ValidationError as exc:
+            # sem ack: quem encaminhou cancela e processa localmente
+            print(f"❌ Tick encaminhado inválido ({message.get('game_id')}): {exc.error_count()} erro(s)")
+            return
+        if broker_client is not None and not await broker_client.claim(message.get("request_id")):
+            return  # duplicado ou já cancelado por quem encaminhou
+        # não trava a leitura do broker enquanto processa (OCR pode demorar)
+        task = asyncio.create_task(
+            _forwarded_ingest(tick, message.get("request_id"), coalesce=bool(message.get("coalesce", True)))
+        )
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+
+async def _forwarded_ingest(tick: OracleTickV2, request_id: str | None, *, coalesce: bool = True) -> None:
+    try:
+        await _schedule_ingest(tick, request_id=request_id, coalesce=coalesce)
+    except IngestShed:
+        pass  # quem encaminhou cai no timeout e responde 503
+
+
+@app.get("/api/oracle/scheduler/metrics")
+def oracle_scheduler_metrics() -> dict[str, Any]:
+    """Fila de ingest: pendências e atraso de fila por classe de prioridade."""
+    return {"status": "ok", "timestamp": _now_iso(), **ingest_scheduler.metrics()}
+
+
 class VisionParseRequest(BaseModel):
     frame_base64: str
     crop: dict | None = None
 
 
 @app.post("/api/oracle/vision/parse-frame")
-def oracle_parse_frame(request: VisionParseRequest) -> dict[str, Any]:
+async def oracle_parse_frame(request: VisionParseRequest) -> dict[str, Any]:
     """OCR do frame da bllsport (placar/tempo)."""
-    vision = analyze_bllsport_frame(request.frame_base64, crop=request.crop)
+    vision = await analyze_bllsport_frame_async(request.frame_base64, crop=request.crop)
     return {
         "status": "ok" if vision.ok else "error",
         "timestamp": _now_iso(),
@@ -213,17 +586,9 @@ def oracle_parse_frame(request: VisionParseRequest) -> dict[str, Any]:
     }
 
 
-@app.get("/api/oracle/nba/balldontlie/game")
-async def oracle_balldontlie_game(game_id: int) -> dict[str, Any]:
-    """Busca score oficial por game_id (opcional/configurável)."""
-    import os
-
-    base_url = os.getenv("BALLDONTLIE_BASE_URL", "https://api.balldontlie.io/v1")
-    api_key = os.getenv("BALLDONTLIE_API_KEY")
-    result = await fetch_balldontlie_game(base_url=base_url, api_key=api_key, game_id=game_id)
+def _official_payload(result: OfficialResult) -> dict[str, Any]:
     return {
         "status": "ok" if result.ok else "error",
-        "timestamp": _now_iso(),
         "provider": result.provider,
         "placar": result.placar,
         "tempo": result.tempo,
@@ -232,23 +597,156 @@ async def oracle_balldontlie_game(game_id: int) -> dict[str, Any]:
     }
 
 
+@app.get("/api/oracle/nba/balldontlie/game")
+async def oracle_balldontlie_game(game_id: int) -> dict[str, Any]:
+    """Busca score oficial por game_id (opcional/configurável)."""
+    result = await official_client.fetch_game(game_id)
+    return {"timestamp": _now_iso(), **_official_payload(result)}
+
+
+@app.get("/api/oracle/nba/balldontlie/games")
+async def oracle_balldontlie_games(game_ids: list[int] = Query(...)) -> dict[str, Any]:
+    """Busca vários jogos oficiais numa única chamada ao provider."""
+    results = await official_client.fetch_games(game_ids)
+    return {
+        "status": "ok",
+        "timestamp": _now_iso(),
+        "games": {str(game_id): _official_payload(result) for game_id, result in results.items()},
+    }
+
+
+class OfficialTrackRequest(BaseModel):
+    game_id: str
+    official_game_id: int
+
+
+def _apply_official(action: str | None, game_id: str, official_game_id: int | None = None) -> dict[str, Any]:
+    """Track/untrack no poller deste worker (só o dono do shard do jogo deve chamar)."""
+    if action == "track" and official_game_id is not None:
+        official_poller.track(game_id, int(official_game_id))
+        return {"tracked": True}
+    return {"tracked": False, "removed": official_poller.untrack(game_id)}
+
+
+async def _official_on_owner(action: str, game_id: str, official_game_id: int | None = None) -> dict[str, Any]:
+    """Como o ingest: o poller do jogo roda no worker dono do shard (é ele que salva o snapshot)."""
+    if broker_client is not None and broker_client.connected and not sessions.owns(game_id):
+        try:
+            result = await broker_client.request(
+                {
+                    "type": "official",
+                    "action": action,
+                    "game_id": game_id,
+                    "shard": sessions.shard_of(game_id),
+                    "official_game_id": official_game_id,
+                },
+                request_id=uuid.uuid4().hex,
+                timeout_s=FORWARD_TIMEOUT_S,
+            )
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=503, detail=f"Shard {sessions.shard_of(game_id)} sem resposta")
+        if result is not None:
+            return result
+        # ninguém aceitou (dono fora do ar): aplica localmente
+    return _apply_official(action, game_id, official_game_id)
+
+
+@app.post("/api/oracle/official/track")
+async def oracle_official_track(request: OfficialTrackRequest) -> dict[str, Any]:
+    """Passa a acompanhar o placar oficial de um jogo em background."""
+    await _official_on_owner("track", request.game_id, request.official_game_id)
+    return {"status": "ok", "timestamp": _now_iso(), "game_id": request.game_id}
+
+
+@app.delete("/api/oracle/official/track/{game_id}")
+async def oracle_official_untrack(game_id: str) -> dict[str, Any]:
+    result = await _official_on_owner("untrack", game_id)
+    if not result.get("removed"):
+        raise HTTPException(status_code=404, detail=f"Jogo não rastreado: {game_id}")
+    return {"status": "ok", "timestamp": _now_iso(), "game_id": game_id}
+
+
+@app.get("/api/oracle/official/tracked")
+def oracle_official_tracked() -> dict[str, Any]:
+    return {
+        "status": "ok",
+        "timestamp": _now_iso(),
+        "games": [
+            {
+                "game_id": g.game_id,
+                "official_game_id": g.official_game_id,
+                "interval_s": g.interval_s,
+                "errors": g.errors,
+                "official": official_store.as_oracle_input(g.game_id),
+            }
+            for g in official_poller.tracked()
+        ],
+    }
+
+
 @app.get("/api/oracle/latest")
-def oracle_latest() -> dict[str, Any]:
-    """Último JSON gerado (útil para clientes que conectam depois)."""
+async def oracle_latest(
+    request: Request,
+    response: Response,
+    game_id: str | None = None,
+    since: int | None = Query(default=None, ge=0),
+    wait: int = Query(default=0, ge=0, le=LATEST_MAX_WAIT_MS),
+):
+    """Último JSON gerado (útil para clientes que conectam depois).
+
+    `seq` cresce a cada resultado: `If-None-Match` com o ETag anterior devolve 304, e
+    `?since=<seq>&wait=<ms>` segura a requisição até sair um resultado mais novo (long-poll).
+    """
+    if since is not None:
+        await sessions.wait_newer(game_id, since, wait / 1000.0)
+    seq = sessions.seq_of(game_id)
+    etag = f'"{WORKER_ID}-{seq}"'
+    if request.headers.get("if-none-match") == etag or (since is not None and seq <= since):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    session = sessions.get(game_id) if game_id else None
+    response.headers["ETag"] = etag
     return {
         "status": "ok",
         "timestamp": _now_iso(),
-        "latest": latest_oracle,
+        "seq": seq,
+        "latest": session.latest if session is not None else (None if game_id else sessions.latest),
+    }
+
+
+@app.get("/api/oracle/games")
+async def oracle_games() -> dict[str, Any]:
+    """Jogos com sessão ativa neste worker e o shard de cada um."""
+    return {
+        "status": "ok",
+        "timestamp": _now_iso(),
+        "worker": WORKER_ID,
+        "shard_index": sessions.shard_index,
+        "num_shards": sessions.num_shards,
+        "broker": {"address": BROKER_ADDRESS, "connected": bool(broker_client and broker_client.connected)},
+        "games": [
+            {
+                "game_id": g.game_id,
+                "shard": g.shard,
+                "owned": sessions.owns(g.game_id),
+                "ticks": g.ticks,
+                "updated_at": g.updated_at,
+                "clock": g.clock.stats(),
+            }
+            for g in sessions.sessions()
+        ],
     }
 
 
 @app.websocket("/ws/oracle")
-async def ws_oracle(websocket: WebSocket):
-    """WebSocket de broadcast do Oráculo (JSON puro em texto)."""
-    await ws_manager.connect(websocket)
+async def ws_oracle(websocket: WebSocket, game_id: str | None = None):
+    """WebSocket de broadcast do Oráculo (JSON puro em texto). `?game_id=` filtra um jogo."""
+    await ws_manager.connect(websocket, game_id)
     try:
-        if latest_oracle:
-            await websocket.send_text(json.dumps(latest_oracle, ensure_ascii=False))
+        session = sessions.get(game_id) if game_id else None
+        latest = session.latest if session is not None else (None if game_id else sessions.latest)
+        if latest:
+            await websocket.send_text(json.dumps(latest, ensure_ascii=False))
         while True:
             # Mantém a conexão viva; aceita mensagens do cliente (ignoradas).
             await websocket.receive_text()
@@ -261,13 +759,14 @@ async def ws_oracle(websocket: WebSocket):
 class OracleGeminiRequest(BaseModel):
     # Entrada bruta para o Gemini
     frame_base64: str | None = None
+    frame_crop: dict | None = None
     bet365_json: dict | None = None
     nba_oficial_json: dict | None = None
     system_info: dict | None = None
 
 
 @app.post("/api/oracle/gemini-json")
-def oracle_gemini_json(request: OracleGeminiRequest) -> dict[str, Any]:
+async def oracle_gemini_json(request: OracleGeminiRequest) -> dict[str, Any]:
     """Chama Gemini para produzir JSON rígido (sem executar macro).
 
     Observação: isso só gera diagnóstico/comando. A execução (macro/click) deve ser feita por um executor externo.
@@ -276,33 +775,33 @@ def oracle_gemini_json(request: OracleGeminiRequest) -> dict[str, Any]:
     api_key = (request.system_info or {}).get("gemini_api_key")
     if not api_key:
         # fallback: env var
-        import os
-
         api_key = os.getenv("GEMINI_API_KEY")
 
     if not api_key:
         raise HTTPException(status_code=400, detail="GEMINI_API_KEY não configurada")
 
-    prompt = _load_prompt()
+    prompt = _prompt_entry()
 
-    payload = {
-        "FRAME_BASE64": request.frame_base64,
+    inputs = {
         "BET365_JSON": request.bet365_json,
         "NBA_OFICIAL": request.nba_oficial_json,
-        "SISTEMA_INFO": request.system_info,
+        # a api key não entra no prompt nem na chave do cache
+        "SISTEMA_INFO": {k: v for k, v in (request.system_info or {}).items() if k != "gemini_api_key"} or None,
     }
-
-    enriched = (
-        prompt
-        + "\n\n"
-        + "RETORNE APENAS JSON VÁLIDO (SEM TEXTO EXTRA).\n"
-        + "INPUT_JSON:\n"
-        + json.dumps(payload, ensure_ascii=False)
+    # decode + crop + re-encode JPEG é CPU: fora do event loop (ingest e broker seguem rodando)
+    payload = await asyncio.to_thread(
+        build_gemini_payload,
+        prompt.text,
+        inputs,
+        frame_base64=request.frame_base64,
+        frame_crop=request.frame_crop,
     )
 
-    # Model preferido (mantém compatibilidade)
-    model_name = "gemini-1.5-flash"
-    text = ask_gemini(api_key, model_name, enriched)
+    # Model preferido (config de runtime; padrão mantém compatibilidade)
+    model_name = runtime_config.current.get("gemini_model", "gemini-1.5-flash")
+    client = get_gemini_client(api_key)
+    key = GeminiClient.cache_key(model_name, prompt.sha256, payload.payload_sha256)
+    text = await client.ask_async(model_name, payload.contents, key=key)
 
     # Extrair JSON
     start = text.find("{")
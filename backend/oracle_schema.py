@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import math
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from core.oracle_nba import parse_clock, parse_score
+
+
+class OracleAnalyzeRequest(BaseModel):
+    """Schema v1 (compatível): blocos livres com aliases resolvidos por `tick_from_v1`."""
+
+    game_id: str | None = None
+    video_live: dict | None = None
+    frame_base64: str | None = None
+    frame_crop: dict | None = None
+    bet365: dict | None = None
+    nba_oficial: dict | None = None
+    # fonte de fallback (ex.: FlashscoreScraper.fetch_score): {"home", "away", "tempo"} ou {"placar", "tempo"}
+    fallback: dict | None = None
+    system: dict | None = None
+
+
+class ScoreV2(BaseModel):
+    model_config = ConfigDict(strict=True, frozen=True)
+
+    H: int = Field(ge=0, le=300)
+    A: int = Field(ge=0, le=300)
+
+    def as_dict(self) -> dict[str, int]:
+        return {"H": self.H, "A": self.A}
+
+
+class ClockV2(BaseModel):
+    model_config = ConfigDict(strict=True, frozen=True)
+
+    quarter: int = Field(ge=1, le=9)
+    seconds: int = Field(ge=0, le=720)
+
+    @property
+    def label(self) -> str:
+        mm, ss = divmod(self.seconds, 60)
+        return f"Q{self.quarter} {mm:02d}:{ss:02d}"
+
+
+class CropV2(BaseModel):
+    model_config = ConfigDict(strict=True, frozen=True)
+
+    x: int = Field(ge=0)
+    y: int = Field(ge=0)
+    w: int = Field(ge=0)
+    h: int = Field(ge=0)
+
+
+class FeedV2(BaseModel):
+    model_config = ConfigDict(strict=True, extra="forbid")
+
+    score: ScoreV2 | None = None
+    clock: ClockV2 | None = None
+    # texto original do relógio quando não deu para estruturar (só exibição)
+    clock_raw: str | None = None
+    confidence: float = Field(default=1.0, ge=0.0, le=1.0)
+    latency_ms: float | None = None
+    # texto cru do OCR que gerou a leitura (diagnóstico), como o v1 guardava em video_live.ocr
+    ocr_raw_text: str | None = Field(default=None, max_length=2000)
+
+    @property
+    def clock_text(self) -> str | None:
+        return self.clock.label if self.clock is not None else self.clock_raw
+
+
+class OracleTickV2(BaseModel):
+    """Schema v2 (estrito): placares inteiros e relógio já estruturados, sem aliases."""
+
+    model_config = ConfigDict(strict=True, extra="forbid")
+
+    game_id: str | None = None
+    video: FeedV2 | None = None
+    bet: FeedV2 | None = None
+    bet_lines: list[str] = Field(default_factory=list)
+    official: FeedV2 | None = None
+    fallback: FeedV2 | None = None
+    frame_base64: str | None = None
+    frame_crop: CropV2 | None = None
+    status_stream: str | None = None
+    stream_error: str | None = None
+    latency_ms: float | None = None
+
+
+# O adaptador usa model_construct (sem revalidar), então cada valor é mantido dentro dos
+# limites do v2 aqui: o tick que sai dele passa em OracleTickV2.model_validate (ex.: encaminhado pelo broker).
+def _score(value: Any) -> ScoreV2 | None:
+    parsed = parse_score(value)
+    if parsed is None or not (0 <= parsed["H"] <= 300 and 0 <= parsed["A"] <= 300):
+        return None
+    return ScoreV2.model_construct(H=parsed["H"], A=parsed["A"])
+
+
+def _clock(value: Any) -> ClockV2 | None:
+    # "Q05:03" vira quarto 0: fora dos limites, o relógio fica só como texto (clock_raw)
+    quarter, seconds = parse_clock(value)
+    if quarter is None or seconds is None or not (1 <= quarter <= 9 and 0 <= seconds <= 720):
+        return None
+    return ClockV2.model_construct(quarter=quarter, seconds=seconds)
+
+
+def _float(value: Any) -> float | None:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+def _text(value: Any) -> str | None:
+    return None if value is None else str(value)
+
+
+def _crop(crop: Any) -> CropV2 | None:
+    if not isinstance(crop, dict):
+        return None
+    try:
+        x, y, w, h = (max(0, int(crop.get(k, 0))) for k in ("x", "y", "w", "h"))
+    except (TypeError, ValueError):
+        return None
+    return CropV2.model_construct(x=x, y=y, w=w, h=h)
+
+
+def make_feed(
+    score: Any,
+    clock: Any,
+    *,
+    confidence: Any = None,
+    latency_ms: Any = None,
+    ocr_raw_text: str | None = None,
+) -> FeedV2 | None:
+    """Bloco v2 a partir de valores livres (placar/tempo em qualquer formato aceito pelo oráculo)."""
+    s = _score(score) if score is not None else None
+    c = _clock(clock)
+    if s is None and c is None and not clock:
+        return None
+    conf = _float(confidence)
+    return FeedV2.model_construct(
+        score=s,
+        clock=c,
+        clock_raw=None if c is not None or clock is None else str(clock),
+        confidence=min(1.0, max(0.0, conf)) if conf is not None else 1.0,
+        latency_ms=_float(latency_ms),
+        ocr_raw_text=str(ocr_raw_text)[:2000] if ocr_raw_text else None,
+    )
+
+
+def tick_from_v1(request: OracleAnalyzeRequest) -> OracleTickV2:
+    """Adaptador único v1 -> v2: resolve todos os aliases de chave uma vez só."""
+    video = request.video_live or {}
+    bet = request.bet365 or {}
+    official = request.nba_oficial or {}
+    fallback = request.fallback or {}
+    system = request.system or {}
+
+    bet_lines = bet.get("linhas") or bet.get("lines") or []
+    if isinstance(bet_lines, list):
+        lines = [str(x) for x in bet_lines if str(x).strip()]
+    elif isinstance(bet_lines, str):
+        lines = [bet_lines]
+    else:
+        lines = []
+
+    latency_ms = system.get("latencia_ms") or system.get("latency_ms")
+
+    return OracleTickV2.model_construct(
+        game_id=request.game_id,
+        video=make_feed(
+            video.get("placar") or video.get("placar_video") or video.get("score"),
+            video.get("tempo") or video.get("tempo_video"),
+            confidence=video.get("confianca"),
+            ocr_raw_text=(video.get("ocr") or {}).get("raw_text") if isinstance(video.get("ocr"), dict) else None,
+        ),
+        bet=make_feed(
+            bet.get("placar_geral") or bet.get("placar") or bet.get("score"),
+            bet.get("tempo_bet") or bet.get("tempo"),
+        ),
+        bet_lines=lines,
+        official=make_feed(official.get("placar") or official.get("score"), official.get("tempo")),
+        fallback=make_feed(
+            fallback.get("placar") or fallback.get("score") or fallback or None,
+            fallback.get("tempo"),
+            latency_ms=fallback.get("latencia_ms"),
+        ),
+        frame_base64=request.frame_base64,
+        frame_crop=_crop(request.frame_crop),
+        status_stream=_text(system.get("status_stream") or system.get("stream")),
+        stream_error=_text(system.get("stream_error")),
+        latency_ms=_float(latency_ms),
+    )
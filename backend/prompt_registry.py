@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+
+@dataclass(frozen=True)
+class PromptEntry:
+    name: str
+    path: Path
+    text: str
+    sha256: str
+    size: int
+    mtime_ns: int
+
+    def meta(self) -> dict[str, Any]:
+        updated_at = datetime.fromtimestamp(self.mtime_ns / 1e9, tz=timezone.utc).astimezone()
+        return {
+            "name": self.name,
+            "sha256": self.sha256,
+            "chars": len(self.text),
+            "updated_at": updated_at.isoformat(timespec="seconds"),
+        }
+
+
+class PromptRegistry:
+    """Prompts nomeados em memória, carregados/hasheados uma única vez.
+
+    A revalidação é feita por (mtime_ns, size) do arquivo e no máximo a cada
+    `revalidate_interval_s` segundos, então health checks frequentes não tocam o disco.
+    Versões anteriores ficam disponíveis por sha256 (até `max_versions` por nome).
+    Uma edição inválida (arquivo vazio ou fora de UTF-8) mantém a última versão boa.
+    """
+
+    def __init__(self, *, revalidate_interval_s: float = 1.0, max_versions: int = 8) -> None:
+        self._paths: dict[str, Path] = {}
+        self._current: dict[str, PromptEntry] = {}
+        self._versions: dict[str, dict[str, PromptEntry]] = {}
+        self._checked_at: dict[str, float] = {}
+        self._rejected: dict[str, tuple[int, int]] = {}
+        self._lock = threading.Lock()
+        self.revalidate_interval_s = revalidate_interval_s
+        self.max_versions = max_versions
+
+    def register(self, name: str, path: Path) -> None:
+        with self._lock:
+            self._paths[name] = Path(path)
+            self._checked_at.pop(name, None)
+
+    def names(self) -> list[str]:
+        return sorted(self._paths)
+
+    def get(self, name: str) -> PromptEntry:
+        """Retorna a versão atual do prompt (recarrega apenas se o arquivo mudou)."""
+        path = self._paths.get(name)
+        if path is None:
+            raise KeyError(f"Prompt não registrado: {name}")
+
+        now = time.monotonic()
+        entry = self._current.get(name)
+        if entry is not None and now - self._checked_at.get(name, 0.0) < self.revalidate_interval_s:
+            return entry
+
+        with self._lock:
+            entry = self._current.get(name)
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                raise RuntimeError(f"Prompt principal não encontrado: {path}") from None
+
+            key = (stat.st_mtime_ns, stat.st_size)
+            changed = entry is None or (entry.mtime_ns, entry.size) != key
+            if changed and self._rejected.get(name) != key:
+                try:
+                    entry = self._load(name, path, *key)
+                    self._rejected.pop(name, None)
+                except ValueError as exc:
+                    if entry is None:
+                        raise RuntimeError(f"Prompt inválido: {path}: {exc}") from None
+                    # só avisa uma vez por versão ruim do arquivo
+                    self._rejected[name] = key
+                    print(f"❌ Prompt inválido ({path}), mantendo {entry.sha256[:12]}: {exc}")
+            self._checked_at[name] = now
+            return entry
+
+    def version(self, name: str, sha256: str) -> PromptEntry | None:
+        """Busca uma versão já vista do prompt pelo hash."""
+        return self._versions.get(name, {}).get(sha256)
+
+    def versions(self, name: str) -> list[dict[str, Any]]:
+        return [entry.meta() for entry in self._versions.get(name, {}).values()]
+
+    def _load(self, name: str, path: Path, mtime_ns: int, size: int) -> PromptEntry:
+        text = path.read_text(encoding="utf-8")  # UnicodeDecodeError é um ValueError
+        if not text.strip():
+            raise ValueError("arquivo vazio")
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        versions = self._versions.setdefault(name, {})
+        entry = versions.get(digest)
+        if entry is None or entry.mtime_ns != mtime_ns:
+            entry = PromptEntry(
+                name=name,
+                path=path,
+                text=text,
+                sha256=digest,
+                size=size,
+                mtime_ns=mtime_ns,
+            )
+        # mantém a versão mais recente no fim (ordem de inserção = LRU simples)
+        versions.pop(digest, None)
+        versions[digest] = entry
+        while len(versions) > self.max_versions:
+            versions.pop(next(iter(versions)))
+        self._current[name] = entry
+        return entry
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""Broker pub/sub local entre workers do uvicorn (NDJSON sobre Unix socket ou TCP).
+
+Cada linha recebida de um worker é repassada a todos os outros. O broker também
+distribui os índices de shard: o worker que conecta recebe o menor índice livre.
+Embutido nos workers, o broker é eleito (flock no Unix socket, bind na porta TCP):
+se o worker que hospeda morre, os outros disputam a eleição ao reconectar.
+
+Standalone: `python -m backend.pubsub_broker unix:/tmp/oracle-broker.sock --shards 4`
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sys
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+
+MessageHandler = Callable[[dict[str, Any]], Awaitable[None]]
+
+# limite por linha NDJSON (o default do asyncio é 64 KiB); linhas maiores são descartadas inteiras
+MAX_LINE_BYTES = 16 * 1024 * 1024
+
+
+def parse_address(address: str) -> tuple[str, Any]:
+    """`unix:/caminho.sock` ou `tcp:host:porta`."""
+    kind, _, rest = address.partition(":")
+    if kind == "unix" and rest:
+        return "unix", rest
+    if kind == "tcp" and rest:
+        host, _, port = rest.rpartition(":")
+        return "tcp", (host or "127.0.0.1", int(port))
+    raise ValueError(f"Endereço de broker inválido: {address!r} (use unix:/path ou tcp:host:porta)")
+
+
+def _encode(message: dict[str, Any]) -> bytes:
+    return (json.dumps(message, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+async def _read_line(reader: asyncio.StreamReader) -> bytes | None:
+    """Próxima linha (b"" no fim da conexão); None se a linha passou do limite e foi descartada."""
+    skipping = False
+    while True:
+        try:
+            line = await reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError as exc:
+            return b"" if skipping else exc.partial
+        except asyncio.LimitOverrunError as exc:
+            # joga fora o que já chegou e continua até o fim da linha: a conexão segue viva
+            await reader.readexactly(exc.consumed)
+            skipping = True
+            continue
+        return None if skipping else line
+
+
+class PubSubBroker:
+    def __init__(self, address: str, *, num_shards: int = 1, drain_timeout_s: float = 5.0) -> None:
+        self.address = address
+        self.num_shards = max(1, num_shards)
+        self.drain_timeout_s = drain_timeout_s
+        self._server: asyncio.AbstractServer | None = None
+        self._clients: dict[asyncio.StreamWriter, int | None] = {}
+        self._lock_file: Any = None
+
+    async def start(self) -> bool:
+        """Sobe o broker; retorna False se outro processo já é o broker neste endereço."""
+        kind, target = parse_address(self.address)
+        try:
+            if kind == "unix":
+                if not self._acquire_unix_lock(target):
+                    return False
+                Path(target).unlink(missing_ok=True)
+                self._server = await asyncio.start_unix_server(self._handle, path=target, limit=MAX_LINE_BYTES)
+            else:
+                host, port = target
+                self._server = await asyncio.start_server(self._handle, host=host, port=port, limit=MAX_LINE_BYTES)
+        except OSError:
+            return False
+        return True
+
+    def _acquire_unix_lock(self, path: str) -> bool:
+        # eleição entre workers: só quem pega o flock apaga/recria o socket
+        try:
+            import fcntl
+        except ImportError:
+            return True
+        lock = open(f"{path}.lock", "w")
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock.close()
+            return False
+        self._lock_file = lock
+        return True
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for writer in list(self._clients):
+            writer.close()
+        self._clients.clear()
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    async def serve_forever(self) -> None:
+        if self._server is None and not await self.start():
+            raise RuntimeError(f"Broker já em uso: {self.address}")
+        async with self._server:
+            await self._server.serve_forever()
+
+    def _free_shard(self) -> int | None:
+        taken = {idx for idx in self._clients.values() if idx is not None}
+        return next((i for i in range(self.num_shards) if i not in taken), None)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        shard = self._free_shard()
+        self._clients[writer] = shard
+        try:
+            writer.write(_encode({"type": "welcome", "shard_index": shard, "num_shards": self.num_shards}))
+            await writer.drain()
+            while True:
+                line = await _read_line(reader)
+                if line is None:
+                    print(f"❌ Broker: linha acima de {MAX_LINE_BYTES} bytes descartada")
+                    continue
+                if not line:
+                    break
+                await self._fanout(line, sender=writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._clients.pop(writer, None)
+            writer.close()
+
+    async def _fanout(self, line: bytes, *, sender: asyncio.StreamWriter) -> None:
+        # escreve em todos e espera os drains juntos: um assinante lento não atrasa os outros
+        targets = [writer for writer in self._clients if writer is not sender]
+        for writer in targets:
+            writer.write(line)
+        results = await asyncio.gather(*(self._drain(writer) for writer in targets))
+        for writer, ok in zip(targets, results):
+            if not ok:
+                self._clients.pop(writer, None)
+                writer.close()
+
+    async def _drain(self, writer: asyncio.StreamWriter) -> bool:
+        try:
+            await asyncio.wait_for(writer.drain(), timeout=self.drain_timeout_s)
+            return True
+        except Exception:
+            return False
+
+
+class BrokerClient:
+    """Conexão de um worker com o broker (reconecta sozinho).
+
+    `on_message` recebe cada mensagem dos outros workers; `on_assign` recebe
+    (num_shards, shard_index) a cada (re)conexão e (1, None) ao perder o broker.
+    Com `host_shards`, o worker é candidato a hospedar o broker: antes de cada
+    (re)conexão disputa a eleição, então a queda do host não deixa os workers órfãos.
+
+    Encaminhamentos (`request`) levam um id: o dono responde `ack` ao aceitar
+    (`claim`), e ids repetidos ou cancelados são descartados, então um tick não é
+    processado duas vezes.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        *,
+        worker_id: str,
+        on_message: MessageHandler,
+        on_assign: Callable[[int, int | None], None] | None = None,
+        reconnect_s: float = 1.0,
+        host_shards: int | None = None,
+        seen_max: int = 4096,
+    ) -> None:
+        self.address = address
+        self.worker_id = worker_id
+        self.on_message = on_message
+        self.on_assign = on_assign
+        self.reconnect_s = reconnect_s
+        self.shard_index: int | None = None
+        self.num_shards = 1
+        self._writer: asyncio.StreamWriter | None = None
+        self._task: asyncio.Task | None = None
+        self.host_shards = host_shards
+        self.hosted: PubSubBroker | None = None
+        self._pending: dict[str, asyncio.Future] = {}
+        self._acks: dict[str, asyncio.Future] = {}
+        self._seen: OrderedDict[str, None] = OrderedDict()
+        self._seen_max = seen_max
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="oracle-broker-client")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.hosted is not None:
+            await self.hosted.close()
+            self.hosted = None
+
+    async def _elect(self) -> None:
+        if self.host_shards is None or self.hosted is not None:
+            return
+        broker = PubSubBroker(self.address, num_shards=self.host_shards)
+        if await broker.start():
+            self.hosted = broker
+            print(f"🟢 Broker assumido por {self.worker_id} em {self.address}")
+
+    async def publish(self, message: dict[str, Any]) -> bool:
+        writer = self._writer
+        if writer is None:
+            return False
+        try:
+            writer.write(_encode({**message, "origin": self.worker_id}))
+            await writer.drain()
+            return True
+        except Exception:
+            return False
+
+    async def request(
+        self,
+        message: dict[str, Any],
+        *,
+        request_id: str,
+        timeout_s: float,
+        ack_timeout_s: float = 0.5,
+    ) -> dict[str, Any] | None:
+        """Publica e espera a resposta com o mesmo `request_id`.
+
+        None se ninguém aceitou a tempo (o pedido é cancelado e quem chamou pode
+        processar localmente); `asyncio.TimeoutError` se foi aceito mas a resposta não veio.
+        """
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        acked: asyncio.Future = loop.create_future()
+        self._pending[request_id] = future
+        self._acks[request_id] = acked
+        try:
+            if not await self.publish({**message, "request_id": request_id}):
+                return None
+            try:
+                await asyncio.wait_for(asyncio.shield(acked), timeout=ack_timeout_s)
+            except asyncio.TimeoutError:
+                if not future.done():
+                    await self.publish({"type": "cancel", "request_id": request_id})
+                    return None
+            return await asyncio.wait_for(future, timeout=timeout_s)
+        finally:
+            self._pending.pop(request_id, None)
+            self._acks.pop(request_id, None)
+
+    def resolve(self, request_id: str | None, payload: dict[str, Any]) -> bool:
+        future = self._pending.get(request_id or "")
+        if future is None or future.done():
+            return False
+        future.set_result(payload)
+        return True
+
+    def _remember(self, request_id: str) -> bool:
+        if request_id in self._seen:
+            return False
+        self._seen[request_id] = None
+        while len(self._seen) > self._seen_max:
+            self._seen.popitem(last=False)
+        return True
+
+    async def claim(self, request_id: str | None) -> bool:
+        """Dono aceita um encaminhamento: False se o id já foi visto ou cancelado (descarta)."""
+        if not request_id:
+            return True
+        if not self._remember(request_id):
+            return False
+        await self.publish({"type": "ack", "request_id": request_id})
+        return True
+
+    def _control(self, message: dict[str, Any]) -> bool:
+        kind = message.get("type")
+        request_id = message.get("request_id") or ""
+        if kind == "ack":
+            acked = self._acks.get(request_id)
+            if acked is not None and not acked.done():
+                acked.set_result(True)
+            return True
+        if kind == "cancel":
+            self._remember(request_id)
+            return True
+        return False
+
+    async def _connect(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        kind, target = parse_address(self.address)
+        if kind == "unix":
+            return await asyncio.open_unix_connection(path=target, limit=MAX_LINE_BYTES)
+        host, port = target
+        return await asyncio.open_connection(host=host, port=port, limit=MAX_LINE_BYTES)
+
+    def _assign(self, num_shards: int, shard_index: int | None) -> None:
+        self.num_shards, self.shard_index = num_shards, shard_index
+        if self.on_assign is not None:
+            self.on_assign(num_shards, shard_index)
+
+    async def _run(self) -> None:
+        while True:
+            await self._elect()
+            try:
+                reader, writer = await self._connect()
+            except OSError:
+                await asyncio.sleep(self.reconnect_s)
+                continue
+
+            self._writer = writer
+            try:
+                while True:
+                    line = await _read_line(reader)
+                    if line is None:
+                        print(f"❌ Broker client: linha acima de {MAX_LINE_BYTES} bytes descartada")
+                        continue
+                    if not line:
+                        break
+                    try:
+                        message = json.loads(line)
+                    except ValueError:
+                        continue
+                    if message.get("type") == "welcome":
+                        self._assign(int(message.get("num_shards") or 1), message.get("shard_index"))
+                        continue
+                    if self._control(message):
+                        continue
+                    try:
+                        await self.on_message(message)
+                    except Exception as exc:
+                        print(f"❌ Broker handler error: {exc}")
+            except (ConnectionError, asyncio.IncompleteReadError):
+                pass
+            finally:
+                self._writer = None
+                writer.close()
+                self._assign(1, None)
+            await asyncio.sleep(self.reconnect_s)
+
+
+async def _main(address: str, num_shards: int) -> None:
+    broker = PubSubBroker(address, num_shards=num_shards)
+    print(f"🟢 Oracle broker em {address} ({num_shards} shards)")
+    await broker.serve_forever()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Broker pub/sub local do Oracle NBA")
+    parser.add_argument("address", nargs="?", default=os.getenv("ORACLE_BROKER", "tcp:127.0.0.1:8765"))
+    parser.add_argument("--shards", type=int, default=int(os.getenv("ORACLE_SHARDS", "1")))
+    args = parser.parse_args()
+    try:
+        asyncio.run(_main(args.address, args.shards))
+    except KeyboardInterrupt:
+        sys.exit(0)
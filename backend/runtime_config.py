@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""Config de runtime recarregável a quente, com histórico de versões por conteúdo.
+
+O arquivo (ORACLE_CONFIG_PATH, padrão data/config.json) é lido para um snapshot
+imutável; quem consome lê `get_runtime_config().current` (uma referência) e o watcher
+troca essa referência quando o arquivo muda. Cada versão vista vira um blob
+`objects/<sha256>.json` em ORACLE_CONFIG_HISTORY (conteúdo igual = mesmo arquivo) e
+uma linha em `history.jsonl`, no lugar das cópias completas de data/config_backups.
+
+CLI:
+  python -m backend.runtime_config versions
+  python -m backend.runtime_config import-backups [data/config_backups]
+  python -m backend.runtime_config rollback <versão>
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Mapping
+
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+DEFAULT_CONFIG_PATH = ROOT_DIR / "data" / "config.json"
+DEFAULT_HISTORY_DIR = ROOT_DIR / "data" / "config_history"
+
+# Valores que antes eram fixos no código; o arquivo de config sobrescreve qualquer um.
+DEFAULT_CONFIG: dict[str, Any] = {
+    "gemini_model": "gemini-1.5-flash",
+    "http_timeout_seconds": 5.0,
+    "scrapers": {
+        "bllsport": {"interval_seconds": 0.3, "error_backoff_seconds": 1.0, "timeout_seconds": 5.0},
+        "bet365": {"interval_seconds": 1.0, "error_backoff_seconds": 2.0, "timeout_seconds": 5.0},
+        "flashscore": {"interval_seconds": 2.0, "error_backoff_seconds": 2.0, "timeout_seconds": 5.0},
+    },
+}
+
+
+def _canonical(data: Mapping[str, Any]) -> bytes:
+    return json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def _merge(base: dict[str, Any], override: Mapping[str, Any]) -> dict[str, Any]:
+    merged = copy.deepcopy(base)
+    for key, value in override.items():
+        if isinstance(value, Mapping) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _flatten(value: Mapping[str, Any], prefix: str = "", out: dict[str, Any] | None = None) -> dict[str, Any]:
+    out = {} if out is None else out
+    for key, item in value.items():
+        path = f"{prefix}{key}"
+        out[path] = item
+        if isinstance(item, Mapping):
+            _flatten(item, f"{path}.", out)
+    return out
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+@dataclass(frozen=True, slots=True)
+class ConfigSnapshot:
+    """Versão imutável da config (dicts viram MappingProxy, listas viram tuplas)."""
+
+    version: str
+    data: Mapping[str, Any]
+    loaded_at: float
+    _flat: Mapping[str, Any] = field(repr=False)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Valor por chave pontuada ('scrapers.bllsport.interval_seconds'): um lookup de dict."""
+        return self._flat.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._flat[key]
+
+
+def make_snapshot(data: Mapping[str, Any]) -> ConfigSnapshot:
+    frozen = _freeze(data)
+    return ConfigSnapshot(
+        version=hashlib.sha256(_canonical(data)).hexdigest()[:16],
+        data=frozen,
+        loaded_at=time.time(),
+        _flat=MappingProxyType(_flatten(frozen)),
+    )
+
+
+class ConfigHistory:
+    """Histórico endereçado por conteúdo: um blob por versão distinta + log de eventos."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.log = self.root / "history.jsonl"
+        self._lock = threading.Lock()
+
+    def store(self, data: Mapping[str, Any], *, reason: str) -> str:
+        raw = _canonical(data)
+        version = hashlib.sha256(raw).hexdigest()[:16]
+        with self._lock:
+            blob = self.objects / f"{version}.json"
+            if not blob.exists():
+                _write_atomic(blob, raw)
+            with open(self.log, "a", encoding="utf-8") as fh:
+                fh.write(json.dumps({"version": version, "at": time.time(), "reason": reason}) + "\n")
+        return version
+
+    def load(self, version: str) -> dict[str, Any]:
+        blob = self.objects / f"{version}.json"
+        if not blob.exists():
+            raise KeyError(f"Versão de config não encontrada: {version}")
+        return json.loads(blob.read_bytes())
+
+    def entries(self) -> list[dict[str, Any]]:
+        if not self.log.exists():
+            return []
+        with open(self.log, encoding="utf-8") as fh:
+            return [json.loads(line) for line in fh if line.strip()]
+
+
+class RuntimeConfig:
+    """Serviço de config: snapshot atual + watcher do arquivo + histórico de versões.
+
+    `current` é só uma referência (trocada inteira no reload, nunca mutada), então
+    leitores em qualquer thread veem uma versão consistente sem lock. O watcher
+    compara (mtime_ns, size) a cada `poll_interval_s`; JSON inválido mantém a versão
+    anterior. `subscribe()` registra callbacks chamados com o snapshot novo.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        history_dir: Path,
+        defaults: Mapping[str, Any] | None = None,
+        poll_interval_s: float = 1.0,
+    ) -> None:
+        self.path = Path(path)
+        self.history = ConfigHistory(history_dir)
+        self.defaults = dict(DEFAULT_CONFIG if defaults is None else defaults)
+        self.poll_interval_s = poll_interval_s
+        self.current = make_snapshot(self.defaults)
+        self.reloads = 0
+        self.last_error: str | None = None
+        self._stat: tuple[int, int] | None = None
+        self._raw_version: str | None = None
+        self._subscribers: list[Callable[[ConfigSnapshot], None]] = []
+        self._lock = threading.Lock()
+        self._task: asyncio.Task | None = None
+        self._announced = False
+        self.reload()
+
+    def overrides(self) -> dict[str, Any]:
+        """Chaves (pontuadas, só valores finais) em que a config atual difere dos defaults."""
+        defaults = _flatten(_freeze(self.defaults))
+        return {
+            key: value
+            for key, value in self.current._flat.items()
+            if not isinstance(value, Mapping) and (key not in defaults or defaults[key] != value)
+        }
+
+    def _log_overrides(self, label: str) -> None:
+        diff = self.overrides()
+        if diff:
+            keys = ", ".join(f"{key}={value!r}" for key, value in sorted(diff.items()))
+            print(f"⚙️ {label} {self.current.version} ({self.path}) difere dos defaults: {keys}")
+
+    def value(self, key: str, default: Any = None) -> Any:
+        """Valor da versão atual; serve de ConfigGetter para os scrapers (core.polling_runtime)."""
+        return self.current.get(key, default)
+
+    def subscribe(self, callback: Callable[[ConfigSnapshot], None]) -> None:
+        self._subscribers.append(callback)
+        callback(self.current)
+
+    def _read_file(self) -> dict[str, Any]:
+        data = json.loads(self.path.read_bytes())
+        if not isinstance(data, dict):
+            raise ValueError("Config precisa ser um objeto JSON")
+        return data
+
+    def _file_data(self) -> dict[str, Any]:
+        """Conteúdo atual do arquivo; se ilegível, a última versão válida carregada."""
+        try:
+            return self._read_file()
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            return self.history.load(self._raw_version) if self._raw_version else {}
+
+    def reload(self, *, force: bool = False) -> bool:
+        """Relê o arquivo se mudou; devolve True se a versão atual mudou."""
+        with self._lock:
+            try:
+                stat = self.path.stat()
+            except FileNotFoundError:
+                return False
+            key = (stat.st_mtime_ns, stat.st_size)
+            if not force and key == self._stat:
+                return False
+            self._stat = key
+            try:
+                raw = self._read_file()
+            except Exception as exc:
+                self.last_error = f"{type(exc).__name__}: {exc}"
+                print(f"❌ Config inválida ({self.path}), mantendo {self.current.version}: {self.last_error}")
+                return False
+            self.last_error = None
+            raw_version = hashlib.sha256(_canonical(raw)).hexdigest()[:16]
+            if raw_version == self._raw_version and not force:
+                return False  # só o mtime mudou
+            if raw_version != self._raw_version:
+                self.history.store(raw, reason="load")
+            self._raw_version = raw_version
+            snapshot = make_snapshot(_merge(self.defaults, raw))
+            changed = snapshot.version != self.current.version
+            self.current = snapshot
+            self.reloads += 1
+        if changed and self._announced:
+            self._log_overrides("Config recarregada")
+        if changed:
+            for callback in list(self._subscribers):
+                try:
+                    callback(snapshot)
+                except Exception as exc:
+                    print(f"❌ Config subscriber error: {exc}")
+        return changed
+
+    def apply(self, changes: Mapping[str, Any], *, reason: str = "apply") -> ConfigSnapshot:
+        """Grava `changes` (merge profundo) no arquivo de forma atômica e recarrega."""
+        base = self._file_data()
+        self.history.store(base, reason=f"before-{reason}")
+        _write_atomic(self.path, json.dumps(_merge(base, changes), ensure_ascii=False, indent=2).encode("utf-8"))
+        self.reload(force=True)
+        return self.current
+
+    def rollback(self, version: str) -> ConfigSnapshot:
+        """Volta o arquivo para uma versão do histórico (conteúdo do arquivo, sem os defaults)."""
+        data = self.history.load(version)
+        self.history.store(self._file_data(), reason="before-rollback")
+        _write_atomic(self.path, json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8"))
+        self.reload(force=True)
+        return self.current
+
+    def start(self) -> None:
+        if not self._announced:
+            # uma vez por processo: um backup antigo virando config.json troca, por exemplo, o gemini_model
+            self._announced = True
+            self._log_overrides("Config")
+        if self.poll_interval_s > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run(), name="runtime-config-watcher")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval_s)
+            try:
+                # stat + leitura fora do event loop
+                await asyncio.to_thread(self.reload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                print(f"❌ Config watcher error: {exc}")
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "version": self.current.version,
+            "reloads": self.reloads,
+            "last_error": self.last_error,
+        }
+
+
+def import_backups(history: ConfigHistory, backups_dir: Path) -> dict[str, int]:
+    """Migra data/config_backups/*.json para o histórico (cópias iguais viram um blob só)."""
+    files = sorted(Path(backups_dir).glob("*.json"))
+    versions = set()
+    for path in files:
+        try:
+            data = json.loads(path.read_bytes())
+        except Exception:
+            continue
+        versions.add(history.store(data, reason=f"import:{path.name}"))
+    return {"files": len(files), "versions": len(versions)}
+
+
+_config: RuntimeConfig | None = None
+
+
+def get_runtime_config() -> RuntimeConfig:
+    """Serviço compartilhado (ORACLE_CONFIG_PATH, ORACLE_CONFIG_HISTORY, ORACLE_CONFIG_POLL_S)."""
+    global _config
+    if _config is None:
+        _config = RuntimeConfig(
+            Path(os.getenv("ORACLE_CONFIG_PATH", str(DEFAULT_CONFIG_PATH))),
+            history_dir=Path(os.getenv("ORACLE_CONFIG_HISTORY", str(DEFAULT_HISTORY_DIR))),
+            poll_interval_s=float(os.getenv("ORACLE_CONFIG_POLL_S", "1.0")),
+        )
+    return _config
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Config de runtime: histórico de versões")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("versions")
+    imp = sub.add_parser("import-backups")
+    imp.add_argument("dir", nargs="?", default=str(ROOT_DIR / "data" / "config_backups"))
+    rb = sub.add_parser("rollback")
+    rb.add_argument("version")
+    args = parser.parse_args()
+
+    config = get_runtime_config()
+    if args.cmd == "versions":
+        print(f"atual: {config.current.version}")
+        for entry in config.history.entries():
+            print(f"{entry['version']}  {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(entry['at']))}  {entry['reason']}")
+    elif args.cmd == "import-backups":
+        print(import_backups(config.history, Path(args.dir)))
+    elif args.cmd == "rollback":
+        print(f"config -> {config.rollback(args.version).version}")
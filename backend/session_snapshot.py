@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+from backend.game_sessions import GameSessionManager, shard_for
+from core.official_poller import OfficialScorePoller
+
+
+SNAPSHOT_VERSION = 1
+
+
+def write_snapshot(path: Path, state: dict[str, Any]) -> int:
+    """JSON compacto + gzip, gravado em arquivo temporário e trocado com os.replace (atômico)."""
+    data = gzip.compress(json.dumps(state, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), compresslevel=3)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # um .tmp por processo: um worker que acabou de assumir o shard pode gravar junto com o antigo
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(data)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+    return len(data)
+
+
+def shard_path(base: Path, shard_index: int) -> Path:
+    """`sessions.json.gz` -> `sessions.shard<i>.json.gz` (um arquivo por shard, estável entre restarts)."""
+    stem, dot, suffix = base.name.partition(".")
+    return base.with_name(f"{stem}.shard{shard_index}{dot}{suffix}")
+
+
+def read_snapshot(path: Path) -> dict[str, Any] | None:
+    if not path.exists():
+        return None
+    state = json.loads(gzip.decompress(path.read_bytes()))
+    if state.get("version") != SNAPSHOT_VERSION:
+        return None
+    return state
+
+
+class SessionSnapshotter:
+    """Snapshots periódicos do estado por jogo (timeline, fusão, relógio, linhas, último resultado).
+
+    O estado é montado no event loop, numa chamada síncrona: o estado por jogo só é
+    alterado por corrotinas do loop (ingest, broker, poller, endpoints async; a análise
+    avulsa não escreve nada), então nenhum tick fica pela metade no snapshot. A
+    serialização + escrita vão para uma thread. Snapshots mais velhos que `max_age_s`
+    são ignorados.
+
+    Os workers do uvicorn dividem o mesmo ambiente, então `path` é só a base: cada shard
+    grava `sessions.shard<i>.json.gz` com os jogos que ele possui. `restore()` lê os
+    arquivos de todos os shards (e o arquivo único antigo) e só traz os jogos do shard
+    deste worker, então mudar o número de workers redistribui os jogos. Sem broker o
+    shard é (1, 0) desde o início e o restore roda no startup; com broker, a cada shard
+    recebido (`assign`). Jogos que já têm sessão viva não são sobrescritos.
+    """
+
+    def __init__(
+        self,
+        sessions: GameSessionManager,
+        path: Path,
+        *,
+        interval_s: float = 5.0,
+        max_age_s: float = 6 * 3600.0,
+        poller: OfficialScorePoller | None = None,
+        shard: tuple[int, int] | None = (1, 0),
+    ) -> None:
+        self.sessions = sessions
+        self.base_path = path
+        self.interval_s = interval_s
+        self.max_age_s = max_age_s
+        self.poller = poller
+        # (num_shards, shard_index) do último shard recebido: sem broker o worker segue
+        # gravando o próprio arquivo em vez de misturar os jogos de todos
+        self.shard = shard
+        self._task: asyncio.Task | None = None
+        self._saved_key: tuple[Any, ...] | None = None
+        self.saves = 0
+        self.last_bytes = 0
+        self.last_save_ms: float | None = None
+        self.restored_games = 0
+
+    @property
+    def path(self) -> Path | None:
+        return None if self.shard is None else shard_path(self.base_path, self.shard[1])
+
+    def owns(self, game_id: str) -> bool:
+        if self.shard is None:
+            return False
+        num_shards, shard_index = self.shard
+        return shard_for(game_id, num_shards) == shard_index
+
+    def assign(self, num_shards: int, shard_index: int | None) -> int:
+        """Novo shard vindo do broker: passa a gravar o arquivo dele e restaura os jogos dele."""
+        if shard_index is None or self.shard == (num_shards, shard_index):
+            return 0
+        self.shard = (num_shards, shard_index)
+        self._saved_key = None
+        return self.restore()
+
+    def state(self) -> dict[str, Any]:
+        state: dict[str, Any] = {
+            "version": SNAPSHOT_VERSION,
+            "saved_at": time.time(),
+            "shard": list(self.shard) if self.shard is not None else None,
+            "sessions": self.sessions.snapshot(self.owns),
+        }
+        if self.poller is not None:
+            state["official_tracked"] = {
+                g.game_id: g.official_game_id for g in self.poller.tracked() if self.owns(g.game_id)
+            }
+        return state
+
+    def _files(self) -> list[Path]:
+        stem, dot, suffix = self.base_path.name.partition(".")
+        files = sorted(self.base_path.parent.glob(f"{stem}.shard*{dot}{suffix}"))
+        return [self.base_path, *files] if self.base_path.exists() else files
+
+    def restore(self) -> int:
+        """Carrega dos snapshots recentes os jogos deste shard; devolve quantos voltaram."""
+        if self.shard is None:
+            return 0
+        states = []
+        for path in self._files():
+            try:
+                state = read_snapshot(path)
+            except Exception as exc:
+                print(f"❌ Snapshot ilegível ({path}): {exc}")
+                continue
+            if state is not None and time.time() - float(state.get("saved_at") or 0) <= self.max_age_s:
+                states.append(state)
+        # o mesmo jogo pode estar em dois arquivos (workers mudaram): vale o snapshot mais novo
+        states.sort(key=lambda st: float(st.get("saved_at") or 0))
+        games: dict[str, dict[str, Any]] = {}
+        tracked: dict[str, Any] = {}
+        seq = 0
+        for state in states:
+            sessions_state = state.get("sessions") or {}
+            seq = max(seq, int(sessions_state.get("seq") or 0))
+            for game in sessions_state.get("games") or []:
+                if self.owns(game["game_id"]) and self.sessions.get(game["game_id"]) is None:
+                    games[game["game_id"]] = game
+            for game_id, official_game_id in (state.get("official_tracked") or {}).items():
+                if self.owns(game_id):
+                    tracked[game_id] = official_game_id
+
+        restored = self.sessions.restore({"seq": seq, "latest": self.sessions.latest, "games": list(games.values())})
+        if self.poller is not None:
+            for game_id, official_game_id in tracked.items():
+                self.poller.track(game_id, official_game_id)
+        self.restored_games += restored
+        if restored:
+            print(f"♻️ Snapshot restaurado: {restored} jogo(s) do shard {self.shard[1]}")
+        return restored
+
+    def _change_key(self) -> tuple[Any, ...]:
+        tracked = tuple(sorted(g.game_id for g in self.poller.tracked())) if self.poller is not None else ()
+        return (self.sessions.seq, tracked, self.shard)
+
+    async def save(self, *, force: bool = False) -> bool:
+        """Grava o snapshot do shard se algo mudou desde o último (ou sempre, com `force`)."""
+        path = self.path
+        if path is None:
+            return False
+        key = self._change_key()
+        if not force and key == self._saved_key:
+            return False
+        started = time.perf_counter()
+        state = self.state()
+        self.last_bytes = await asyncio.to_thread(write_snapshot, path, state)
+        self.last_save_ms = (time.perf_counter() - started) * 1000.0
+        self._saved_key = key
+        self.saves += 1
+        return True
+
+    def start(self) -> None:
+        if self.interval_s > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run(), name="session-snapshotter")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # snapshot final no shutdown: o restart volta exatamente daqui
+        await self.save()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_s)
+            try:
+                await self.save()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                print(f"❌ Snapshot error: {exc}")
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "path": str(self.path) if self.path is not None else None,
+            "shard": list(self.shard) if self.shard is not None else None,
+            "interval_s": self.interval_s,
+            "saves": self.saves,
+            "last_bytes": self.last_bytes,
+            "last_save_ms": round(self.last_save_ms, 2) if self.last_save_ms is not None else None,
+            "restored_games": self.restored_games,
+        }
@@ -0,0 +1 @@
+"""Benchmarks - scripts de medição (`python -m benchmarks.<script>`)."""
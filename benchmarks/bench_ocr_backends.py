@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Latência por chamada de OCR em recortes do tamanho do placar: tesserocr (engine fixa) vs pytesseract.
+
+Uso: `python -m benchmarks.bench_ocr_backends [--n 200] [--size 220x48]`
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+
+from core.ocr_engines import ENGINES, available_backends
+from core.vision_bllsport import parse_score_and_clock
+
+
+def render_crop(text: str, size: tuple[int, int]):
+    """Recorte sintético de placar: texto claro sobre fundo escuro."""
+    from PIL import Image, ImageDraw
+
+    image = Image.new("L", size, color=20)
+    ImageDraw.Draw(image).text((6, size[1] // 4), text, fill=235)
+    return image
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=200)
+    parser.add_argument("--size", default="220x48")
+    args = parser.parse_args()
+    w, h = (int(x) for x in args.size.lower().split("x"))
+
+    crops = [render_crop(f"Q{1 + i % 4} {i % 12:02d}:{(i * 7) % 60:02d}  {80 + i % 20}-{75 + i % 17}", (w, h)) for i in range(16)]
+    backends = available_backends()
+    if not backends:
+        print("Nenhum backend de OCR instalado (pip install tesserocr e/ou pytesseract + Tesseract).")
+        return
+
+    for name in backends:
+        started = time.perf_counter()
+        engine = ENGINES[name]()
+        init_ms = (time.perf_counter() - started) * 1000
+        samples = []
+        parsed = 0
+        for i in range(args.n):
+            t0 = time.perf_counter()
+            text = engine.recognize(crops[i % len(crops)])
+            samples.append((time.perf_counter() - t0) * 1000)
+            parsed += any(parse_score_and_clock(text))
+        engine.close()
+        samples.sort()
+        print(
+            f"{name:<12} init={init_ms:7.1f} ms  mean={statistics.fmean(samples):7.2f} ms  "
+            f"p50={samples[len(samples) // 2]:7.2f} ms  p99={samples[min(len(samples) - 1, int(0.99 * len(samples)))]:7.2f} ms  "
+            f"lidos={parsed}/{args.n}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Throughput de OCR com vários jogos: uma chamada por placar vs mosaico único (core.ocr_batch).
+
+Uso: `python -m benchmarks.bench_ocr_batch [--games 1,4,8,16] [--rounds 20]`
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.bench_ocr_backends import render_crop
+from core.ocr_batch import split_lines, tile_rois
+from core.ocr_engines import ENGINES, available_backends
+from core.vision_bllsport import parse_score_and_clock
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", default="1,4,8,16")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    backends = available_backends()
+    if not backends:
+        print("Nenhum backend de OCR instalado (pip install tesserocr e/ou pytesseract + Tesseract).")
+        return
+
+    for name in backends:
+        engine = ENGINES[name]()
+        for games in (int(g) for g in args.games.split(",")):
+            labels = [f"Q{1 + i % 4} {i % 12:02d}:{(i * 7) % 60:02d}  {80 + i}-{70 + i}" for i in range(games)]
+            rois = [np.asarray(render_crop(label, (220, 48))) for label in labels]
+
+            started = time.perf_counter()
+            for _ in range(args.rounds):
+                single = [engine.recognize(roi) for roi in rois]
+            single_s = (time.perf_counter() - started) / args.rounds
+
+            started = time.perf_counter()
+            for _ in range(args.rounds):
+                composite, boxes = tile_rois(rois)
+                tiled = split_lines(engine.recognize_lines(composite), boxes)
+            tiled_s = (time.perf_counter() - started) / args.rounds
+
+            def hits(texts: list[str]) -> int:
+                return sum(parse_score_and_clock(t)[1] is not None for t in texts)
+
+            print(
+                f"{name:<12} jogos={games:<3} individual={games / single_s:8.1f} placares/s  "
+                f"mosaico={games / tiled_s:8.1f} placares/s  ({single_s / tiled_s:4.1f}x)  "
+                f"relógio lido {hits(single)}/{games} vs {hits(tiled)}/{games}"
+            )
+        engine.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Memória/alocações do estado por jogo: dicts vs registros compactos (NamedTuple/slots).
+
+Segura `--lines` linhas confirmadas da Bet365 por jogo (`--games` jogos) e mede com
+tracemalloc o custo de guardar cada linha como dict (formato JSON) ou `ScoringLine`.
+
+Uso: `python -m benchmarks.bench_oracle_memory [--games 8 --lines 5000]`
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import tracemalloc
+from typing import Any, Callable
+
+from core.game_timeline import ScoreEvent
+from core.oracle_nba import Diagnosis, _line_indicates_scoring
+
+
+def _lines(n: int) -> list[str]:
+    kinds = ["3pts", "2pts", "lance livre"]
+    out = []
+    for i in range(n):
+        q, rest = divmod(i, max(1, n // 4))
+        sec = 720 - (rest % 720)
+        out.append(f"✓ {kinds[i % 3]} jogador#{i % 13} Q{min(q + 1, 4)} {sec // 60:02d}:{sec % 60:02d}")
+    return out
+
+
+def _measure(label: str, build: Callable[[], Any]) -> tuple[int, int]:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    held = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    size = sum(s.size_diff for s in stats)
+    count = sum(s.count_diff for s in stats)
+    print(f"{label:<36} {size / 1024:10.1f} KiB  {count:9d} blocos")
+    del held
+    return size, count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=8)
+    parser.add_argument("--lines", type=int, default=5000)
+    args = parser.parse_args()
+
+    raw = [_lines(args.lines) for _ in range(args.games)]
+    print(f"{args.games} jogos x {args.lines} linhas")
+
+    dict_size, _ = _measure(
+        "linhas como dict (7 chaves)",
+        lambda: [[_line_indicates_scoring(line).as_dict() for line in game] for game in raw],
+    )
+    rec_size, _ = _measure(
+        "linhas como ScoringLine",
+        lambda: [[_line_indicates_scoring(line) for line in game] for game in raw],
+    )
+    print(f"  economia: {100 * (1 - rec_size / dict_size):.0f}%")
+
+    n = args.games * args.lines
+    dict_size, _ = _measure(
+        "diagnósticos como dict",
+        lambda: [Diagnosis(True, "DELAY_GERAL", "ALTA", f"delay {i}").as_dict() for i in range(n)],
+    )
+    rec_size, _ = _measure(
+        "diagnósticos como Diagnosis",
+        lambda: [Diagnosis(True, "DELAY_GERAL", "ALTA", f"delay {i}") for i in range(n)],
+    )
+    print(f"  economia: {100 * (1 - rec_size / dict_size):.0f}%")
+
+    dict_size, _ = _measure(
+        "eventos de placar como dict",
+        lambda: [
+            {"observed_at": float(i), "H": i, "A": i, "delta_h": 2, "delta_a": 0, "quarter": 1, "seconds": 300}
+            for i in range(n)
+        ],
+    )
+    rec_size, _ = _measure(
+        "eventos de placar como ScoreEvent",
+        lambda: [ScoreEvent(float(i), i, i, 2, 0, 1, 300) for i in range(n)],
+    )
+    print(f"  economia: {100 * (1 - rec_size / dict_size):.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""PollingRuntime vs loop `while` + `asyncio.sleep` fixo, com fontes falsas de latência simulada.
+
+Cada fonte sorteia a latência do fetch (com picos ocasionais acima do timeout) e uma taxa
+de erro; o loop antigo dorme o intervalo *depois* do fetch, então o período real vira
+intervalo + latência. Imprime período real, latência, erros e ticks pulados por fonte.
+
+Uso: `python -m benchmarks.bench_polling_runtime [--seconds 10] [--seed 7]`
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+
+from core.polling_runtime import PolledSource, PollingRuntime
+
+
+class FakeSource:
+    """Fetch com latência ~N(média, desvio), picos lentos e erros aleatórios."""
+
+    def __init__(self, name: str, *, latency_ms: float, jitter_ms: float, spike_rate: float, error_rate: float, rng: random.Random) -> None:
+        self.name = name
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.spike_rate = spike_rate
+        self.error_rate = error_rate
+        self.rng = rng
+        self.calls = 0
+        self.started: list[float] = []
+
+    async def fetch(self) -> dict:
+        self.calls += 1
+        self.started.append(time.monotonic())
+        latency = max(0.0, self.rng.gauss(self.latency_ms, self.jitter_ms)) / 1000.0
+        if self.rng.random() < self.spike_rate:
+            latency *= 20
+        await asyncio.sleep(latency)
+        if self.rng.random() < self.error_rate:
+            raise ConnectionError("falha simulada")
+        return {"source": self.name, "n": self.calls}
+
+
+SOURCES = (
+    # nome, intervalo (s), latência média (ms), desvio (ms), picos, erros
+    ("bllsport", 0.3, 60.0, 20.0, 0.01, 0.02),
+    ("bet365", 1.0, 180.0, 60.0, 0.02, 0.05),
+    ("flashscore", 2.0, 400.0, 120.0, 0.02, 0.10),
+)
+
+
+def _period(started: list[float]) -> float | None:
+    if len(started) < 2:
+        return None
+    return (started[-1] - started[0]) / (len(started) - 1)
+
+
+async def _legacy_loop(source: FakeSource, interval: float, error_sleep: float) -> None:
+    while True:
+        try:
+            await source.fetch()
+            await asyncio.sleep(interval)
+        except Exception:
+            await asyncio.sleep(error_sleep)
+
+
+async def run(seconds: float, seed: int) -> None:
+    # loop antigo
+    legacy = []
+    tasks = []
+    for name, interval, lat, jit, spike, err in SOURCES:
+        src = FakeSource(name, latency_ms=lat, jitter_ms=jit, spike_rate=spike, error_rate=err, rng=random.Random(seed))
+        legacy.append((src, interval))
+        tasks.append(asyncio.create_task(_legacy_loop(src, interval, interval)))
+    await asyncio.sleep(seconds)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    # runtime
+    runtime = PollingRuntime(seed=seed)
+    fakes = []
+    for name, interval, lat, jit, spike, err in SOURCES:
+        src = FakeSource(name, latency_ms=lat, jitter_ms=jit, spike_rate=spike, error_rate=err, rng=random.Random(seed))
+        fakes.append((src, interval))
+        runtime.add(
+            PolledSource(
+                name=name,
+                fetch=src.fetch,
+                interval_s=interval,
+                timeout_s=max(0.25, interval * 1.5),
+                jitter=0.05,
+                error_backoff_s=interval / 2,
+            )
+        )
+    runtime.start()
+    await asyncio.sleep(seconds)
+    await runtime.stop()
+    stats = runtime.stats()
+
+    print(f"{'fonte':<12}{'alvo':>7}{'loop antigo':>13}{'runtime':>10}{'latência':>11}{'erros':>8}{'timeouts':>10}{'pulados':>9}")
+    for (old, interval), (new, _) in zip(legacy, fakes):
+        s = stats[new.name]
+        old_period = _period(old.started)
+        new_period = _period(new.started)
+        print(
+            f"{new.name:<12}{interval:>6.2f}s"
+            f"{old_period or 0:>12.3f}s{new_period or 0:>9.3f}s"
+            f"{s['latency_ms'] or 0:>9.1f}ms{s['error_rate']:>8.1%}{s['timeouts']:>10}{s['missed']:>9}"
+        )
+    latest = {name: runtime.store.value(name) for name, *_ in SOURCES}
+    print(f"store: {latest}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    asyncio.run(run(args.seconds, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Pré-processamento do frame antes do OCR: pipeline antigo (RGB + cópias) vs buffers reaproveitados.
+
+Mede latência média e alocação de imagem por frame. O tracemalloc só enxerga os arrays do
+numpy/OpenCV; os buffers do Pillow (o RGB completo do caminho antigo) ficam fora dele, então
+a alocação de imagem soma o pico do tracemalloc com o tamanho dos objetos `Image` criados.
+
+Uso: `python -m benchmarks.bench_preprocess [--n 200] [--frame 1280x720] [--crop 40,20,260,60]`
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import io
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from core.frame_preprocess import FramePreprocessor, _try_import_cv2, decode_frame_bytes
+from core.vision_bllsport import crop_image_pil, decode_base64_image
+
+
+def legacy_prepare(frame_base64: str, crop: dict[str, int]) -> Any:
+    """Caminho anterior: RGB completo, crop, np.array e um array novo por etapa do OpenCV."""
+    image = crop_image_pil(decode_base64_image(frame_base64), crop)
+    cv2 = _try_import_cv2()
+    if cv2 is None:
+        return image
+    import numpy as np
+
+    arr = np.array(image)
+    gray = cv2.cvtColor(arr, cv2.COLOR_RGB2GRAY)
+    gray = cv2.GaussianBlur(gray, (3, 3), 0)
+    _, th = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return th
+
+
+def synthetic_frame(width: int, height: int) -> str:
+    from PIL import Image, ImageDraw
+
+    image = Image.new("RGB", (width, height), color=(30, 60, 30))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((40, 20, 300, 80), fill=(10, 10, 10))
+    draw.text((50, 40), "Q4 05:03   91-85", fill=(240, 240, 240))
+    buf = io.BytesIO()
+    image.save(buf, "JPEG", quality=85)
+    return base64.b64encode(buf.getvalue()).decode("ascii")
+
+
+def _pil_bytes(image: Any) -> int:
+    return image.width * image.height * len(image.getbands())
+
+
+def pillow_bytes_per_frame(frame_base64: str, crop: dict[str, int], *, legacy: bool, cv2: bool) -> int:
+    """Bytes dos objetos `Image` que cada pipeline cria por frame (o tracemalloc não os vê)."""
+    from PIL import Image
+
+    if legacy:
+        image = decode_base64_image(frame_base64)
+        return _pil_bytes(image) + _pil_bytes(crop_image_pil(image, crop))
+    if cv2:
+        return 0  # cv2.imdecode devolve array numpy: já está no tracemalloc
+    image = Image.open(io.BytesIO(decode_frame_bytes(frame_base64)))
+    image.draft("L", image.size)
+    image = image.convert("L") if image.mode != "L" else image
+    return _pil_bytes(image) + _pil_bytes(crop_image_pil(image, crop))
+
+
+def _measure(label: str, fn: Callable[[str, dict], Any], frame: str, crop: dict, n: int, pillow: int) -> None:
+    for _ in range(5):
+        fn(frame, crop)
+    latencies = []
+    peaks = []
+    tracemalloc.start()
+    for _ in range(n):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        t0 = time.perf_counter()
+        fn(frame, crop)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    traced = sum(peaks) / n
+    print(
+        f"{label:<22} {sum(latencies) / n:7.3f} ms/frame  imagem {(traced + pillow) / 1024:8.1f} KiB/frame"
+        f"  (tracemalloc {traced / 1024:.1f} + Pillow {pillow / 1024:.1f})"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=200)
+    parser.add_argument("--frame", default="1280x720")
+    parser.add_argument("--crop", default="40,20,260,60")
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.frame.lower().split("x"))
+    x, y, w, h = (int(v) for v in args.crop.split(","))
+    crop = {"x": x, "y": y, "w": w, "h": h}
+    frame = synthetic_frame(width, height)
+
+    has_cv2 = _try_import_cv2() is not None
+    print(f"frame {width}x{height} JPEG, ROI {w}x{h}, OpenCV={'sim' if has_cv2 else 'não'}")
+    print("tracemalloc só vê numpy/OpenCV: no antigo o RGB do Pillow fica de fora, no novo o cinza do imdecode entra")
+    pillow = pillow_bytes_per_frame(frame, crop, legacy=True, cv2=has_cv2)
+    _measure("antigo (RGB + cópias)", legacy_prepare, frame, crop, args.n, pillow)
+    pre = FramePreprocessor()
+    pillow = pillow_bytes_per_frame(frame, crop, legacy=False, cv2=has_cv2)
+    _measure("novo (cinza + dst=)", pre.prepare, frame, crop, args.n, pillow)
+
+    if has_cv2:
+        import numpy as np
+
+        # regime: depois do decode, a binarização do ROI não aloca nada
+        roi = np.zeros((h, w), dtype=np.uint8)
+        pre.binarize(roi)
+        tracemalloc.start()
+        base = tracemalloc.get_traced_memory()[0]
+        for _ in range(args.n):
+            pre.binarize(roi)
+        print(f"binarização em regime: {(tracemalloc.get_traced_memory()[1] - base) / args.n:.0f} bytes/frame")
+        tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    main()
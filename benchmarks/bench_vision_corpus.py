@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Velocidade e acerto do OCR de placar num corpus rotulado (benchmarks.scoreboard_synth).
+
+Roda `analyze_bllsport_frame` (pipeline completo) e cada backend de OCR cru (recorte
+cinza, sem binarização) sobre o mesmo corpus e reporta frames/s, latência p50/p99 e
+acerto exato de placar, relógio e ambos (também por layout). Outros reconhecedores
+entram com `--recognizer modulo:funcao`, assinatura `(frame_base64, crop) -> (placar {H, A} | None, relógio | None)`.
+
+Uso: `python -m benchmarks.bench_vision_corpus [--corpus data/ocr_corpus | --n 200 --seed 7]
+      [--recognizer pkg.mod:fn] [--json out.json] [--min-accuracy 0.9]`
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import io
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from benchmarks.scoreboard_synth import CorpusItem, generate, load_corpus
+from core.oracle_nba import parse_clock
+from core.ocr_engines import ENGINES, available_backends
+from core.vision_bllsport import analyze_bllsport_frame, parse_score_and_clock
+
+Recognizer = Callable[[str, dict], tuple[dict[str, int] | None, str | None]]
+
+
+def vision_pipeline(frame_base64: str, crop: dict) -> tuple[dict[str, int] | None, str | None]:
+    result = analyze_bllsport_frame(frame_base64, crop)
+    if result.error:
+        raise RuntimeError(result.error)
+    placar = result.placar
+    return ({"H": placar["Home"], "A": placar["Away"]} if placar else None), result.tempo_video
+
+
+def raw_engine(name: str) -> Recognizer:
+    """OCR direto no recorte em cinza (sem o pré-processamento do pipeline)."""
+    engine = ENGINES[name]()
+
+    def recognize(frame_base64: str, crop: dict) -> tuple[dict[str, int] | None, str | None]:
+        from PIL import Image
+
+        from core.frame_preprocess import decode_frame_bytes
+
+        image = Image.open(io.BytesIO(decode_frame_bytes(frame_base64))).convert("L")
+        image = image.crop((crop["x"], crop["y"], crop["x"] + crop["w"], crop["y"] + crop["h"]))
+        placar, tempo = parse_score_and_clock(engine.recognize(image))
+        return ({"H": placar["Home"], "A": placar["Away"]} if placar else None), tempo
+
+    return recognize
+
+
+def load_recognizer(spec: str) -> Recognizer:
+    module, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module), attr or "recognize")
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def evaluate(name: str, recognize: Recognizer, corpus: list[CorpusItem]) -> dict[str, Any]:
+    frames = [(item, item.frame_base64) for item in corpus]
+    # aquecimento: engine/modelo carregados fora da medição
+    for item, frame in frames[:3]:
+        try:
+            recognize(frame, item.crop)
+        except Exception:
+            pass
+
+    latencies = []
+    hits = {"score": 0, "clock": 0, "exact": 0}
+    by_layout: dict[str, list[int]] = {}
+    errors = 0
+    started = time.perf_counter()
+    for item, frame in frames:
+        t0 = time.perf_counter()
+        try:
+            score, clock = recognize(frame, item.crop)
+        except Exception:
+            score, clock = None, None
+            errors += 1
+        latencies.append((time.perf_counter() - t0) * 1000.0)
+        score_ok = score == item.score
+        clock_ok = clock is not None and parse_clock(clock) == parse_clock(item.clock)
+        hits["score"] += score_ok
+        hits["clock"] += clock_ok
+        hits["exact"] += score_ok and clock_ok
+        layout = by_layout.setdefault(str(item.spec.get("layout", "?")), [0, 0])
+        layout[0] += score_ok and clock_ok
+        layout[1] += 1
+    elapsed = time.perf_counter() - started
+
+    n = len(frames)
+    latencies.sort()
+    return {
+        "recognizer": name,
+        "frames": n,
+        "fps": round(n / elapsed, 1) if elapsed > 0 else None,
+        "mean_ms": round(statistics.fmean(latencies), 2),
+        "p50_ms": round(_percentile(latencies, 0.50), 2),
+        "p99_ms": round(_percentile(latencies, 0.99), 2),
+        "score_acc": round(hits["score"] / n, 4),
+        "clock_acc": round(hits["clock"] / n, 4),
+        "exact_acc": round(hits["exact"] / n, 4),
+        "errors": errors,
+        "by_layout": {k: round(v[0] / v[1], 4) for k, v in sorted(by_layout.items())},
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", help="diretório gerado por benchmarks.scoreboard_synth (senão gera em memória)")
+    parser.add_argument("--n", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--recognizer", action="append", default=[], help="modulo:funcao extra (pode repetir)")
+    parser.add_argument("--json", help="grava os resultados (para acompanhar no CI)")
+    parser.add_argument("--min-accuracy", type=float, default=None, help="sai com código 1 se algum exact_acc ficar abaixo")
+    args = parser.parse_args()
+
+    corpus = load_corpus(Path(args.corpus)) if args.corpus else list(generate(args.n, seed=args.seed))
+    recognizers: list[tuple[str, Recognizer]] = []
+    backends = available_backends()
+    if backends:
+        recognizers.append(("vision_bllsport", vision_pipeline))
+        recognizers.extend((f"raw_{name}", raw_engine(name)) for name in backends)
+    else:
+        print("Nenhum backend de OCR instalado (pip install tesserocr e/ou pytesseract + Tesseract): só reconhecedores extras.")
+    recognizers.extend((spec, load_recognizer(spec)) for spec in args.recognizer)
+    if not recognizers:
+        return 0
+
+    results = [evaluate(name, fn, corpus) for name, fn in recognizers]
+    print(f"corpus: {len(corpus)} frames ({args.corpus or f'gerado, seed={args.seed}'})")
+    print(f"{'reconhecedor':<24}{'fps':>8}{'p50':>9}{'p99':>9}{'placar':>8}{'relógio':>9}{'exato':>8}{'erros':>7}")
+    for r in results:
+        print(
+            f"{r['recognizer']:<24}{r['fps']:>8}{r['p50_ms']:>7.1f}ms{r['p99_ms']:>7.1f}ms"
+            f"{r['score_acc']:>8.1%}{r['clock_acc']:>9.1%}{r['exact_acc']:>8.1%}{r['errors']:>7}"
+        )
+        print(f"{'':<24}por layout: {r['by_layout']}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({"corpus": args.corpus, "seed": args.seed, "results": results}, indent=2), encoding="utf-8")
+    if args.min_accuracy is not None and any(r["exact_acc"] < args.min_accuracy for r in results):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
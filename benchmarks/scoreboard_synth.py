@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""Gerador de frames sintéticos de placar, rotulados com o placar e o relógio verdadeiros.
+
+Cada frame é uma "transmissão" (fundo com gradiente e ruído) com o placar sobreposto
+num layout sorteado, com fonte, cores, ruído e qualidade JPEG configuráveis. O rótulo
+guarda o recorte (`crop`) do placar, como o frontend manda em `frame_crop`.
+
+Uso: `python -m benchmarks.scoreboard_synth --out data/ocr_corpus --n 300 [--seed 7] [--fonts a.ttf,b.ttf]`
+Gera `<out>/frames/*.jpg` + `<out>/labels.jsonl`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import io
+import json
+import random
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+
+LAYOUTS = ("linear", "score_first", "stacked", "banner")
+TEAMS = ("LAL", "BOS", "GSW", "MIA", "NYK", "DEN", "PHX", "MIL", "DAL", "CHI")
+# (texto, fundo da barra) - claro sobre escuro e escuro sobre claro
+PALETTES = (
+    ((240, 240, 240), (12, 12, 12)),
+    ((255, 210, 0), (20, 20, 60)),
+    ((250, 250, 250), (150, 20, 30)),
+    ((15, 15, 15), (235, 235, 235)),
+    ((20, 20, 20), (255, 200, 40)),
+)
+
+
+@dataclass(slots=True)
+class ScoreboardSpec:
+    home: int
+    away: int
+    quarter: int
+    seconds: int
+    layout: str = "linear"
+    font: str | None = None
+    font_size: int = 22
+    fg: tuple[int, int, int] = (240, 240, 240)
+    bg: tuple[int, int, int] = (12, 12, 12)
+    noise: float = 4.0
+    jpeg_quality: int = 80
+    frame_size: tuple[int, int] = (640, 360)
+
+    @property
+    def clock(self) -> str:
+        return f"Q{self.quarter} {self.seconds // 60:02d}:{self.seconds % 60:02d}"
+
+    @property
+    def score(self) -> dict[str, int]:
+        return {"H": self.home, "A": self.away}
+
+
+def random_spec(rng: random.Random, *, fonts: list[str] | None = None, layouts: tuple[str, ...] = LAYOUTS) -> ScoreboardSpec:
+    fg, bg = rng.choice(PALETTES)
+    return ScoreboardSpec(
+        home=rng.randint(0, 140),
+        away=rng.randint(0, 140),
+        quarter=rng.randint(1, 4),
+        seconds=rng.randint(0, 720),
+        layout=rng.choice(layouts),
+        font=rng.choice(fonts) if fonts else None,
+        font_size=rng.randint(18, 30),
+        fg=fg,
+        bg=bg,
+        noise=rng.uniform(0.0, 10.0),
+        jpeg_quality=rng.randint(35, 95),
+        frame_size=rng.choice(((640, 360), (960, 540), (1280, 720))),
+    )
+
+
+def _font(spec: ScoreboardSpec):
+    from PIL import ImageFont
+
+    if spec.font:
+        return ImageFont.truetype(spec.font, spec.font_size)
+    return ImageFont.load_default(size=spec.font_size)
+
+
+def _lines(spec: ScoreboardSpec, rng: random.Random) -> list[str]:
+    score = f"{spec.home}-{spec.away}"
+    if spec.layout == "score_first":
+        return [f"{score}   {spec.clock}"]
+    if spec.layout == "stacked":
+        return [score, spec.clock]
+    if spec.layout == "banner":
+        home, away = rng.sample(TEAMS, 2)
+        return [f"{home} {spec.home} - {spec.away} {away}   {spec.clock}"]
+    return [f"{spec.clock}   {score}"]
+
+
+def render_scoreboard(spec: ScoreboardSpec, rng: random.Random) -> tuple[bytes, dict[str, int]]:
+    """Frame JPEG + recorte do placar (x, y, w, h) dentro dele."""
+    import numpy as np
+    from PIL import Image, ImageDraw
+
+    width, height = spec.frame_size
+    # "vídeo" de fundo: gradiente com cor sorteada
+    base = np.array(rng.choices(range(40, 200), k=3), dtype=np.float32)
+    ramp = np.linspace(0.6, 1.2, width, dtype=np.float32)[None, :, None]
+    frame = np.clip(base[None, None, :] * ramp * np.ones((height, 1, 1), dtype=np.float32), 0, 255).astype(np.uint8)
+    image = Image.fromarray(frame, "RGB")
+
+    draw = ImageDraw.Draw(image)
+    font = _font(spec)
+    lines = _lines(spec, rng)
+    pad = max(6, spec.font_size // 3)
+    boxes = [draw.textbbox((0, 0), line, font=font) for line in lines]
+    line_h = max(b[3] - b[1] for b in boxes) + pad // 2
+    box_w = max(b[2] - b[0] for b in boxes) + 2 * pad
+    box_h = line_h * len(lines) + 2 * pad
+    x = rng.randint(8, max(8, width - box_w - 8))
+    y = rng.choice((rng.randint(8, 40), rng.randint(max(8, height - box_h - 40), max(8, height - box_h - 8))))
+    draw.rectangle((x, y, x + box_w, y + box_h), fill=spec.bg)
+    for i, (line, bbox) in enumerate(zip(lines, boxes)):
+        draw.text((x + pad - bbox[0], y + pad + i * line_h - bbox[1]), line, font=font, fill=spec.fg)
+
+    if spec.noise > 0:
+        arr = np.asarray(image, dtype=np.float32)
+        arr += np.random.default_rng(rng.getrandbits(32)).normal(0.0, spec.noise, arr.shape).astype(np.float32)
+        image = Image.fromarray(np.clip(arr, 0, 255).astype(np.uint8), "RGB")
+
+    buf = io.BytesIO()
+    image.save(buf, "JPEG", quality=spec.jpeg_quality)
+    # margem em volta da barra, como um recorte feito à mão no frontend
+    margin = 4
+    crop = {
+        "x": max(0, x - margin),
+        "y": max(0, y - margin),
+        "w": min(width, x + box_w + margin) - max(0, x - margin),
+        "h": min(height, y + box_h + margin) - max(0, y - margin),
+    }
+    return buf.getvalue(), crop
+
+
+@dataclass(slots=True)
+class CorpusItem:
+    name: str
+    frame: bytes
+    crop: dict[str, int]
+    score: dict[str, int]
+    clock: str
+    spec: dict[str, Any]
+
+    @property
+    def frame_base64(self) -> str:
+        return base64.b64encode(self.frame).decode("ascii")
+
+
+def generate(n: int, *, seed: int = 7, fonts: list[str] | None = None, layouts: tuple[str, ...] = LAYOUTS) -> Iterator[CorpusItem]:
+    """Corpus determinístico: mesma seed (e fontes) => mesmos frames e rótulos."""
+    rng = random.Random(seed)
+    for i in range(n):
+        spec = random_spec(rng, fonts=fonts, layouts=layouts)
+        frame, crop = render_scoreboard(spec, rng)
+        yield CorpusItem(f"{i:05d}", frame, crop, spec.score, spec.clock, asdict(spec))
+
+
+def write_corpus(out: Path, items: Iterator[CorpusItem]) -> int:
+    frames = out / "frames"
+    frames.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with open(out / "labels.jsonl", "w", encoding="utf-8") as fh:
+        for item in items:
+            (frames / f"{item.name}.jpg").write_bytes(item.frame)
+            label = {"file": f"frames/{item.name}.jpg", "crop": item.crop, "score": item.score, "clock": item.clock, "spec": item.spec}
+            fh.write(json.dumps(label, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def load_corpus(root: Path) -> list[CorpusItem]:
+    items = []
+    with open(root / "labels.jsonl", encoding="utf-8") as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            label = json.loads(line)
+            items.append(
+                CorpusItem(
+                    name=Path(label["file"]).stem,
+                    frame=(root / label["file"]).read_bytes(),
+                    crop=label["crop"],
+                    score=label["score"],
+                    clock=label["clock"],
+                    spec=label.get("spec") or {},
+                )
+            )
+    return items
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", default="data/ocr_corpus")
+    parser.add_argument("--n", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--fonts", default="", help="arquivos .ttf separados por vírgula (padrão: fonte embutida do Pillow)")
+    parser.add_argument("--layouts", default=",".join(LAYOUTS))
+    args = parser.parse_args()
+
+    fonts = [f for f in args.fonts.split(",") if f] or None
+    layouts = tuple(l for l in args.layouts.split(",") if l)
+    count = write_corpus(Path(args.out), generate(args.n, seed=args.seed, fonts=fonts, layouts=layouts))
+    print(f"{count} frames em {args.out} (seed={args.seed})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import base64
+import io
+import threading
+from typing import Any
+
+
+def _try_import_cv2():
+    try:
+        import cv2  # type: ignore
+
+        return cv2
+    except Exception:
+        return None
+
+
+def _try_import_numpy():
+    try:
+        import numpy as np  # type: ignore
+
+        return np
+    except Exception:
+        return None
+
+
+def _try_import_pillow():
+    try:
+        from PIL import Image  # type: ignore
+
+        return Image
+    except Exception:
+        return None
+
+
+def decode_frame_bytes(frame_base64: str) -> bytes:
+    """base64 (data URI ou puro) -> bytes da imagem."""
+    b64 = frame_base64.strip()
+    if "," in b64 and b64.lower().startswith("data:"):
+        b64 = b64.split(",", 1)[1]
+    return base64.b64decode(b64)
+
+
+def _crop_box(crop: dict[str, int] | None, width: int, height: int) -> tuple[int, int, int, int] | None:
+    if not crop:
+        return None
+    x, y = max(0, int(crop.get("x", 0))), max(0, int(crop.get("y", 0)))
+    w, h = int(crop.get("w", 0)), int(crop.get("h", 0))
+    if w <= 0 or h <= 0:
+        return None
+    return (x, y, min(width, x + w), min(height, y + h))
+
+
+class FramePreprocessor:
+    """Pré-processamento do frame para OCR com buffers reaproveitados entre frames.
+
+    Decodifica direto em tons de cinza, recorta antes de qualquer conversão (o recorte
+    é uma view) e roda blur + Otsu com `dst=` em buffers do tamanho do ROI. Em regime
+    só a decodificação aloca. Não é thread-safe: use uma instância por worker
+    (`get_frame_preprocessor()`); o array devolvido vale até a próxima chamada.
+    """
+
+    def __init__(self) -> None:
+        self._buffers: dict[str, Any] = {}
+
+    def _buffer(self, name: str, shape: tuple[int, ...]):
+        np = _try_import_numpy()
+        buf = self._buffers.get(name)
+        if buf is None or buf.shape != shape:
+            buf = self._buffers[name] = np.empty(shape, dtype=np.uint8)
+        return buf
+
+    def prepare(self, frame_base64: str, crop: dict[str, int] | None = None) -> Any:
+        """Frame base64 -> imagem binarizada do ROI (numpy com OpenCV; PIL cinza sem OpenCV)."""
+        data = decode_frame_bytes(frame_base64)
+        cv2 = _try_import_cv2()
+        np = _try_import_numpy()
+        if cv2 is None or np is None:
+            return self._prepare_pil(data, crop)
+
+        gray = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+        if gray is None:
+            raise ValueError("Frame inválido: não foi possível decodificar a imagem")
+        return self.prepare_array(gray, crop)
+
+    def prepare_array(self, frame: Any, crop: dict[str, int] | None = None) -> Any:
+        """Frame numpy já decodificado (cinza ou BGR, ex.: view do FrameRing) -> ROI binarizado.
+
+        Só o ROI é lido: o recorte é uma view e a conversão para cinza vai para um buffer do worker.
+        """
+        box = _crop_box(crop, frame.shape[1], frame.shape[0])
+        if box is not None:
+            x0, y0, x1, y1 = box
+            frame = frame[y0:y1, x0:x1]
+        if frame.ndim == 2:
+            return self.binarize(frame)
+        cv2 = _try_import_cv2()
+        gray = self._buffer("gray", frame.shape[:2])
+        cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY if frame.shape[2] == 4 else cv2.COLOR_BGR2GRAY, dst=gray)
+        return self.binarize(gray)
+
+    def binarize(self, gray: Any) -> Any:
+        """Blur 3x3 + Otsu do array cinza, escrevendo nos buffers do worker."""
+        cv2 = _try_import_cv2()
+        blurred = self._buffer("blur", gray.shape)
+        binary = self._buffer("binary", gray.shape)
+        cv2.GaussianBlur(gray, (3, 3), 0, dst=blurred)
+        cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU, dst=binary)
+        return binary
+
+    def binarize_image(self, image: Any) -> Any:
+        """PIL Image (qualquer modo) -> binarizada; usado por `ocr_text_from_image`."""
+        cv2 = _try_import_cv2()
+        np = _try_import_numpy()
+        arr = np.asarray(image)
+        if arr.ndim == 2:
+            return self.binarize(arr)
+        gray = self._buffer("gray", arr.shape[:2])
+        code = cv2.COLOR_RGBA2GRAY if arr.shape[2] == 4 else cv2.COLOR_RGB2GRAY
+        cv2.cvtColor(arr, code, dst=gray)
+        return self.binarize(gray)
+
+    def _prepare_pil(self, data: bytes, crop: dict[str, int] | None) -> Any:
+        Image = _try_import_pillow()
+        if Image is None:
+            raise RuntimeError("Dependência ausente: Pillow. Instale: pip install pillow")
+        image = Image.open(io.BytesIO(data))
+        # JPEG: decodifica só a luminância (sem passar por RGB)
+        image.draft("L", image.size)
+        box = _crop_box(crop, image.width, image.height)
+        if box is not None:
+            image = image.crop(box)
+        return image if image.mode == "L" else image.convert("L")
+
+
+_local = threading.local()
+
+
+def get_frame_preprocessor() -> FramePreprocessor:
+    """Instância da thread atual (os workers do pool de OCR ficam cada um com seus buffers)."""
+    pre = getattr(_local, "preprocessor", None)
+    if pre is None:
+        pre = _local.preprocessor = FramePreprocessor()
+    return pre
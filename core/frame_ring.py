@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""Ring buffer de frames em memória compartilhada (captura -> workers de OCR, sem pickle).
+
+Um bloco `multiprocessing.shared_memory` com slots de tamanho fixo. O escritor (um só)
+copia o frame para o próximo slot; os leitores recebem uma view numpy do slot, sem cópia.
+Cada slot tem um número de sequência no esquema seqlock (ímpar = escrita em andamento),
+então o leitor detecta frame rasgado/sobrescrito e pode validar a view depois de usá-la.
+
+Uso no app: a captura (`BLLSportScraper.publish_frame`, ou outro processo com
+`FrameRing.attach`) escreve o frame decodificado; o OCR lê `latest()` e passa a view para
+`core.vision_bllsport.analyze_frame_view_async` (ROI binarizado direto do slot).
+
+Demo: `python -m core.frame_ring --frames 600 --size 1280x720`
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any
+
+import numpy as np
+
+
+MAGIC = 0x4652414D45524E47  # "FRAMERNG"
+GAME_ID_BYTES = 32
+_ALIGN = 64
+
+# header global (int64): magic, slots, slot_bytes, write_seq, written, overwritten
+_H_MAGIC, _H_SLOTS, _H_SLOT_BYTES, _H_WRITE_SEQ, _H_WRITTEN, _H_OVERWRITTEN = range(6)
+_HEADER_FIELDS = 8
+# metadados por slot (int64): seq, height, width, channels, nbytes, ts_ns, read_flag (+1 reservado)
+_S_SEQ, _S_HEIGHT, _S_WIDTH, _S_CHANNELS, _S_NBYTES, _S_TS_NS, _S_READ = range(7)
+_SLOT_FIELDS = 8
+
+
+def _aligned(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+@dataclass(slots=True)
+class FrameView:
+    """Frame lido do ring: `array` aponta para a memória compartilhada (vale enquanto `valid()`)."""
+
+    seq: int
+    array: np.ndarray
+    game_id: str
+    timestamp_ns: int
+    _ring: FrameRing
+
+    def valid(self) -> bool:
+        """False se o escritor já reaproveitou o slot (o conteúdo da view mudou)."""
+        return self._ring._slot_seq(self.seq) == 2 * self.seq
+
+    def copy(self) -> np.ndarray | None:
+        data = self.array.copy()
+        return data if self.valid() else None
+
+
+class FrameRing:
+    """Ring de `slots` frames uint8 de até `slot_bytes` cada.
+
+    Escritor único (`write`). Leitores: `latest()` (o frame mais novo vence; frames
+    pulados contam em `skipped`) ou `read(seq)` (sequencial; None se já sobrescrito).
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, *, owner: bool) -> None:
+        self.shm = shm
+        self.owner = owner
+        self._header = np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf, offset=0)
+        if self._header[_H_MAGIC] != MAGIC:
+            raise ValueError(f"Memória compartilhada {shm.name!r} não é um FrameRing")
+        self.slots = int(self._header[_H_SLOTS])
+        self.slot_bytes = int(self._header[_H_SLOT_BYTES])
+        meta_offset = _aligned(_HEADER_FIELDS * 8)
+        self._meta = np.ndarray((self.slots, _SLOT_FIELDS), dtype=np.int64, buffer=shm.buf, offset=meta_offset)
+        game_offset = meta_offset + _aligned(self.slots * _SLOT_FIELDS * 8)
+        self._games = np.ndarray((self.slots, GAME_ID_BYTES), dtype=np.uint8, buffer=shm.buf, offset=game_offset)
+        self._data_offset = game_offset + _aligned(self.slots * GAME_ID_BYTES)
+        self._data = np.ndarray((self.slots, self.slot_bytes), dtype=np.uint8, buffer=shm.buf, offset=self._data_offset)
+        # contadores do leitor (locais ao processo)
+        self.reads = 0
+        self.skipped = 0
+        self.torn = 0
+        self._last_seq = 0
+        self._opened_at = time.monotonic()
+
+    @staticmethod
+    def size_for(slots: int, slot_bytes: int) -> int:
+        return (
+            _aligned(_HEADER_FIELDS * 8)
+            + _aligned(slots * _SLOT_FIELDS * 8)
+            + _aligned(slots * GAME_ID_BYTES)
+            + slots * _aligned(slot_bytes)
+        )
+
+    @classmethod
+    def create(cls, name: str | None = None, *, slots: int = 8, slot_bytes: int = 1280 * 720 * 3) -> FrameRing:
+        slot_bytes = _aligned(slot_bytes)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=cls.size_for(slots, slot_bytes))
+        header = np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf, offset=0)
+        header[:] = 0
+        header[_H_SLOTS] = slots
+        header[_H_SLOT_BYTES] = slot_bytes
+        header[_H_MAGIC] = MAGIC
+        del header
+        ring = cls(shm, owner=True)
+        ring._meta[:] = 0
+        return ring
+
+    @classmethod
+    def attach(cls, name: str) -> FrameRing:
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def write_seq(self) -> int:
+        return int(self._header[_H_WRITE_SEQ])
+
+    def _slot_seq(self, seq: int) -> int:
+        return int(self._meta[(seq - 1) % self.slots, _S_SEQ])
+
+    def write(self, frame: np.ndarray, *, game_id: str = "", timestamp_ns: int | None = None) -> int:
+        """Copia o frame (uint8, HxW ou HxWxC) para o próximo slot; retorna a sequência dele."""
+        if frame.dtype != np.uint8:
+            raise ValueError("FrameRing só aceita frames uint8")
+        nbytes = frame.nbytes
+        if nbytes > self.slot_bytes:
+            raise ValueError(f"Frame de {nbytes} bytes não cabe no slot ({self.slot_bytes} bytes)")
+
+        seq = self.write_seq + 1
+        idx = (seq - 1) % self.slots
+        meta = self._meta[idx]
+        if meta[_S_SEQ] and not meta[_S_READ]:
+            self._header[_H_OVERWRITTEN] += 1
+
+        meta[_S_SEQ] = 2 * seq - 1  # ímpar: escrita em andamento
+        height, width = frame.shape[:2]
+        meta[_S_HEIGHT], meta[_S_WIDTH] = height, width
+        meta[_S_CHANNELS] = 1 if frame.ndim == 2 else frame.shape[2]
+        meta[_S_NBYTES] = nbytes
+        meta[_S_TS_NS] = time.time_ns() if timestamp_ns is None else timestamp_ns
+        meta[_S_READ] = 0
+        encoded = game_id.encode("utf-8")[:GAME_ID_BYTES]
+        self._games[idx, :] = 0
+        self._games[idx, : len(encoded)] = np.frombuffer(encoded, dtype=np.uint8)
+        np.copyto(self._data[idx, :nbytes].reshape(frame.shape), frame)
+        meta[_S_SEQ] = 2 * seq  # par: slot consistente
+        self._header[_H_WRITE_SEQ] = seq
+        self._header[_H_WRITTEN] += 1
+        return seq
+
+    def _view(self, seq: int) -> FrameView | None:
+        idx = (seq - 1) % self.slots
+        meta = self._meta[idx]
+        for _ in range(3):
+            before = int(meta[_S_SEQ])
+            if before != 2 * seq:
+                if before == 2 * seq - 1:
+                    self.torn += 1
+                    continue  # escrita em andamento: tenta de novo
+                return None  # slot já é de outro frame
+            height, width, channels = int(meta[_S_HEIGHT]), int(meta[_S_WIDTH]), int(meta[_S_CHANNELS])
+            shape = (height, width) if channels == 1 else (height, width, channels)
+            array = self._data[idx, : int(meta[_S_NBYTES])].reshape(shape)
+            game_id = bytes(self._games[idx]).rstrip(b"\0").decode("utf-8", errors="ignore")
+            timestamp_ns = int(meta[_S_TS_NS])
+            if int(meta[_S_SEQ]) != before:
+                self.torn += 1
+                continue
+            meta[_S_READ] = 1
+            self.reads += 1
+            return FrameView(seq=seq, array=array, game_id=game_id, timestamp_ns=timestamp_ns, _ring=self)
+        return None
+
+    def latest(self, *, after: int | None = None) -> FrameView | None:
+        """Frame mais novo com sequência > `after` (padrão: o último lido por este leitor)."""
+        after = self._last_seq if after is None else after
+        seq = self.write_seq
+        if seq <= after:
+            return None
+        frame = self._view(seq)
+        if frame is not None:
+            if self._last_seq:
+                self.skipped += max(0, seq - self._last_seq - 1)
+            self._last_seq = seq
+        return frame
+
+    def read(self, seq: int) -> FrameView | None:
+        """Leitura sequencial; None se `seq` ainda não foi escrito ou já foi sobrescrito."""
+        if seq <= 0 or seq > self.write_seq:
+            return None
+        frame = self._view(seq)
+        if frame is not None:
+            self._last_seq = max(self._last_seq, seq)
+        return frame
+
+    def stats(self) -> dict[str, Any]:
+        elapsed = max(1e-9, time.monotonic() - self._opened_at)
+        return {
+            "name": self.name,
+            "slots": self.slots,
+            "slot_bytes": self.slot_bytes,
+            "write_seq": self.write_seq,
+            "written": int(self._header[_H_WRITTEN]),
+            "overwritten_unread": int(self._header[_H_OVERWRITTEN]),
+            "reads": self.reads,
+            "skipped": self.skipped,
+            "torn_retries": self.torn,
+            "reads_per_s": round(self.reads / elapsed, 1),
+        }
+
+    def close(self) -> None:
+        # views numpy (inclusive FrameView.array) precisam sair antes de fechar o mmap
+        del self._header, self._meta, self._games, self._data
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _consumer(name: str, seconds: float, queue: Any) -> None:
+    ring = FrameRing.attach(name)
+    deadline = time.monotonic() + seconds
+    checksum = 0
+    while time.monotonic() < deadline:
+        frame = ring.latest()
+        if frame is None:
+            time.sleep(0.0005)
+            continue
+        checksum += int(frame.array[0, 0, 0])  # toca o frame sem copiar
+        del frame
+    queue.put(ring.stats())
+    ring.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    import multiprocessing as mp
+
+    parser = argparse.ArgumentParser(description="Demo do FrameRing: 1 produtor, 1 consumidor (outro processo)")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--size", default="1280x720")
+    parser.add_argument("--slots", type=int, default=8)
+    args = parser.parse_args()
+    w, h = (int(v) for v in args.size.lower().split("x"))
+
+    ring = FrameRing.create(slots=args.slots, slot_bytes=w * h * 3)
+    frame = np.zeros((h, w, 3), dtype=np.uint8)
+    results: Any = mp.Queue()
+    consumer = mp.Process(target=_consumer, args=(ring.name, 2.0, results))
+    consumer.start()
+    time.sleep(0.2)
+    started = time.perf_counter()
+    for i in range(args.frames):
+        frame[0, 0, 0] = i % 255
+        ring.write(frame, game_id="demo")
+    elapsed = time.perf_counter() - started
+    consumer_stats = results.get()
+    consumer.join()
+    print(f"produtor: {args.frames / elapsed:,.0f} frames/s ({w}x{h}x3, {w * h * 3 / 1e6:.1f} MB/frame)")
+    print(f"produtor: {ring.stats()}")
+    print(f"consumidor: {consumer_stats}")
+    ring.close()
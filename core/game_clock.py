@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from core.oracle_nba import parse_clock
+
+
+@dataclass(frozen=True, slots=True)
+class ClockVerdict:
+    agreed: bool
+    reason: str | None
+    predicted: float | None
+    drift_s: float | None
+    running: bool
+
+
+class GameClock:
+    """Relógio de jogo por dead reckoning entre leituras de OCR.
+
+    Guarda a última âncora (quarto, segundos restantes, instante monotônico) e se o
+    relógio está correndo; `seconds_at()` extrapola a partir dela em O(1), então dá
+    para comparar relógios a qualquer instante sem esperar o próximo frame lido.
+    Cada leitura nova reancora o modelo; divergência maior que `tolerance_s` entre o
+    previsto e o lido é sinalizada (`disagreements`). O relógio é considerado parado
+    quando a mesma leitura se repete por `stop_after_s`.
+    """
+
+    def __init__(
+        self,
+        *,
+        tolerance_s: float = 2.0,
+        stop_after_s: float = 1.5,
+        max_extrapolation_s: float = 60.0,
+    ) -> None:
+        self.tolerance_s = tolerance_s
+        self.stop_after_s = stop_after_s
+        self.max_extrapolation_s = max_extrapolation_s
+        self.quarter: int | None = None
+        self.anchor_seconds: float | None = None
+        self.anchor_at: float | None = None
+        self.running = False
+        self.last_reading_at: float | None = None
+        self.readings = 0
+        self.disagreements = 0
+        self._value: tuple[int, int] | None = None
+        self._value_since: float | None = None
+
+    def seconds_at(self, now: float | None = None) -> float | None:
+        """Segundos restantes estimados no instante `now` (None sem âncora ou leitura velha demais)."""
+        if self.anchor_seconds is None or self.anchor_at is None:
+            return None
+        now = time.monotonic() if now is None else now
+        if self.last_reading_at is not None and now - self.last_reading_at > self.max_extrapolation_s:
+            return None
+        if not self.running:
+            return self.anchor_seconds
+        return max(0.0, self.anchor_seconds - (now - self.anchor_at))
+
+    def label(self, now: float | None = None) -> str | None:
+        """Relógio estimado no formato do OCR ('Q1 05:03'), aceito por `parse_clock`."""
+        seconds = self.seconds_at(now)
+        if seconds is None or self.quarter is None:
+            return None
+        # o placar mostra o segundo "cheio" enquanto ele não termina
+        whole = int(-(-seconds // 1))
+        return f"Q{self.quarter} {whole // 60:02d}:{whole % 60:02d}"
+
+    def _anchor(self, quarter: int, seconds: float, now: float) -> None:
+        self.quarter = quarter
+        self.anchor_seconds = seconds
+        self.anchor_at = now
+
+    def observe(self, clock: Any, *, observed_at: float | None = None) -> ClockVerdict | None:
+        """Reancora com uma leitura ('Q1 05:03'); None se o texto não tem relógio."""
+        quarter, seconds = parse_clock(clock)
+        if quarter is None or seconds is None:
+            return None
+        now = time.monotonic() if observed_at is None else observed_at
+        self.readings += 1
+
+        if self.quarter != quarter or self.anchor_seconds is None:
+            self._anchor(quarter, float(seconds), now)
+            self.running = False
+            self._value, self._value_since = (quarter, seconds), now
+            self.last_reading_at = now
+            return ClockVerdict(agreed=True, reason="NOVO_QUARTO", predicted=None, drift_s=None, running=False)
+
+        predicted = self.seconds_at(now)
+        previous = self._value
+        if previous != (quarter, seconds):
+            # leitura mudou: correndo se desceu
+            self.running = previous is not None and seconds < previous[1]
+            self._value, self._value_since = (quarter, seconds), now
+        elif self.running and now - (self._value_since or now) >= self.stop_after_s:
+            # mesmo segundo por tempo demais: parou (falta, tempo técnico, lance livre)
+            self.running = False
+            self._anchor(quarter, float(seconds), now)
+
+        drift = None if predicted is None else seconds - predicted
+        agreed = drift is None or abs(drift) <= self.tolerance_s
+        self.last_reading_at = now
+        if not agreed:
+            self.disagreements += 1
+            self._anchor(quarter, float(seconds), now)
+            return ClockVerdict(agreed=False, reason="RELOGIO_DIVERGE", predicted=predicted, drift_s=drift, running=self.running)
+
+        # previsão dentro do segundo lido: mantém a fase sub-segundo do modelo
+        if predicted is None or not (seconds - 1 < predicted <= seconds) or not self.running:
+            self._anchor(quarter, float(seconds), now)
+        return ClockVerdict(agreed=True, reason=None, predicted=predicted, drift_s=drift, running=self.running)
+
+    def snapshot(self, wall_offset: float) -> dict[str, Any]:
+        """Âncora do relógio; instantes monotônicos viram epoch (+ `wall_offset`)."""
+        def wall(t: float | None) -> float | None:
+            return None if t is None else round(t + wall_offset, 3)
+
+        return {
+            "quarter": self.quarter,
+            "anchor_seconds": self.anchor_seconds,
+            "anchor_at": wall(self.anchor_at),
+            "running": self.running,
+            "last_reading_at": wall(self.last_reading_at),
+            "readings": self.readings,
+            "disagreements": self.disagreements,
+            "value": list(self._value) if self._value is not None else None,
+            "value_since": wall(self._value_since),
+        }
+
+    def restore(self, state: dict[str, Any], wall_offset: float) -> None:
+        def mono(t: float | None) -> float | None:
+            return None if t is None else t - wall_offset
+
+        self.quarter = state.get("quarter")
+        self.anchor_seconds = state.get("anchor_seconds")
+        self.anchor_at = mono(state.get("anchor_at"))
+        self.running = bool(state.get("running"))
+        self.last_reading_at = mono(state.get("last_reading_at"))
+        self.readings = int(state.get("readings") or 0)
+        self.disagreements = int(state.get("disagreements") or 0)
+        value = state.get("value")
+        self._value = (value[0], value[1]) if value else None
+        self._value_since = mono(state.get("value_since"))
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "clock": self.label(),
+            "running": self.running,
+            "readings": self.readings,
+            "disagreements": self.disagreements,
+        }
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+from core.oracle_nba import parse_clock, parse_score
+
+
+@dataclass(frozen=True, slots=True)
+class ScoreEvent:
+    observed_at: float
+    H: int
+    A: int
+    delta_h: int
+    delta_a: int
+    quarter: int | None
+    seconds: int | None
+
+
+@dataclass(frozen=True, slots=True)
+class TimelineVerdict:
+    accepted: bool
+    reason: str | None
+    score: dict[str, int] | None
+
+
+class GameTimeline:
+    """Linha do tempo de pontuação de um jogo com restrições monotônicas.
+
+    Placar só sobe, em passos de 1/2/3; relógio não volta dentro do mesmo quarto e
+    também não salta para a frente (mais de um quarto, ou mais que o tempo real
+    decorrido + `clock_jump_s`). Leituras impossíveis (típicas de OCR errado) são
+    rejeitadas em O(1) por tick. Uma leitura rejeitada que se repete `confirm_after`
+    vezes seguidas, coerente no placar *e* no relógio, é aceita como correção legítima
+    (ex.: cesta anulada). Só os últimos `window` eventos ficam em memória.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_step: int = 3,
+        short_interval_s: float = 5.0,
+        clock_tolerance_s: int = 1,
+        confirm_after: int = 3,
+        clock_jump_s: float = 30.0,
+        window: int = 64,
+    ) -> None:
+        self.max_step = max_step
+        self.short_interval_s = short_interval_s
+        self.clock_tolerance_s = clock_tolerance_s
+        self.confirm_after = confirm_after
+        self.clock_jump_s = clock_jump_s
+        self.events: deque[ScoreEvent] = deque(maxlen=window)
+        self.score: dict[str, int] | None = None
+        self.quarter: int | None = None
+        self.seconds: int | None = None
+        self.updated_at: float | None = None
+        self.last_tick_at: float | None = None
+        self.rejected = 0
+        self._pending: tuple[int, int, int | None, int | None, float] | None = None
+        self._pending_count = 0
+
+    def _check(self, h: int, a: int, quarter: int | None, seconds: int | None, now: float) -> str | None:
+        elapsed = now - self.last_tick_at if self.last_tick_at is not None else 0.0
+        if self.score is not None:
+            dh = h - self.score["H"]
+            da = a - self.score["A"]
+            if dh < 0 or da < 0:
+                return "PLACAR_DIMINUIU"
+            if elapsed <= self.short_interval_s and (dh > self.max_step or da > self.max_step):
+                return "SALTO_IMPOSSIVEL"
+
+        if quarter is not None and self.quarter is not None:
+            if quarter < self.quarter:
+                return "QUARTO_VOLTOU"
+            if quarter > self.quarter + 1:
+                return "QUARTO_SALTOU"
+            if quarter == self.quarter and seconds is not None and self.seconds is not None:
+                if seconds > self.seconds + self.clock_tolerance_s:
+                    return "RELOGIO_VOLTOU"
+                # o relógio do jogo não corre mais rápido que o tempo real
+                if seconds < self.seconds - elapsed - self.clock_jump_s:
+                    return "RELOGIO_SALTOU"
+        return None
+
+    def _confirms(self, h: int, a: int, quarter: int | None, seconds: int | None, now: float) -> bool:
+        """A leitura repete a pendente: mesmo placar, mesmo quarto e relógio coerente com ela."""
+        if self._pending is None:
+            return False
+        ph, pa, pq, ps, pat = self._pending
+        if (ph, pa, pq) != (h, a, quarter):
+            return False
+        if ps is None or seconds is None:
+            return ps is None and seconds is None
+        return ps - (now - pat) - self.clock_tolerance_s <= seconds <= ps + self.clock_tolerance_s
+
+    def observe(self, score: Any, clock: Any = None, *, observed_at: float | None = None) -> TimelineVerdict:
+        """Valida uma leitura (placar + relógio) e, se plausível, avança a linha do tempo."""
+        parsed = parse_score(score)
+        if parsed is None:
+            return TimelineVerdict(accepted=False, reason="SEM_PLACAR", score=self.score)
+
+        now = time.monotonic() if observed_at is None else observed_at
+        quarter, seconds = parse_clock(clock)
+        h, a = parsed["H"], parsed["A"]
+
+        reason = self._check(h, a, quarter, seconds, now)
+        if reason is not None:
+            self._pending_count = self._pending_count + 1 if self._confirms(h, a, quarter, seconds, now) else 1
+            self._pending = (h, a, quarter, seconds, now)
+            if self._pending_count < self.confirm_after:
+                self.rejected += 1
+                return TimelineVerdict(accepted=False, reason=reason, score=self.score)
+            # leitura insistente: aceita como correção e reancora a linha do tempo
+            reason = "CORRECAO_CONFIRMADA"
+
+        self._pending = None
+        self._pending_count = 0
+
+        previous = self.score
+        if previous is None or previous["H"] != h or previous["A"] != a:
+            self.events.append(
+                ScoreEvent(
+                    observed_at=now,
+                    H=h,
+                    A=a,
+                    delta_h=h - (previous or {}).get("H", h),
+                    delta_a=a - (previous or {}).get("A", a),
+                    quarter=quarter,
+                    seconds=seconds,
+                )
+            )
+            self.score = {"H": h, "A": a}
+            self.updated_at = now
+        if quarter is not None:
+            self.quarter, self.seconds = quarter, seconds
+        self.last_tick_at = now
+        return TimelineVerdict(accepted=True, reason=reason, score=self.score)
+
+    def snapshot(self, wall_offset: float) -> dict[str, Any]:
+        """Estado serializável; instantes monotônicos viram epoch (+ `wall_offset`)."""
+        def wall(t: float | None) -> float | None:
+            return None if t is None else round(t + wall_offset, 3)
+
+        return {
+            "events": [
+                [wall(e.observed_at), e.H, e.A, e.delta_h, e.delta_a, e.quarter, e.seconds] for e in self.events
+            ],
+            "score": self.score,
+            "quarter": self.quarter,
+            "seconds": self.seconds,
+            "updated_at": wall(self.updated_at),
+            "last_tick_at": wall(self.last_tick_at),
+            "rejected": self.rejected,
+        }
+
+    def restore(self, state: dict[str, Any], wall_offset: float) -> None:
+        def mono(t: float | None) -> float | None:
+            return None if t is None else t - wall_offset
+
+        self.events.clear()
+        for observed_at, h, a, dh, da, quarter, seconds in state.get("events") or []:
+            self.events.append(ScoreEvent(mono(observed_at), h, a, dh, da, quarter, seconds))
+        self.score = state.get("score")
+        self.quarter = state.get("quarter")
+        self.seconds = state.get("seconds")
+        self.updated_at = mono(state.get("updated_at"))
+        self.last_tick_at = mono(state.get("last_tick_at"))
+        self.rejected = int(state.get("rejected") or 0)
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import json
+import os
+from collections import deque
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+
+# Vocabulário padrão: rótulo -> tokens. "CONFIRMACAO" marca a linha como registrada;
+# os rótulos numéricos dão o tipo de ponto. Novos idiomas entram via JSON (ORACLE_LINE_VOCABULARY).
+DEFAULT_VOCABULARY: dict[str, list[str]] = {
+    "CONFIRMACAO": ["✓", "✔", "registrou", "registrado", "confirmado", "ok", "green", "scored", "confirmed"],
+    "3": ["3pts", "3pt", "3 pts", "3 pt", "3 pontos", "3-pointer", "three pointer", "triple", "triplo"],
+    "2": ["2pts", "2pt", "2 pts", "2 pt", "2 pontos", "2-pointer", "two pointer", "bandeja", "enterrada", "dunk", "layup"],
+    "1": ["lance livre", "lances livres", "free throw", "free throws", "ft", "1pt", "1 pt"],
+}
+
+CONFIRM_LABEL = "CONFIRMACAO"
+
+
+class KeywordMatch(NamedTuple):
+    start: int
+    end: int
+    token: str
+    label: str
+
+
+class LineClassification(NamedTuple):
+    confirmed: bool
+    points: int | None
+    tokens: tuple[str, ...]
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordAutomaton:
+    """Aho-Corasick sobre texto já em minúsculas: todos os tokens numa passada só.
+
+    Um token que começa/termina com letra ou dígito só casa em fronteira de palavra
+    ("ok" não casa em "bloko", "ft" não casa em "left"); símbolos como "✓" casam em qualquer lugar.
+    """
+
+    def __init__(self, vocabulary: dict[str, list[str]]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[tuple[str, str]]] = [[]]
+        for label, tokens in vocabulary.items():
+            for token in tokens:
+                if token:
+                    self._add(token.lower(), label)
+        self._build()
+
+    def _add(self, token: str, label: str) -> None:
+        state = 0
+        for ch in token:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((token, label))
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> Iterator[KeywordMatch]:
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for token, label in out[state]:
+                start = i - len(token) + 1
+                if _is_word_char(token[0]) and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if _is_word_char(token[-1]) and i + 1 < len(text) and _is_word_char(text[i + 1]):
+                    continue
+                yield KeywordMatch(start, i + 1, token, label)
+
+
+class LineClassifier:
+    """Classifica uma linha da Bet365 (confirmada? quantos pontos?) com um único autômato."""
+
+    def __init__(self, vocabulary: dict[str, list[str]] | None = None) -> None:
+        self.vocabulary = vocabulary or DEFAULT_VOCABULARY
+        self.automaton = KeywordAutomaton(self.vocabulary)
+
+    @classmethod
+    def from_file(cls, path: str | Path, *, extend_default: bool = True) -> LineClassifier:
+        """JSON `{"rótulo": ["token", ...]}`; por padrão soma os tokens ao vocabulário padrão."""
+        loaded = json.loads(Path(path).read_text(encoding="utf-8"))
+        if not extend_default:
+            return cls({str(k): [str(t) for t in v] for k, v in loaded.items()})
+        merged = {label: list(tokens) for label, tokens in DEFAULT_VOCABULARY.items()}
+        for label, tokens in loaded.items():
+            merged.setdefault(str(label), []).extend(str(t) for t in tokens)
+        return cls(merged)
+
+    def classify(self, line: str) -> LineClassification:
+        confirmed = False
+        points: int | None = None
+        tokens: list[str] = []
+        for match in self.automaton.find(line.lower()):
+            tokens.append(match.token)
+            if match.label == CONFIRM_LABEL:
+                confirmed = True
+            elif match.label.isdigit():
+                # mais de um tipo na linha: vale o maior (mesma precedência da heurística antiga)
+                points = max(points or 0, int(match.label))
+        return LineClassification(confirmed, points, tuple(tokens))
+
+
+_classifier: LineClassifier | None = None
+
+
+def get_line_classifier() -> LineClassifier:
+    """Classificador compartilhado (vocabulário extra em ORACLE_LINE_VOCABULARY, se definido)."""
+    global _classifier
+    if _classifier is None:
+        path = os.getenv("ORACLE_LINE_VOCABULARY")
+        _classifier = LineClassifier.from_file(path) if path else LineClassifier()
+    return _classifier
+
+
+def set_line_classifier(classifier: LineClassifier) -> None:
+    global _classifier
+    _classifier = classifier
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import sys
+from bisect import bisect_left, bisect_right, insort
+from typing import Iterable
+
+from core.oracle_nba import ScoringLine, _line_indicates_scoring
+
+
+def _valid_quarter(quarter: int | None) -> bool:
+    return quarter is not None and 1 <= quarter <= 9
+
+
+class LineStore:
+    """Histórico de linhas da Bet365 de um jogo, sem repetição e indexado por relógio.
+
+    Cada linha crua é internada e classificada uma única vez; as confirmadas com
+    relógio entram num índice ordenado por (quarto, segundos restantes), então
+    "linhas confirmadas a ±N s do relógio do vídeo" sai por bisect em O(log n).
+    Linhas sem quarto válido ("Q05:03" vira quarto 0) vão para um índice só por
+    segundos e casam com qualquer quarto; o mesmo vale para a busca quando é o
+    relógio do vídeo que vem sem quarto válido.
+    """
+
+    def __init__(self) -> None:
+        self._seen: dict[str, ScoringLine | None] = {}
+        self._seconds: dict[int, list[tuple[int, int]]] = {}
+        # sem quarto válido: casam só pelos segundos
+        self._loose: list[tuple[int, int]] = []
+        # todas as linhas com relógio, para busca quando o quarto do vídeo é inválido
+        self._all: list[tuple[int, int]] = []
+        self._lines: list[ScoringLine] = []
+        self.untimed: list[ScoringLine] = []
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    @property
+    def confirmed(self) -> int:
+        return len(self._lines) + len(self.untimed)
+
+    def add(self, line: str) -> ScoringLine | None:
+        raw = line.strip()
+        if raw in self._seen:
+            return self._seen[raw]
+        raw = sys.intern(raw)
+        parsed = _line_indicates_scoring(raw)
+        self._seen[raw] = parsed
+        if parsed is not None:
+            if parsed.seconds is not None:
+                # (segundos, posição em _lines): empate resolvido pela ordem de chegada
+                key = (parsed.seconds, len(self._lines))
+                if _valid_quarter(parsed.quarter):
+                    insort(self._seconds.setdefault(parsed.quarter, []), key)
+                else:
+                    insort(self._loose, key)
+                insort(self._all, key)
+                self._lines.append(parsed)
+            else:
+                self.untimed.append(parsed)
+        return parsed
+
+    def extend(self, lines: Iterable[str]) -> None:
+        for line in lines:
+            self.add(line)
+
+    def get(self, line: str) -> ScoringLine | None:
+        """Classificação já calculada (None se não confirmada ou nunca vista)."""
+        return self._seen.get(line.strip())
+
+    def _window(self, keys: list[tuple[int, int]], seconds: int, window_s: int) -> list[tuple[int, int]]:
+        lo = bisect_left(keys, (seconds - window_s, -1))
+        hi = bisect_right(keys, (seconds + window_s, len(self._lines)))
+        # expande a partir do relógio para os dois lados: O(log n + k)
+        right = bisect_left(keys, (seconds, -1), lo, hi)
+        left = right - 1
+        found: list[tuple[int, int]] = []
+        while True:
+            if left >= lo and (right >= hi or seconds - keys[left][0] <= keys[right][0] - seconds):
+                found.append((seconds - keys[left][0], keys[left][1]))
+                left -= 1
+            elif right < hi:
+                found.append((keys[right][0] - seconds, keys[right][1]))
+                right += 1
+            else:
+                return found
+
+    def near(self, quarter: int | None, seconds: int, window_s: int, *, limit: int | None = None) -> list[ScoringLine]:
+        """Linhas confirmadas a no máximo `window_s` do relógio, mais próximas primeiro.
+
+        Com quarto válido: as do quarto + as sem quarto. Sem quarto válido: só pelos segundos.
+        """
+        if _valid_quarter(quarter):
+            found = self._window(self._seconds.get(quarter, []), seconds, window_s)
+            if self._loose:
+                found = sorted(found + self._window(self._loose, seconds, window_s))
+        else:
+            found = self._window(self._all, seconds, window_s)
+        if limit is not None:
+            found = found[:limit]
+        return [self._lines[i] for _, i in found]
+
+    def snapshot(self) -> list[str]:
+        """Linhas cruas na ordem de chegada (a classificação é refeita no `extend`)."""
+        return list(self._seen)
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import asyncio
+import time
+import weakref
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True)
 class OfficialResult:
     ok: bool
     provider: str
@@ -23,39 +27,24 @@ def _try_import_httpx():
         return None
 
 
-async def fetch_balldontlie_game(*, base_url: str, api_key: str | None, game_id: int) -> OfficialResult:
-    """Busca um jogo por ID no balldontlie.
+_MISSING_HTTPX = "Dependência ausente: httpx. Instale: pip install httpx"
 
-    OBS: A API do balldontlie pode variar por versão. Mantemos isso opcional e configurável.
-    """
+# limite de `per_page` do /games: listas maiores viram várias páginas
+MAX_PER_PAGE = 100
 
-    httpx = _try_import_httpx()
-    if httpx is None:
-        return OfficialResult(
-            ok=False,
-            provider="balldontlie",
-            placar=None,
-            tempo=None,
-            raw=None,
-            error="Dependência ausente: httpx. Instale: pip install httpx",
-        )
 
-    headers = {}
-    if api_key:
-        headers["Authorization"] = api_key
+def _error_result(error: str) -> OfficialResult:
+    return OfficialResult(ok=False, provider="balldontlie", placar=None, tempo=None, raw=None, error=error)
 
-    url = f"{base_url.rstrip('/')}/games/{game_id}"
-    try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            resp = await client.get(url, headers=headers)
-            resp.raise_for_status()
-            data = resp.json()
-    except Exception as exc:
-        return OfficialResult(ok=False, provider="balldontlie", placar=None, tempo=None, raw=None, error=str(exc))
+
+def parse_balldontlie_game(data: dict[str, Any]) -> OfficialResult:
+    """Converte o JSON de um jogo do balldontlie em OfficialResult."""
+    # v1 atual embrulha o jogo em {"data": {...}}
+    game = data.get("data") if isinstance(data.get("data"), dict) else data
 
     # Tentativa de extrair score
-    home = data.get("home_team_score")
-    away = data.get("visitor_team_score")
+    home = game.get("home_team_score")
+    away = game.get("visitor_team_score")
     placar = None
     try:
         if home is not None and away is not None:
@@ -63,4 +52,236 @@ async def fetch_balldontlie_game(*, base_url: str, api_key: str | None, game_id:
     except Exception:
         placar = None
 
-    return OfficialResult(ok=True, provider="balldontlie", placar=placar, tempo=None, raw=data)
+    # Relógio: period + time ("5:03") -> "Q4 5:03" (mesmo formato aceito por parse_clock)
+    tempo = None
+    period = game.get("period")
+    clock = str(game.get("time") or "").strip()
+    if period and ":" in clock:
+        tempo = f"Q{period} {clock}"
+
+    return OfficialResult(ok=True, provider="balldontlie", placar=placar, tempo=tempo, raw=data)
+
+
+class BalldontlieClient:
+    """Cliente compartilhado do balldontlie (pool de conexões + keep-alive).
+
+    - Cache TTL por game_id (LRU limitado) e revalidação condicional via ETag/If-None-Match.
+    - Buscas concorrentes do mesmo game_id compartilham uma única requisição.
+    - `fetch_games` busca vários jogos numa só chamada (`/games?game_ids[]=...`).
+
+    Deve ser aberto/fechado pelo lifespan do app (`start`/`aclose`).
+    """
+
+    def __init__(
+        self,
+        *,
+        base_url: str,
+        api_key: str | None = None,
+        timeout_s: float = 5.0,
+        cache_ttl_s: float = 2.0,
+        max_connections: int = 20,
+        cache_max_entries: int = 512,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.timeout_s = timeout_s
+        self.cache_ttl_s = cache_ttl_s
+        self.max_connections = max_connections
+        self.cache_max_entries = cache_max_entries
+        self._client: Any = None
+        # expirado continua guardado (base do 304), mas o LRU limita o total; ETag só de quem está no cache
+        self._cache: OrderedDict[int, tuple[float, OfficialResult]] = OrderedDict()
+        self._etags: dict[int, str] = {}
+        self._inflight: dict[int, asyncio.Future] = {}
+
+    async def __aenter__(self) -> "BalldontlieClient":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.aclose()
+
+    async def start(self) -> None:
+        httpx = _try_import_httpx()
+        if httpx is None or self._client is not None:
+            return
+        headers = {"Authorization": self.api_key} if self.api_key else {}
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=headers,
+            timeout=self.timeout_s,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+                keepalive_expiry=30.0,
+            ),
+        )
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def cached(self, game_id: int) -> OfficialResult | None:
+        item = self._cache.get(game_id)
+        if item is not None and item[0] > time.monotonic():
+            return item[1]
+        return None
+
+    def _store(self, game_id: int, result: OfficialResult) -> None:
+        self._cache[game_id] = (time.monotonic() + self.cache_ttl_s, result)
+        self._cache.move_to_end(game_id)
+        while len(self._cache) > self.cache_max_entries:
+            evicted, _ = self._cache.popitem(last=False)
+            self._etags.pop(evicted, None)
+
+    def _track(self, game_id: int, task: asyncio.Future) -> asyncio.Future:
+        self._inflight[game_id] = task
+
+        def done(_: asyncio.Future) -> None:
+            if self._inflight.get(game_id) is task:
+                del self._inflight[game_id]
+
+        task.add_done_callback(done)
+        return task
+
+    async def fetch_game(self, game_id: int) -> OfficialResult:
+        """Busca um jogo por ID (cache TTL + single-flight + ETag).
+
+        A requisição compartilhada é uma task própria, esperada via `asyncio.shield`:
+        cancelar quem disparou não cancela os outros que esperam o mesmo jogo.
+        """
+        hit = self.cached(game_id)
+        if hit is not None:
+            return hit
+
+        task = self._inflight.get(game_id)
+        if task is None:
+            task = self._track(game_id, asyncio.ensure_future(self._get_game(game_id)))
+        return await asyncio.shield(task)
+
+    async def _get_game(self, game_id: int) -> OfficialResult:
+        if self._client is None:
+            await self.start()
+        if self._client is None:
+            return _error_result(_MISSING_HTTPX)
+
+        headers = {}
+        etag = self._etags.get(game_id)
+        previous = self._cache.get(game_id)
+        if etag and previous is not None:
+            headers["If-None-Match"] = etag
+
+        try:
+            resp = await self._client.get(f"/games/{game_id}", headers=headers, timeout=self.timeout_s)
+            if resp.status_code == 304 and previous is not None:
+                result = previous[1]
+            else:
+                resp.raise_for_status()
+                result = parse_balldontlie_game(resp.json())
+                if resp.headers.get("etag"):
+                    self._etags[game_id] = resp.headers["etag"]
+        except Exception as exc:
+            return _error_result(str(exc))
+
+        self._store(game_id, result)
+        return result
+
+    async def fetch_games(self, game_ids: list[int]) -> dict[int, OfficialResult]:
+        """Busca vários jogos numa única requisição (o que estiver em cache não é refeito)."""
+        results: dict[int, OfficialResult] = {}
+        pending: dict[int, asyncio.Future] = {}
+        missing: list[int] = []
+        for game_id in dict.fromkeys(game_ids):
+            hit = self.cached(game_id)
+            if hit is not None:
+                results[game_id] = hit
+            elif game_id in self._inflight:
+                pending[game_id] = self._inflight[game_id]
+            else:
+                missing.append(game_id)
+
+        if missing:
+            batch = asyncio.ensure_future(self._get_games(missing))
+            for game_id in missing:
+                pending[game_id] = self._track(game_id, asyncio.ensure_future(self._pick(batch, game_id)))
+
+        for game_id, task in pending.items():
+            results[game_id] = await asyncio.shield(task)
+        return results
+
+    @staticmethod
+    async def _pick(batch: asyncio.Future, game_id: int) -> OfficialResult:
+        fetched = await asyncio.shield(batch)
+        return fetched.get(game_id) or _error_result(f"Jogo {game_id} ausente na resposta")
+
+    async def _get_games(self, game_ids: list[int]) -> dict[int, OfficialResult]:
+        if self._client is None:
+            await self.start()
+        if self._client is None:
+            return {game_id: _error_result(_MISSING_HTTPX) for game_id in game_ids}
+
+        fetched: dict[int, OfficialResult] = {}
+        chunks = [game_ids[i : i + MAX_PER_PAGE] for i in range(0, len(game_ids), MAX_PER_PAGE)]
+        pages = await asyncio.gather(*(self._get_page(chunk) for chunk in chunks))
+        for chunk, page in zip(chunks, pages):
+            if isinstance(page, str):
+                fetched.update({game_id: _error_result(page) for game_id in chunk})
+            else:
+                fetched.update(page)
+        return fetched
+
+    async def _get_page(self, game_ids: list[int]) -> dict[int, OfficialResult] | str:
+        """Uma página do /games (no máximo MAX_PER_PAGE ids); devolve a mensagem de erro se falhar."""
+        params: list[tuple[str, int]] = [("game_ids[]", game_id) for game_id in game_ids]
+        params.append(("per_page", min(len(game_ids), MAX_PER_PAGE)))
+        try:
+            resp = await self._client.get("/games", params=params, timeout=self.timeout_s)
+            resp.raise_for_status()
+            items = resp.json().get("data") or []
+        except Exception as exc:
+            return str(exc)
+
+        fetched: dict[int, OfficialResult] = {}
+        for item in items:
+            try:
+                game_id = int(item["id"])
+            except Exception:
+                continue
+            result = parse_balldontlie_game(item)
+            fetched[game_id] = result
+            self._store(game_id, result)
+        return fetched
+
+
+_shared: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[tuple[str, str | None], BalldontlieClient]]" = weakref.WeakKeyDictionary()
+
+
+def shared_balldontlie_client(*, base_url: str, api_key: str | None) -> BalldontlieClient:
+    """Cliente reutilizado por (base_url, api_key) no event loop atual (o pool do httpx é do loop)."""
+    clients = _shared.setdefault(asyncio.get_running_loop(), {})
+    key = (base_url.rstrip("/"), api_key)
+    client = clients.get(key)
+    if client is None:
+        client = clients[key] = BalldontlieClient(base_url=base_url, api_key=api_key, cache_ttl_s=0.0)
+    return client
+
+
+async def close_shared_clients() -> None:
+    """Fecha os clientes compartilhados do event loop atual (chamar no shutdown do lifespan)."""
+    clients = _shared.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.aclose()
+
+
+async def fetch_balldontlie_game(*, base_url: str, api_key: str | None, game_id: int) -> OfficialResult:
+    """Busca um jogo por ID no balldontlie.
+
+    OBS: A API do balldontlie pode variar por versão. Mantemos isso opcional e configurável.
+    Reaproveita o cliente (e as conexões) de `shared_balldontlie_client` entre chamadas.
+    """
+
+    if _try_import_httpx() is None:
+        return _error_result(_MISSING_HTTPX)
+
+    return await shared_balldontlie_client(base_url=base_url, api_key=api_key).fetch_game(game_id)
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from bisect import bisect_right
+from typing import Any
+
+import numpy as np
+
+from core.ocr_engines import OcrEnginePool, get_ocr_pool
+
+
+# Margem em branco (px) em volta de cada recorte no mosaico: o Tesseract separa as linhas por ela.
+TILE_GAP = 24
+
+
+def tile_rois(rois: list[np.ndarray], *, gap: int = TILE_GAP, out: np.ndarray | None = None) -> tuple[np.ndarray, list[tuple[int, int, int, int]]]:
+    """Empilha ROIs (cinza/binários uint8) num mosaico vertical; devolve o mosaico e a caixa de cada ROI.
+
+    Todos os recortes ficam com fundo claro (os de fundo escuro são invertidos) para o
+    OCR ver uma polaridade só. `out` é reaproveitado se couber.
+    """
+    width = max(roi.shape[1] for roi in rois) + 2 * gap
+    height = sum(roi.shape[0] for roi in rois) + gap * (len(rois) + 1)
+    if out is None or out.shape[0] < height or out.shape[1] < width:
+        out = np.empty((height, width), dtype=np.uint8)
+    composite = out[:height, :width]
+    composite.fill(255)
+
+    boxes = []
+    y = gap
+    for roi in rois:
+        h, w = roi.shape[:2]
+        region = composite[y:y + h, gap:gap + w]
+        if roi.mean() < 128:
+            np.subtract(255, roi, out=region)
+        else:
+            region[...] = roi
+        boxes.append((gap, y, w, h))
+        y += h + gap
+    return composite, boxes
+
+
+def split_lines(
+    lines: list[tuple[str, tuple[int, int, int, int]]],
+    boxes: list[tuple[int, int, int, int]],
+    *,
+    gap: int = TILE_GAP,
+) -> list[str]:
+    """Devolve o texto de cada ROI: cada linha vai para o recorte que contém o seu centro vertical."""
+    # cada recorte "possui" metade da margem acima e abaixo dele
+    starts = [y - gap // 2 for _, y, _, _ in boxes]
+    texts: list[list[str]] = [[] for _ in boxes]
+    for text, (_, y, _, h) in sorted(lines, key=lambda item: (item[1][1], item[1][0])):
+        idx = bisect_right(starts, y + h / 2) - 1
+        if 0 <= idx < len(boxes):
+            texts[idx].append(text)
+    return ["\n".join(t) for t in texts]
+
+
+class OcrBatcher:
+    """Junta os ROIs que chegam dentro de `window_ms` (de vários jogos) numa única chamada de OCR.
+
+    O mosaico roda numa thread do pool (engine fixa da thread) e o texto é redistribuído
+    pelo layout. Com um ROI só na janela, faz o OCR direto.
+    """
+
+    def __init__(self, pool: OcrEnginePool, *, window_ms: float = 25.0, max_tiles: int = 16) -> None:
+        self.pool = pool
+        self.window_s = window_ms / 1000.0
+        self.max_tiles = max(1, max_tiles)
+        self._pending: list[tuple[np.ndarray, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self._local = threading.local()
+        self.batches = 0
+        self.tiles = 0
+
+    async def recognize(self, roi: np.ndarray) -> str:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        self._pending.append((roi, future))
+        if len(self._pending) >= self.max_tiles:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_s, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[np.ndarray, asyncio.Future]]) -> None:
+        self.batches += 1
+        self.tiles += len(batch)
+        try:
+            texts = await self.pool.run(self._recognize_tiles, [roi for roi, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), text in zip(batch, texts):
+            if not future.done():
+                future.set_result(text)
+
+    def _recognize_tiles(self, rois: list[np.ndarray]) -> list[str]:
+        if len(rois) == 1:
+            return [self.pool.recognize(rois[0])]
+        # mosaico por thread: threads diferentes do pool podem montar lotes ao mesmo tempo
+        composite, boxes = tile_rois(rois, out=getattr(self._local, "composite", None))
+        self._local.composite = composite.base if composite.base is not None else composite
+        return split_lines(self.pool.engine().recognize_lines(composite), boxes)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "tiles": self.tiles,
+            "tiles_per_batch": round(self.tiles / self.batches, 2) if self.batches else None,
+        }
+
+
+_batcher: OcrBatcher | None = None
+
+
+def get_ocr_batcher() -> OcrBatcher | None:
+    """Batcher compartilhado quando ORACLE_OCR_BATCH_MS > 0 (desligado por padrão)."""
+    global _batcher
+    if _batcher is None:
+        window_ms = float(os.getenv("ORACLE_OCR_BATCH_MS", "0") or 0)
+        if window_ms <= 0:
+            return None
+        _batcher = OcrBatcher(
+            get_ocr_pool(),
+            window_ms=window_ms,
+            max_tiles=int(os.getenv("ORACLE_OCR_BATCH_MAX", "16")),
+        )
+    return _batcher
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from abc import ABC, abstractmethod
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+
+OCR_LANG = "eng"
+
+_MISSING_OCR = (
+    "Dependência ausente: pytesseract. Instale: pip install pytesseract e instale o Tesseract no Windows."
+)
+
+
+def _try_import_tesserocr():
+    try:
+        import tesserocr  # type: ignore
+
+        return tesserocr
+    except Exception:
+        return None
+
+
+def _try_import_pytesseract():
+    try:
+        import pytesseract  # type: ignore
+
+        return pytesseract
+    except Exception:
+        return None
+
+
+class OcrEngine(ABC):
+    """Backend de OCR: recebe PIL Image ou array numpy (cinza/binário uint8) e devolve texto."""
+
+    name = "base"
+
+    @abstractmethod
+    def recognize(self, image: Any) -> str:
+        ...
+
+    @abstractmethod
+    def recognize_lines(self, image: Any) -> list[tuple[str, tuple[int, int, int, int]]]:
+        """Linhas de texto com a caixa (x, y, w, h) de cada uma, na ordem de leitura."""
+
+    def close(self) -> None:
+        pass
+
+
+class TesserocrEngine(OcrEngine):
+    """Engine Tesseract em processo (API C via tesserocr): o modelo carrega uma vez só.
+
+    Não é thread-safe: cada instância deve ficar presa a uma única thread (ver OcrEnginePool).
+    """
+
+    name = "tesserocr"
+
+    def __init__(self, *, lang: str = OCR_LANG, psm: int | None = None, whitelist: str | None = None) -> None:
+        tesserocr = _try_import_tesserocr()
+        if tesserocr is None:
+            raise RuntimeError("Dependência ausente: tesserocr. Instale: pip install tesserocr")
+        kwargs: dict[str, Any] = {"lang": lang}
+        if psm is not None:
+            kwargs["psm"] = psm
+        self._tesserocr = tesserocr
+        self._api = tesserocr.PyTessBaseAPI(**kwargs)
+        if whitelist:
+            self._api.SetVariable("tessedit_char_whitelist", whitelist)
+
+    def _set_image(self, image: Any) -> None:
+        if hasattr(image, "tobytes") and hasattr(image, "shape"):
+            # array numpy: passa o buffer direto, sem converter para PIL
+            height, width = image.shape[:2]
+            channels = 1 if image.ndim == 2 else image.shape[2]
+            self._api.SetImageBytes(image.tobytes(), width, height, channels, width * channels)
+        else:
+            self._api.SetImage(image)
+
+    def recognize(self, image: Any) -> str:
+        self._set_image(image)
+        return self._api.GetUTF8Text()
+
+    def recognize_lines(self, image: Any) -> list[tuple[str, tuple[int, int, int, int]]]:
+        self._set_image(image)
+        self._api.Recognize()
+        level = self._tesserocr.RIL.TEXTLINE
+        lines = []
+        for item in self._tesserocr.iterate_level(self._api.GetIterator(), level):
+            box = item.BoundingBox(level)
+            text = item.GetUTF8Text(level)
+            if box is None or not text:
+                continue
+            x1, y1, x2, y2 = box
+            lines.append((text.strip(), (x1, y1, x2 - x1, y2 - y1)))
+        return lines
+
+    def close(self) -> None:
+        self._api.End()
+
+
+class PytesseractEngine(OcrEngine):
+    """Fallback: um processo `tesseract` por chamada (arquivo temporário + leitura do modelo)."""
+
+    name = "pytesseract"
+
+    def __init__(self, *, lang: str = OCR_LANG) -> None:
+        pytesseract = _try_import_pytesseract()
+        if pytesseract is None:
+            raise RuntimeError(_MISSING_OCR)
+        self._pytesseract = pytesseract
+        self.lang = lang
+
+    def recognize(self, image: Any) -> str:
+        return self._pytesseract.image_to_string(image, lang=self.lang)
+
+    def recognize_lines(self, image: Any) -> list[tuple[str, tuple[int, int, int, int]]]:
+        data = self._pytesseract.image_to_data(image, lang=self.lang, output_type=self._pytesseract.Output.DICT)
+        grouped: dict[tuple[int, int, int], list[int]] = {}
+        for i, word in enumerate(data["text"]):
+            if str(word).strip():
+                grouped.setdefault((data["block_num"][i], data["par_num"][i], data["line_num"][i]), []).append(i)
+        lines = []
+        for idx in grouped.values():
+            x1 = min(data["left"][i] for i in idx)
+            y1 = min(data["top"][i] for i in idx)
+            x2 = max(data["left"][i] + data["width"][i] for i in idx)
+            y2 = max(data["top"][i] + data["height"][i] for i in idx)
+            lines.append((" ".join(str(data["text"][i]) for i in idx), (x1, y1, x2 - x1, y2 - y1)))
+        return lines
+
+
+ENGINES: dict[str, Callable[[], OcrEngine]] = {
+    "tesserocr": TesserocrEngine,
+    "pytesseract": PytesseractEngine,
+}
+
+
+def available_backends() -> list[str]:
+    found = []
+    if _try_import_tesserocr() is not None:
+        found.append("tesserocr")
+    if _try_import_pytesseract() is not None:
+        found.append("pytesseract")
+    return found
+
+
+class OcrEnginePool:
+    """Engines de longa duração, uma por thread de trabalho (criada na primeira chamada da thread).
+
+    `executor` tem `size` threads; o que roda nele usa sempre a engine da própria thread,
+    então o modelo de idioma fica carregado entre frames e nenhuma engine é compartilhada.
+    """
+
+    def __init__(self, factory: Callable[[], OcrEngine], *, size: int = 2, name: str | None = None) -> None:
+        self.factory = factory
+        self.size = max(1, size)
+        self.name = name or getattr(factory, "name", "ocr")
+        self._local = threading.local()
+        self._engines: list[OcrEngine] = []
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix=f"ocr-{self.name}")
+        return self._executor
+
+    def engine(self) -> OcrEngine:
+        engine = getattr(self._local, "engine", None)
+        if engine is None:
+            engine = self._local.engine = self.factory()
+            with self._lock:
+                self._engines.append(engine)
+        return engine
+
+    def recognize(self, image: Any) -> str:
+        return self.engine().recognize(image)
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Roda `fn(*args)` numa thread do pool (ex.: o pipeline inteiro de um frame)."""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        with self._lock:
+            for engine in self._engines:
+                engine.close()
+            self._engines.clear()
+        self._local = threading.local()
+
+
+_pool: OcrEnginePool | None = None
+
+
+def get_ocr_pool() -> OcrEnginePool:
+    """Pool compartilhado. ORACLE_OCR_BACKEND=auto|tesserocr|pytesseract, ORACLE_OCR_WORKERS=n."""
+    global _pool
+    if _pool is None:
+        backend = os.getenv("ORACLE_OCR_BACKEND", "auto").lower()
+        if backend == "auto":
+            found = available_backends()
+            if not found:
+                raise RuntimeError(_MISSING_OCR)
+            backend = found[0]
+        factory = ENGINES.get(backend)
+        if factory is None:
+            raise RuntimeError(f"Backend de OCR desconhecido: {backend} (use {', '.join(ENGINES)})")
+        _pool = OcrEnginePool(factory, size=int(os.getenv("ORACLE_OCR_WORKERS", "2")), name=backend)
+    return _pool
+
+
+def close_ocr_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.close()
+        _pool = None
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from core.nba_official import BalldontlieClient, OfficialResult
+from core.oracle_nba import parse_clock, parse_score
+
+
+@dataclass(slots=True)
+class TrackedGame:
+    game_id: str
+    official_game_id: int
+    next_due: float = 0.0
+    interval_s: float = 0.0
+    last: OfficialResult | None = None
+    fetched_at: float | None = None
+    errors: int = 0
+
+
+class OfficialScoreStore:
+    """Último placar oficial por jogo, lido pelo oráculo sem nenhuma I/O."""
+
+    def __init__(self, *, max_age_s: float = 60.0) -> None:
+        self.max_age_s = max_age_s
+        self._items: dict[str, tuple[float, OfficialResult]] = {}
+
+    def put(self, game_id: str, result: OfficialResult) -> None:
+        self._items[game_id] = (time.monotonic(), result)
+
+    def get(self, game_id: str) -> OfficialResult | None:
+        item = self._items.get(game_id)
+        if item is None or time.monotonic() - item[0] > self.max_age_s:
+            return None
+        return item[1]
+
+    def observed_at(self, game_id: str) -> float | None:
+        item = self._items.get(game_id)
+        return item[0] if item is not None else None
+
+    def discard(self, game_id: str) -> None:
+        self._items.pop(game_id, None)
+
+    def as_oracle_input(self, game_id: str) -> dict[str, Any] | None:
+        """Formato do bloco `nba_oficial` do ingest."""
+        result = self.get(game_id)
+        if result is None or not result.ok or not result.placar:
+            return None
+        return {"placar": result.placar, "tempo": result.tempo, "provider": result.provider}
+
+
+def adaptive_interval(
+    result: OfficialResult | None,
+    *,
+    base_s: float = 10.0,
+    late_s: float = 5.0,
+    clutch_s: float = 2.0,
+    final_s: float = 120.0,
+) -> float:
+    """Intervalo de polling: mais rápido em fim de jogo apertado, lento após o final."""
+    if result is None or not result.ok:
+        return base_s
+
+    game = (result.raw or {}).get("data") if isinstance((result.raw or {}).get("data"), dict) else (result.raw or {})
+    if str(game.get("status") or "").lower().startswith("final"):
+        return final_s
+
+    quarter, seconds = parse_clock(result.tempo)
+    if not quarter or quarter < 4:
+        return base_s
+
+    score = parse_score(result.placar)
+    margin = abs(score["H"] - score["A"]) if score else 99
+    if seconds is not None and seconds <= 300 and margin <= 8:
+        return clutch_s
+    return late_s
+
+
+class OfficialScorePoller:
+    """Poller em background: atualiza o placar oficial dos jogos rastreados.
+
+    Um único loop agrupa todos os jogos vencidos numa chamada `fetch_games`
+    e reagenda cada um com `adaptive_interval`.
+    """
+
+    def __init__(
+        self,
+        client: BalldontlieClient,
+        store: OfficialScoreStore,
+        *,
+        max_backoff_s: float = 60.0,
+        tick_s: float = 0.5,
+    ) -> None:
+        self.client = client
+        self.store = store
+        self.max_backoff_s = max_backoff_s
+        self.tick_s = tick_s
+        self._games: dict[str, TrackedGame] = {}
+        self._task: asyncio.Task | None = None
+        self._wakeup = asyncio.Event()
+
+    def track(self, game_id: str, official_game_id: int) -> TrackedGame:
+        game = TrackedGame(game_id=game_id, official_game_id=int(official_game_id))
+        self._games[game_id] = game
+        self._wakeup.set()
+        return game
+
+    def untrack(self, game_id: str) -> bool:
+        self.store.discard(game_id)
+        return self._games.pop(game_id, None) is not None
+
+    def tracked(self) -> list[TrackedGame]:
+        return list(self._games.values())
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="official-score-poller")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def poll_once(self) -> int:
+        """Busca todos os jogos vencidos; retorna quantos foram atualizados."""
+        now = time.monotonic()
+        due = [g for g in self._games.values() if g.next_due <= now]
+        if not due:
+            return 0
+
+        results = await self.client.fetch_games([g.official_game_id for g in due])
+        now = time.monotonic()
+        for game in due:
+            if self._games.get(game.game_id) is not game:
+                continue  # removido durante a busca
+            result = results.get(game.official_game_id)
+            if result is not None and result.ok:
+                game.errors = 0
+                game.last = result
+                game.fetched_at = now
+                game.interval_s = adaptive_interval(result)
+                self.store.put(game.game_id, result)
+            else:
+                game.errors += 1
+                game.interval_s = min(self.max_backoff_s, adaptive_interval(game.last) * (2 ** min(game.errors, 6)))
+            game.next_due = now + game.interval_s
+        return len(due)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                print(f"❌ Official poller error: {exc}")
+
+            now = time.monotonic()
+            next_due = min((g.next_due for g in self._games.values()), default=now + 5.0)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(self.tick_s, next_due - now))
+            except asyncio.TimeoutError:
+                pass
@@ -4,7 +4,12 @@ import re
 import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from core.line_classifier import get_line_classifier
+
+if TYPE_CHECKING:
+    from core.line_store import LineStore
 
 
 ERROR_PRIORITY = [
@@ -16,6 +21,11 @@ ERROR_PRIORITY = [
     "TEMPO_DESYNC",
 ]
 
+POINT_KINDS = {3: "3 pontos", 2: "2 pontos", 1: "1 ponto (lance livre)"}
+
+# Janela (s) em torno do relógio do vídeo para casar linhas confirmadas do histórico do jogo
+LINE_MATCH_WINDOW_S = 30
+
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).astimezone().isoformat(timespec="seconds")
@@ -27,6 +37,10 @@ def parse_score(value: Any) -> dict[str, int] | None:
         return None
 
     if isinstance(value, dict):
+        # caminho rápido: placar já estruturado (schema v2)
+        h, a = value.get("H"), value.get("A")
+        if type(h) is int and type(a) is int:
+            return {"H": h, "A": a}
         # aceita Home/Away, H/A
         for left_key, right_key in (("Home", "Away"), ("H", "A"), ("home", "away")):
             if left_key in value and right_key in value:
@@ -68,46 +82,58 @@ def parse_clock(value: Any) -> tuple[int | None, int | None]:
     return (None, None)
 
 
-def _line_indicates_scoring(line: str) -> dict[str, Any] | None:
+class ScoringLine(NamedTuple):
+    """Linha de pontuação confirmada na Bet365 (registro compacto, imutável)."""
+
+    points: int | None
+    kind: str
+    quarter: int | None
+    seconds: int | None
+    raw: str
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "confirmed": True,
+            "points": self.points,
+            "kind": self.kind,
+            "clock": self.raw,
+            "quarter": self.quarter,
+            "seconds": self.seconds,
+            "raw": self.raw,
+        }
+
+
+class Diagnosis(NamedTuple):
+    erro_detectado: bool
+    tipo: str
+    severidade: str
+    detalhes_tecnicos: str
+
+    def as_dict(self) -> dict[str, Any]:
+        return self._asdict()
+
+
+def _line_indicates_scoring(line: str) -> ScoringLine | None:
     """Heurística para identificar linha de pontuação confirmada na Bet365."""
     if not line:
         return None
 
     raw = line.strip()
-    lowered = raw.lower()
-    confirmed = any(tok in lowered for tok in ["✓", "registrou", "ok", "green"])
-    if not confirmed:
+    classification = get_line_classifier().classify(raw)
+    if not classification.confirmed:
         return None
 
     # Tipo de ponto
-    if "3" in lowered and "pt" in lowered:
-        points = 3
-        kind = "3 pontos"
-    elif "2" in lowered and "pt" in lowered:
-        points = 2
-        kind = "2 pontos"
-    elif "lance livre" in lowered or "free throw" in lowered or "ft" in lowered:
-        points = 1
-        kind = "1 ponto (lance livre)"
-    else:
-        points = None
-        kind = "pontuação"
+    points = classification.points
+    kind = POINT_KINDS.get(points, "pontuação")
 
     # Tempo na própria linha
     q, sec = parse_clock(raw)
 
-    return {
-        "confirmed": True,
-        "points": points,
-        "kind": kind,
-        "clock": raw,
-        "quarter": q,
-        "seconds": sec,
-        "raw": raw,
-    }
+    return ScoringLine(points, kind, q, sec, raw)
 
 
-@dataclass
+@dataclass(slots=True)
 class OracleInput:
     video_score: dict[str, int] | None
     video_clock: str | None
@@ -117,10 +143,32 @@ class OracleInput:
     official_score: dict[str, int] | None
     official_clock: str | None
     system_latency_ms: float | None = None
+    # verdade já fundida por uma fonte externa (ex.: core.score_fusion); substitui a regra vídeo/oficial
+    truth_score: dict[str, int] | None = None
+    # histórico indexado de linhas do jogo (core.line_store); sem ele só as linhas do tick contam
+    line_store: LineStore | None = None
+
+
+def _scored_lines(data: OracleInput, vq: int | None, vsec: int | None) -> list[ScoringLine]:
+    store = data.line_store
+    if store is None:
+        return [x for x in (_line_indicates_scoring(line) for line in data.bet_lines) if x]
+    # as linhas confirmadas do próprio tick sempre contam, com ou sem relógio
+    current = [x for x in map(store.get, data.bet_lines) if x is not None]
+    if vsec is None:
+        return current
+    # quarto ausente/inválido no vídeo => o store casa só pelos segundos
+    near = store.near(vq, vsec, LINE_MATCH_WINDOW_S, limit=4)
+    return near + [x for x in current if x not in near]
 
 
 def detect_oracle_error(data: OracleInput) -> dict[str, Any]:
     """Retorna diagnóstico (tipo/severidade) baseado em regras técnicas + heurísticas."""
+    return diagnose(data).as_dict()
+
+
+def diagnose(data: OracleInput) -> Diagnosis:
+    """Mesmo que `detect_oracle_error`, mas devolve o registro `Diagnosis` (sem dict)."""
 
     # Defaults
     erro_detectado = False
@@ -133,29 +181,29 @@ def detect_oracle_error(data: OracleInput) -> dict[str, Any]:
     o = data.official_score
 
     # 0) Falta de dados
-    if not v or not b:
-        return {
-            "erro_detectado": True,
-            "tipo": "FALTA_DADOS",
-            "severidade": "MEDIA",
-            "detalhes_tecnicos": "Não foi possível obter placar/tempo de uma das fontes.",
-        }
+    if not (v or data.truth_score) or not b:
+        return Diagnosis(True, "FALTA_DADOS", "MEDIA", "Não foi possível obter placar/tempo de uma das fontes.")
 
-    vH, vA = v.get("H", 0), v.get("A", 0)
     bH, bA = b.get("H", 0), b.get("A", 0)
 
-    # Base: verdade absoluta preferida (video; se existir oficial, valida)
-    truth = v
-    if o and abs(o.get("H", 0) - vH) <= 3 and abs(o.get("A", 0) - vA) <= 3:
-        truth = o
+    if data.truth_score:
+        truth = data.truth_score
+    else:
+        # Base: verdade absoluta preferida (video; se existir oficial, valida)
+        vH, vA = v.get("H", 0), v.get("A", 0)
+        truth = v
+        if o and abs(o.get("H", 0) - vH) <= 3 and abs(o.get("A", 0) - vA) <= 3:
+            truth = o
 
     tH, tA = truth.get("H", 0), truth.get("A", 0)
 
     gapH = tH - bH
     gapA = tA - bA
 
-    # 1) LINHA_OK_PLACAR_ATRASADO (prioridade máxima)
-    scored_lines = [x for x in ( _line_indicates_scoring(line) for line in data.bet_lines ) if x]
+    vq, vsec = parse_clock(data.video_clock)
+
+    # 1) LINHA_OK_PLACAR_ATRASADO (prioridade máxima); a linha mais próxima do relógio do vídeo vence
+    scored_lines = _scored_lines(data, vq, vsec)
     if scored_lines and (gapH >= 2 or gapA >= 2):
         erro_detectado = True
         tipo = "LINHA_OK_PLACAR_ATRASADO"
@@ -163,12 +211,11 @@ def detect_oracle_error(data: OracleInput) -> dict[str, Any]:
         best_line = scored_lines[0]
         detalhes = (
             f"Linha confirmada na Bet365 mas placar geral atrasado. "
-            f"Bet={bH}-{bA} vs Verdade={tH}-{tA}. Linha='{best_line['raw']}'."
+            f"Bet={bH}-{bA} vs Verdade={tH}-{tA}. Linha='{best_line.raw}'."
         )
 
     # 2) DELAY_GERAL (>3s) / TEMPO_DESYNC
     if not erro_detectado:
-        vq, vsec = parse_clock(data.video_clock)
         bq, bsec = parse_clock(data.bet_clock)
         if vq and bq and vq == bq and vsec is not None and bsec is not None:
             # bet "parado" => segundos não mudam e ficam muito atrás
@@ -191,12 +238,12 @@ def detect_oracle_error(data: OracleInput) -> dict[str, Any]:
         severidade = "ALTA" if (gapH >= 4 or gapA >= 4) else "MEDIA"
         detalhes = f"Placar Bet365 atrás: Bet={bH}-{bA} vs Verdade={tH}-{tA}."
 
-    return {
-        "erro_detectado": bool(erro_detectado),
-        "tipo": tipo or "OK",
-        "severidade": severidade,
-        "detalhes_tecnicos": detalhes or "Sem divergência relevante detectada.",
-    }
+    return Diagnosis(
+        bool(erro_detectado),
+        tipo or "OK",
+        severidade,
+        detalhes or "Sem divergência relevante detectada.",
+    )
 
 
 def build_oracle_output(
@@ -210,20 +257,25 @@ def build_oracle_output(
     official_clock: Any = None,
     system_status_stream: str = "OK",
     latency_ms: float | None = None,
+    truth_score: Any = None,
+    line_store: LineStore | None = None,
 ) -> dict[str, Any]:
     """Monta o JSON rígido para broadcast (sem executar macro automaticamente)."""
 
     v = parse_score(video_score)
     b = parse_score(bet_score)
     o = parse_score(official_score) if official_score is not None else None
+    t = parse_score(truth_score) if truth_score is not None else None
 
     lines = []
     if isinstance(bet_lines, list):
         lines = [str(x) for x in bet_lines if str(x).strip()]
     elif isinstance(bet_lines, str):
         lines = [bet_lines]
+    if line_store is not None:
+        line_store.extend(lines)
 
-    diagnosis = detect_oracle_error(
+    diagnosis = diagnose(
         OracleInput(
             video_score=v,
             video_clock=str(video_clock) if video_clock is not None else None,
@@ -233,12 +285,14 @@ def build_oracle_output(
             official_score=o,
             official_clock=str(official_clock) if official_clock is not None else None,
             system_latency_ms=latency_ms,
+            truth_score=t,
+            line_store=line_store,
         )
     )
 
     # Confiança simples (heurística)
-    confianca = 0.97 if diagnosis["tipo"] == "LINHA_OK_PLACAR_ATRASADO" else 0.85
-    if not v or not b:
+    confianca = 0.97 if diagnosis.tipo == "LINHA_OK_PLACAR_ATRASADO" else 0.85
+    if not (v or t) or not b:
         confianca = 0.55
 
     return {
@@ -249,22 +303,22 @@ def build_oracle_output(
             "latencia_processamento_ms": int(latency_ms or 0),
         },
         "analise_live": {
-            "placar_real": {"H": (v or {}).get("H", 0), "A": (v or {}).get("A", 0)},
+            "placar_real": {"H": (t or v or {}).get("H", 0), "A": (t or v or {}).get("A", 0)},
             "tempo_video": str(video_clock or ""),
             "evento": "",
         },
         "diagnostico_saas": {
-            "erro_detectado": diagnosis["erro_detectado"],
-            "tipo": diagnosis["tipo"],
-            "detalhes_tecnicos": diagnosis["detalhes_tecnicos"],
-            "severidade": diagnosis["severidade"],
+            "erro_detectado": diagnosis.erro_detectado,
+            "tipo": diagnosis.tipo,
+            "detalhes_tecnicos": diagnosis.detalhes_tecnicos,
+            "severidade": diagnosis.severidade,
         },
         "comando_cliente": {
             "executar": False,
-            "urgencia": "IMEDIATA" if diagnosis["severidade"] in ("CRITICA", "ALTA") else "CAUTELOSA",
+            "urgencia": "IMEDIATA" if diagnosis.severidade in ("CRITICA", "ALTA") else "CAUTELOSA",
             "macro_steps": [],
         },
         "notificacao_dashboard": (
-            "ALERTA: DIVERGENCIA DETECTADA" if diagnosis["erro_detectado"] else "OK: SEM ERRO CRITICO"
+            "ALERTA: DIVERGENCIA DETECTADA" if diagnosis.erro_detectado else "OK: SEM ERRO CRITICO"
         ),
     }
@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+
+# `get(chave, padrão)`: de onde os tempos das fontes vêm (ex.: `RuntimeConfig.value`)
+ConfigGetter = Callable[[str, Any], Any]
+
+
+def static_config(key: str, default: Any) -> Any:
+    """ConfigGetter sem arquivo de config: sempre o padrão do código."""
+    return default
+
+
+def _value(setting: float | Callable[[], float]) -> float:
+    # intervalos podem ser callables (ex.: lidos do snapshot da config a cada tick)
+    return float(setting() if callable(setting) else setting)
+
+
+@dataclass(slots=True)
+class PolledSource:
+    """Uma fonte para o runtime: `fetch()` assíncrono + política de agendamento.
+
+    `interval_s`/`timeout_s`/`error_backoff_s` aceitam número ou callable. `jitter` é a fração do
+    intervalo sorteada em cada prazo (sem acumular). Erros e timeouts seguidos
+    dobram a espera a partir de `error_backoff_s`, até `max_backoff_s`.
+    """
+
+    name: str
+    fetch: Callable[[], Awaitable[Any]]
+    interval_s: float | Callable[[], float] = 1.0
+    timeout_s: float | Callable[[], float] | None = 5.0
+    jitter: float = 0.0
+    error_backoff_s: float | Callable[[], float] = 1.0
+    max_backoff_s: float = 30.0
+
+
+def configured_source(
+    name: str,
+    fetch: Callable[[], Awaitable[Any]],
+    get: ConfigGetter,
+    *,
+    prefix: str,
+    interval_s: float,
+    error_backoff_s: float,
+    timeout_s: float = 5.0,
+    jitter: float = 0.0,
+) -> PolledSource:
+    """Fonte cujos tempos vêm da config a cada tick (`get(chave, padrão)`, ex.: snapshot da runtime config)."""
+    return PolledSource(
+        name=name,
+        fetch=fetch,
+        interval_s=lambda: get(f"{prefix}.interval_seconds", interval_s),
+        timeout_s=lambda: get(f"{prefix}.timeout_seconds", timeout_s),
+        jitter=jitter,
+        error_backoff_s=lambda: get(f"{prefix}.error_backoff_seconds", error_backoff_s),
+    )
+
+
+@dataclass(slots=True)
+class SourceStats:
+    ticks: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    missed: int = 0
+    consecutive_errors: int = 0
+    last_error: str | None = None
+    last_ok_at: float | None = None
+    last_started_at: float | None = None
+    period_s: float | None = None
+    latency_ms: float | None = None
+    max_latency_ms: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "ticks": self.ticks,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "missed": self.missed,
+            "error_rate": round(self.errors / self.ticks, 4) if self.ticks else 0.0,
+            "consecutive_errors": self.consecutive_errors,
+            "last_error": self.last_error,
+            "period_s": round(self.period_s, 4) if self.period_s is not None else None,
+            "latency_ms": round(self.latency_ms, 2) if self.latency_ms is not None else None,
+            "max_latency_ms": round(self.max_latency_ms, 2),
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class Latest:
+    value: Any
+    observed_at: float
+    seq: int
+
+
+@dataclass(slots=True)
+class LatestStore:
+    """Último valor de cada fonte (substituído inteiro; leitura = um lookup)."""
+
+    _items: dict[str, Latest] = field(default_factory=dict)
+
+    def put(self, name: str, value: Any, observed_at: float | None = None) -> Latest:
+        previous = self._items.get(name)
+        item = Latest(
+            value=value,
+            observed_at=time.monotonic() if observed_at is None else observed_at,
+            seq=(previous.seq + 1) if previous is not None else 1,
+        )
+        self._items[name] = item
+        return item
+
+    def get(self, name: str) -> Latest | None:
+        return self._items.get(name)
+
+    def value(self, name: str, default: Any = None) -> Any:
+        item = self._items.get(name)
+        return item.value if item is not None else default
+
+    def age_s(self, name: str, now: float | None = None) -> float | None:
+        item = self._items.get(name)
+        if item is None:
+            return None
+        return (time.monotonic() if now is None else now) - item.observed_at
+
+
+class PollingRuntime:
+    """Roda várias fontes em agenda absoluta (sem drift) dentro de um event loop.
+
+    O prazo de cada tick é o prazo anterior + intervalo, então o tempo do fetch não
+    empurra a agenda; se um fetch atrasa mais que um intervalo, os ticks perdidos são pulados
+    (`missed`) em vez de disparados em rajada. Resultados não-None vão para `store`.
+    EWMA de período real e latência por fonte em `stats()`. Uma instância é compartilhada
+    pelos scrapers (injetada no construtor deles): um loop, um `LatestStore`.
+    """
+
+    def __init__(self, *, store: LatestStore | None = None, ewma_alpha: float = 0.2, seed: int | None = None) -> None:
+        self.store = store or LatestStore()
+        self.ewma_alpha = ewma_alpha
+        self._sources: dict[str, PolledSource] = {}
+        self._stats: dict[str, SourceStats] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._random = random.Random(seed)
+        self._running = False
+        self._stopped: asyncio.Event | None = None
+
+    def add(self, source: PolledSource) -> None:
+        self._sources[source.name] = source
+        self._stats[source.name] = SourceStats()
+        if self._running:
+            self._spawn(source)
+
+    async def remove(self, name: str) -> bool:
+        self._sources.pop(name, None)
+        task = self._tasks.pop(name, None)
+        if task is None:
+            return False
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        return True
+
+    def _spawn(self, source: PolledSource) -> None:
+        self._tasks[source.name] = asyncio.create_task(self._drive(source), name=f"poll-{source.name}")
+
+    def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._stopped = asyncio.Event()
+        for source in self._sources.values():
+            self._spawn(source)
+
+    async def stop(self) -> None:
+        self._running = False
+        tasks = list(self._tasks.values())
+        self._tasks.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._stopped is not None:
+            self._stopped.set()
+
+    async def run(self) -> None:
+        """Inicia e fica rodando até `stop()` (uso standalone dos scrapers)."""
+        self.start()
+        assert self._stopped is not None
+        await self._stopped.wait()
+
+    def _ewma(self, current: float | None, sample: float) -> float:
+        return sample if current is None else current + self.ewma_alpha * (sample - current)
+
+    async def _tick(self, source: PolledSource, stats: SourceStats) -> bool:
+        started = time.monotonic()
+        if stats.last_started_at is not None:
+            stats.period_s = self._ewma(stats.period_s, started - stats.last_started_at)
+        stats.last_started_at = started
+        stats.ticks += 1
+        timeout_s = _value(source.timeout_s) if source.timeout_s is not None else None
+        try:
+            if timeout_s:
+                value = await asyncio.wait_for(source.fetch(), timeout=timeout_s)
+            else:
+                value = await source.fetch()
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            stats.errors += 1
+            stats.consecutive_errors += 1
+            stats.last_error = f"timeout ({timeout_s}s)"
+            print(f"❌ {source.name} error: {stats.last_error}")
+            return False
+        except Exception as exc:
+            stats.errors += 1
+            stats.consecutive_errors += 1
+            stats.last_error = f"{type(exc).__name__}: {exc}"
+            print(f"❌ {source.name} error: {stats.last_error}")
+            return False
+        finally:
+            latency_ms = (time.monotonic() - started) * 1000.0
+            stats.latency_ms = self._ewma(stats.latency_ms, latency_ms)
+            stats.max_latency_ms = max(stats.max_latency_ms, latency_ms)
+
+        now = time.monotonic()
+        stats.consecutive_errors = 0
+        stats.last_ok_at = now
+        if value is not None:
+            self.store.put(source.name, value, now)
+        return True
+
+    async def _drive(self, source: PolledSource) -> None:
+        stats = self._stats[source.name]
+        deadline = time.monotonic()
+        # no 3.11 o wait_for engole o cancel se o fetch termina no mesmo instante:
+        # a fonte removida / runtime parado também encerra o loop
+        while self._running and self._sources.get(source.name) is source:
+            interval = max(0.0, _value(source.interval_s))
+            jitter = self._random.uniform(-1.0, 1.0) * source.jitter * interval if source.jitter else 0.0
+            delay = deadline + jitter - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            if not await self._tick(source, stats):
+                # expoente limitado (como no official_poller): 2 ** 1024 erros estouraria o float
+                backoff = min(
+                    source.max_backoff_s,
+                    _value(source.error_backoff_s) * 2 ** min(stats.consecutive_errors - 1, 6),
+                )
+                await asyncio.sleep(backoff)
+                deadline = time.monotonic()  # depois do backoff a agenda recomeça daqui
+                continue
+
+            now = time.monotonic()
+            if interval <= 0:
+                deadline = now
+                await asyncio.sleep(0)
+                continue
+            # próximo prazo na agenda absoluta: a duração do fetch não acumula atraso
+            deadline += interval
+            if deadline < now - interval:
+                # atrasou mais de um intervalo: pula os ticks vencidos em vez de disparar em rajada
+                skipped = int((now - deadline) // interval)
+                stats.missed += skipped
+                deadline += skipped * interval
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        now = time.monotonic()
+        out = {}
+        for name, stats in self._stats.items():
+            data = stats.as_dict()
+            data["interval_s"] = _value(self._sources[name].interval_s) if name in self._sources else None
+            age = self.store.age_s(name, now)
+            data["age_s"] = round(age, 3) if age is not None else None
+            out[name] = data
+        return out
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from core.oracle_nba import parse_score
+
+
+# Confiabilidade base por fonte (multiplicada pela confiança da leitura e pelo frescor).
+DEFAULT_RELIABILITY = {
+    "video": 1.0,
+    "official": 0.9,
+    "fallback": 0.6,
+}
+
+# Meia-vida (s) do peso de cada fonte: vídeo envelhece rápido, oficial mais devagar.
+DEFAULT_HALF_LIFE_S = {
+    "video": 4.0,
+    "official": 15.0,
+    "fallback": 10.0,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class SourceReading:
+    source: str
+    score: dict[str, int]
+    clock: str | None
+    observed_at: float
+    confidence: float = 1.0
+    latency_ms: float | None = None
+
+
+@dataclass(slots=True)
+class FusedScore:
+    score: dict[str, int] | None
+    clock: str | None
+    confidence: float
+    sources: list[str] = field(default_factory=list)
+    weights: dict[str, float] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "placar": self.score,
+            "tempo": self.clock,
+            "confianca": round(self.confidence, 3),
+            "fontes": self.sources,
+            "pesos": {k: round(v, 3) for k, v in self.weights.items()},
+        }
+
+
+class ScoreFusion:
+    """Funde placar/tempo de várias fontes (vídeo, oficial, fallback) numa única "verdade".
+
+    Cada fonte guarda uma linha do tempo curta das leituras; a fusão usa só a última
+    leitura de cada uma, com peso = confiabilidade * confiança * 0.5^(idade/meia-vida).
+    Placares iguais somam peso e o maior vence, então o custo é O(fontes) por update.
+    Fontes mais velhas que `stale_after_s` saem da votação (degradação gradual).
+    """
+
+    def __init__(
+        self,
+        *,
+        reliability: dict[str, float] | None = None,
+        half_life_s: dict[str, float] | None = None,
+        stale_after_s: float = 30.0,
+        history: int = 16,
+    ) -> None:
+        self.reliability = {**DEFAULT_RELIABILITY, **(reliability or {})}
+        self.half_life_s = {**DEFAULT_HALF_LIFE_S, **(half_life_s or {})}
+        self.stale_after_s = stale_after_s
+        self._timelines: dict[str, deque[SourceReading]] = {}
+        self._history = history
+
+    def update(
+        self,
+        source: str,
+        score: Any,
+        clock: str | None = None,
+        *,
+        confidence: float = 1.0,
+        latency_ms: float | None = None,
+        observed_at: float | None = None,
+    ) -> SourceReading | None:
+        parsed = parse_score(score)
+        if parsed is None:
+            return None
+        reading = SourceReading(
+            source=source,
+            score=parsed,
+            clock=clock,
+            observed_at=time.monotonic() if observed_at is None else observed_at,
+            confidence=max(0.0, min(1.0, float(confidence))),
+            latency_ms=latency_ms,
+        )
+        timeline = self._timelines.get(source)
+        if timeline is None:
+            timeline = self._timelines[source] = deque(maxlen=self._history)
+        timeline.append(reading)
+        return reading
+
+    def latest(self, source: str) -> SourceReading | None:
+        timeline = self._timelines.get(source)
+        return timeline[-1] if timeline else None
+
+    def timeline(self, source: str) -> list[SourceReading]:
+        return list(self._timelines.get(source, ()))
+
+    def weight(self, reading: SourceReading, now: float) -> float:
+        age = max(0.0, now - reading.observed_at) + (reading.latency_ms or 0.0) / 1000.0
+        if age > self.stale_after_s:
+            return 0.0
+        half_life = self.half_life_s.get(reading.source, 10.0)
+        return self.reliability.get(reading.source, 0.5) * reading.confidence * 0.5 ** (age / half_life)
+
+    def fuse(self, now: float | None = None) -> FusedScore:
+        now = time.monotonic() if now is None else now
+        votes: dict[tuple[int, int], float] = {}
+        best_reading: dict[tuple[int, int], tuple[float, SourceReading]] = {}
+        weights: dict[str, float] = {}
+        total = 0.0
+
+        for source, timeline in self._timelines.items():
+            if not timeline:
+                continue
+            reading = timeline[-1]
+            w = self.weight(reading, now)
+            weights[source] = w
+            if w <= 0.0:
+                continue
+            key = (reading.score["H"], reading.score["A"])
+            votes[key] = votes.get(key, 0.0) + w
+            total += w
+            if reading.clock and (key not in best_reading or w > best_reading[key][0]):
+                best_reading[key] = (w, reading)
+
+        if not votes:
+            return FusedScore(score=None, clock=None, confidence=0.0, weights=weights)
+
+        # empate: o placar maior vence (placar de basquete só sobe)
+        key = max(votes, key=lambda k: (votes[k], k[0] + k[1]))
+        agreeing = [
+            s for s, t in self._timelines.items()
+            if t and weights.get(s, 0.0) > 0.0 and (t[-1].score["H"], t[-1].score["A"]) == key
+        ]
+        clock = best_reading[key][1].clock if key in best_reading else None
+        return FusedScore(
+            score={"H": key[0], "A": key[1]},
+            clock=clock,
+            # fração do peso total, penalizada quando só há leituras fracas/velhas
+            confidence=votes[key] / max(total, 1.0),
+            sources=agreeing,
+            weights=weights,
+        )
+
+    def snapshot(self, wall_offset: float) -> dict[str, Any]:
+        """Linhas do tempo por fonte; `observed_at` monotônico vira epoch (+ `wall_offset`)."""
+        return {
+            source: [
+                [r.score["H"], r.score["A"], r.clock, round(r.observed_at + wall_offset, 3), r.confidence, r.latency_ms]
+                for r in timeline
+            ]
+            for source, timeline in self._timelines.items()
+        }
+
+    def restore(self, state: dict[str, Any], wall_offset: float) -> None:
+        self._timelines.clear()
+        for source, readings in state.items():
+            timeline = self._timelines[source] = deque(maxlen=self._history)
+            for h, a, clock, observed_at, confidence, latency_ms in readings:
+                timeline.append(
+                    SourceReading(source, {"H": h, "A": a}, clock, observed_at - wall_offset, confidence, latency_ms)
+                )
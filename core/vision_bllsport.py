@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-import base64
 import io
 import re
 from dataclasses import dataclass
 from typing import Any
 
+from core.frame_preprocess import decode_frame_bytes, get_frame_preprocessor
+from core.ocr_engines import get_ocr_pool
 
-@dataclass
+
+@dataclass(slots=True)
 class VisionResult:
     ok: bool
     placar: dict[str, int] | None
@@ -34,27 +36,13 @@ def _try_import_cv2():
         return None
 
 
-def _try_import_pytesseract():
-    try:
-        import pytesseract  # type: ignore
-
-        return pytesseract
-    except Exception:
-        return None
-
-
 def decode_base64_image(frame_base64: str):
     """Decodifica base64 (data URI ou puro) em PIL Image."""
     Image = _try_import_pillow()
     if Image is None:
         raise RuntimeError("Dependência ausente: Pillow. Instale: pip install pillow")
 
-    b64 = frame_base64.strip()
-    if "," in b64 and b64.lower().startswith("data:"):
-        b64 = b64.split(",", 1)[1]
-
-    data = base64.b64decode(b64)
-    return Image.open(io.BytesIO(data)).convert("RGB")
+    return Image.open(io.BytesIO(decode_frame_bytes(frame_base64))).convert("RGB")
 
 
 def crop_image_pil(image, crop: dict[str, int] | None):
@@ -73,25 +61,15 @@ def crop_image_pil(image, crop: dict[str, int] | None):
 
 
 def ocr_text_from_image(image) -> str:
-    """OCR básico. Usa OpenCV se disponível, senão Pillow direto."""
-    pytesseract = _try_import_pytesseract()
-    if pytesseract is None:
-        raise RuntimeError(
-            "Dependência ausente: pytesseract. Instale: pip install pytesseract e instale o Tesseract no Windows."
-        )
+    """OCR básico. Usa OpenCV se disponível, senão Pillow direto (engine do pool: core.ocr_engines)."""
+    pool = get_ocr_pool()
 
     cv2 = _try_import_cv2()
     if cv2 is None:
         # OCR direto
-        return pytesseract.image_to_string(image, lang="eng")
-
-    import numpy as np  # type: ignore
+        return pool.recognize(image)
 
-    arr = np.array(image)
-    gray = cv2.cvtColor(arr, cv2.COLOR_RGB2GRAY)
-    gray = cv2.GaussianBlur(gray, (3, 3), 0)
-    _, th = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-    return pytesseract.image_to_string(th, lang="eng")
+    return pool.recognize(get_frame_preprocessor().binarize_image(image))
 
 
 def parse_score_and_clock(text: str) -> tuple[dict[str, int] | None, str | None]:
@@ -125,14 +103,88 @@ def parse_score_and_clock(text: str) -> tuple[dict[str, int] | None, str | None]
     return score, t
 
 
+def _vision_from_text(text: str) -> VisionResult:
+    placar, tempo = parse_score_and_clock(text)
+    ok = bool(placar or tempo)
+    return VisionResult(ok=ok, placar=placar, tempo_video=tempo, raw_text=text)
+
+
 def analyze_bllsport_frame(frame_base64: str, crop: dict[str, int] | None = None) -> VisionResult:
-    """Pipeline OCR: base64 -> (crop) -> OCR -> parse placar/tempo."""
+    """Pipeline OCR: base64 -> cinza -> (crop) -> binarização em buffers do worker -> OCR -> parse."""
+    try:
+        pool = get_ocr_pool()
+        image = get_frame_preprocessor().prepare(frame_base64, crop)
+        return _vision_from_text(pool.recognize(image))
+    except Exception as exc:
+        return VisionResult(ok=False, placar=None, tempo_video=None, raw_text="", error=str(exc))
+
+
+def _prepare_roi(frame_base64: str, crop: dict[str, int] | None):
+    import numpy as np  # type: ignore
+
+    # cópia: o buffer do worker é reaproveitado no próximo frame enquanto o ROI espera o lote
+    return np.array(get_frame_preprocessor().prepare(frame_base64, crop), dtype=np.uint8)
+
+
+async def analyze_bllsport_frame_async(frame_base64: str, crop: dict[str, int] | None = None) -> VisionResult:
+    """Mesmo pipeline, rodando numa thread do pool de OCR (engine fixa por thread, fora do event loop).
+
+    Com ORACLE_OCR_BATCH_MS > 0 o OCR entra no lote multi-jogo (core.ocr_batch).
+    """
+    try:
+        pool = get_ocr_pool()
+        from core.ocr_batch import get_ocr_batcher
+
+        batcher = get_ocr_batcher()
+    except Exception as exc:
+        return VisionResult(ok=False, placar=None, tempo_video=None, raw_text="", error=str(exc))
+    if batcher is None:
+        return await pool.run(analyze_bllsport_frame, frame_base64, crop)
+    try:
+        roi = await pool.run(_prepare_roi, frame_base64, crop)
+        return _vision_from_text(await batcher.recognize(roi))
+    except Exception as exc:
+        return VisionResult(ok=False, placar=None, tempo_video=None, raw_text="", error=str(exc))
+
+
+def analyze_frame_view(view: Any, crop: dict[str, int] | None = None) -> VisionResult:
+    """Pipeline OCR sobre um frame do FrameRing (view numpy da memória compartilhada, sem cópia).
+
+    Só o ROI é lido do slot e binarizado nos buffers do worker; se o escritor reaproveitou
+    o slot nesse meio tempo (`view.valid()` falso), o resultado é descartado.
+    """
+    try:
+        pool = get_ocr_pool()
+        image = get_frame_preprocessor().prepare_array(view.array, crop)
+        if not view.valid():
+            return VisionResult(ok=False, placar=None, tempo_video=None, raw_text="", error="Frame sobrescrito no ring")
+        return _vision_from_text(pool.recognize(image))
+    except Exception as exc:
+        return VisionResult(ok=False, placar=None, tempo_video=None, raw_text="", error=str(exc))
+
+
+def _prepare_view_roi(view: Any, crop: dict[str, int] | None):
+    import numpy as np  # type: ignore
+
+    roi = np.array(get_frame_preprocessor().prepare_array(view.array, crop), dtype=np.uint8)
+    return roi if view.valid() else None
+
+
+async def analyze_frame_view_async(view: Any, crop: dict[str, int] | None = None) -> VisionResult:
+    """`analyze_frame_view` numa thread do pool de OCR (ou no lote multi-jogo, como o caminho base64)."""
+    try:
+        pool = get_ocr_pool()
+        from core.ocr_batch import get_ocr_batcher
+
+        batcher = get_ocr_batcher()
+    except Exception as exc:
+        return VisionResult(ok=False, placar=None, tempo_video=None, raw_text="", error=str(exc))
+    if batcher is None:
+        return await pool.run(analyze_frame_view, view, crop)
     try:
-        img = decode_base64_image(frame_base64)
-        img = crop_image_pil(img, crop)
-        text = ocr_text_from_image(img)
-        placar, tempo = parse_score_and_clock(text)
-        ok = bool(placar or tempo)
-        return VisionResult(ok=ok, placar=placar, tempo_video=tempo, raw_text=text)
+        roi = await pool.run(_prepare_view_roi, view, crop)
+        if roi is None:
+            return VisionResult(ok=False, placar=None, tempo_video=None, raw_text="", error="Frame sobrescrito no ring")
+        return _vision_from_text(await batcher.recognize(roi))
     except Exception as exc:
         return VisionResult(ok=False, placar=None, tempo_video=None, raw_text="", error=str(exc))
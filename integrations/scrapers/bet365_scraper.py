@@ -3,26 +3,49 @@
 import asyncio
 from typing import Optional, Dict, List
 
+from core.polling_runtime import ConfigGetter, PollingRuntime, PolledSource, configured_source, static_config
+
 
 class Bet365Scraper:
     """Scraper para Bet365 - Captura odds/linhas em tempo real."""
 
-    def __init__(self):
-        """Initialize Bet365 scraper."""
+    def __init__(self, runtime: Optional[PollingRuntime] = None, config: Optional[ConfigGetter] = None):
+        """
+        Initialize Bet365 scraper.
+        
+        Args:
+            runtime: PollingRuntime compartilhado entre os scrapers (um loop, um LatestStore)
+            config: ConfigGetter dos tempos (ex.: RuntimeConfig.value); sem ele, os padrões do código
+        """
         self.is_running = False
+        self.runtime = runtime
+        self._owns_runtime = runtime is None
+        self.config = config or static_config
         self.current_odds: Dict = {}
 
+    def source(self) -> PolledSource:
+        """Fonte para o PollingRuntime (intervalo/timeout/backoff lidos da config a cada tick)."""
+        return configured_source(
+            "bet365",
+            self.fetch_odds,
+            self.config,
+            prefix="scrapers.bet365",
+            interval_s=1.0,
+            error_backoff_s=2.0,
+        )
+
     async def start(self):
-        """Inicia loop de captura contínua."""
+        """Inicia captura contínua no PollingRuntime (agenda sem drift, timeout e backoff).
+
+        Com runtime injetado só registra a fonte: quem criou o runtime chama start()/stop() dele.
+        Sem runtime, cria um próprio e roda até stop() (uso standalone).
+        """
         self.is_running = True
-        while self.is_running:
-            try:
-                # TODO: Implementar captura de odds
-                await self.fetch_odds()
-                await asyncio.sleep(1)  # 1 Hz
-            except Exception as e:
-                print(f"❌ Bet365 error: {e}")
-                await asyncio.sleep(2)
+        if self._owns_runtime:
+            self.runtime = PollingRuntime()
+        self.runtime.add(self.source())
+        if self._owns_runtime:
+            await self.runtime.run()
 
     async def fetch_odds(self) -> Optional[Dict]:
         """
@@ -81,17 +104,25 @@ class Bet365Scraper:
     async def stop(self):
         """Para o loop de captura."""
         self.is_running = False
+        if self.runtime is None:
+            return
+        if self._owns_runtime:
+            await self.runtime.stop()
+        else:
+            await self.runtime.remove("bet365")
 
 
 async def main():
     """Teste do scraper."""
     scraper = Bet365Scraper()
-    scraper.start()
+    task = asyncio.create_task(scraper.start())
     
     # Deixa rodando por 30s pra teste
     await asyncio.sleep(30)
     
     await scraper.stop()
+    await task
+    print(scraper.runtime.stats() if scraper.runtime else {})
 
 
 if __name__ == "__main__":
@@ -1,38 +1,68 @@
 """BLLSport Scraper - Extract live feed from BLLSport transmissions."""
 
 import asyncio
-from typing import Optional, Dict
+from typing import Any, Optional, Dict
+
+from core.polling_runtime import ConfigGetter, PollingRuntime, PolledSource, configured_source, static_config
+from core.game_clock import GameClock
 
 
 class BLLSportScraper:
     """Scraper para BLLSport TV - Captura frames e score em tempo real."""
 
-    def __init__(self, channel_url: str = "https://www.bllsport.com.br"):
+    def __init__(
+        self,
+        channel_url: str = "https://www.bllsport.com.br",
+        frame_ring: Any = None,
+        crop: Optional[Dict[str, int]] = None,
+        runtime: Optional[PollingRuntime] = None,
+        config: Optional[ConfigGetter] = None,
+    ):
         """
         Initialize BLLSport scraper.
         
         Args:
             channel_url: URL do canal BLLSport (ajuste conforme necessário)
+            frame_ring: core.frame_ring.FrameRing opcional; com ele os frames vão
+                decodificados para a memória compartilhada e o OCR lê a view do slot
+            crop: ROI do placar no frame
+            runtime: PollingRuntime compartilhado entre os scrapers (um loop, um LatestStore)
+            config: ConfigGetter dos tempos (ex.: RuntimeConfig.value); sem ele, os padrões do código
         """
         self.channel_url = channel_url
         self.current_frame_base64: Optional[str] = None
+        self.frame_ring = frame_ring
+        self.crop = crop
         self.is_running = False
+        self.runtime = runtime
+        self._owns_runtime = runtime is None
+        self.config = config or static_config
+        # relógio extrapolado entre frames lidos (o OCR do relógio pode rodar menos vezes)
+        self.clock = GameClock()
+
+    def source(self) -> PolledSource:
+        """Fonte para o PollingRuntime (intervalo/timeout/backoff lidos da config a cada tick)."""
+        return configured_source(
+            "bllsport",
+            self.fetch_frame,
+            self.config,
+            prefix="scrapers.bllsport",
+            interval_s=0.3,
+            error_backoff_s=1.0,
+        )
 
     async def start(self):
-        """Inicia loop de captura contínua."""
+        """Inicia captura contínua no PollingRuntime (agenda sem drift, timeout e backoff).
+
+        Com runtime injetado só registra a fonte: quem criou o runtime chama start()/stop() dele.
+        Sem runtime, cria um próprio e roda até stop() (uso standalone).
+        """
         self.is_running = True
-        while self.is_running:
-            try:
-                # TODO: Implementar captura de frame
-                # Opções:
-                # 1. Selenium/Playwright → screenshot da página
-                # 2. CDP (Chrome DevTools Protocol) → mais rápido
-                # 3. FFmpeg → captura direta do stream
-                await self.fetch_frame()
-                await asyncio.sleep(0.3)  # ~3 FPS
-            except Exception as e:
-                print(f"❌ BLLSport error: {e}")
-                await asyncio.sleep(1)
+        if self._owns_runtime:
+            self.runtime = PollingRuntime()
+        self.runtime.add(self.source())
+        if self._owns_runtime:
+            await self.runtime.run()
 
     async def fetch_frame(self) -> Optional[str]:
         """
@@ -57,41 +87,64 @@ class BLLSportScraper:
         
         return None
 
+    def publish_frame(self, frame) -> int:
+        """Escreve o frame capturado (numpy uint8, BGR ou cinza) no FrameRing; retorna a sequência."""
+        if self.frame_ring is None:
+            raise RuntimeError("BLLSportScraper sem frame_ring")
+        return self.frame_ring.write(frame, game_id="bllsport")
+
     async def get_placar(self) -> Dict:
         """
         Extrai placar do frame usando OCR.
         
+        Com frame_ring, lê o frame mais novo do ring (os pulados não passam pelo OCR).
+        
         Returns:
             {"home": 93, "away": 85, "tempo": "Q1 05:03", "error": null}
         """
-        # TODO: Usar core.vision_bllsport.analyze_bllsport_frame()
-        # frame_base64 = self.current_frame_base64
-        # if frame_base64:
-        #     from core.vision_bllsport import analyze_bllsport_frame
-        #     result = analyze_bllsport_frame(frame_base64)
-        #     return {
-        #         "home": result.placar.get("Home", 0) if result.placar else 0,
-        #         "away": result.placar.get("Away", 0) if result.placar else 0,
-        #         "tempo": result.tempo_video,
-        #         "error": result.error
-        #     }
-        
-        return {"home": 0, "away": 0, "tempo": "", "error": "Not implemented"}
+        from core.vision_bllsport import analyze_bllsport_frame_async, analyze_frame_view_async
+
+        view = self.frame_ring.latest() if self.frame_ring is not None else None
+        frame_base64 = self.current_frame_base64
+        if view is None and not frame_base64:
+            return {"home": 0, "away": 0, "tempo": self.clock.label() or "", "error": "Sem frame capturado"}
+
+        if view is not None:
+            result = await analyze_frame_view_async(view, self.crop)
+            del view  # a view aponta para o slot: não segura além do OCR
+        else:
+            result = await analyze_bllsport_frame_async(frame_base64, self.crop)
+        if result.tempo_video:
+            self.clock.observe(result.tempo_video)
+        return {
+            "home": result.placar.get("Home", 0) if result.placar else 0,
+            "away": result.placar.get("Away", 0) if result.placar else 0,
+            "tempo": result.tempo_video or self.clock.label() or "",
+            "error": result.error,
+        }
 
     async def stop(self):
         """Para o loop de captura."""
         self.is_running = False
+        if self.runtime is None:
+            return
+        if self._owns_runtime:
+            await self.runtime.stop()
+        else:
+            await self.runtime.remove("bllsport")
 
 
 async def main():
     """Teste do scraper."""
     scraper = BLLSportScraper()
-    scraper.start()
+    task = asyncio.create_task(scraper.start())
     
     # Deixa rodando por 30s pra teste
     await asyncio.sleep(30)
     
     await scraper.stop()
+    await task
+    print(scraper.runtime.stats() if scraper.runtime else {})
 
 
 if __name__ == "__main__":
@@ -3,25 +3,49 @@
 import asyncio
 from typing import Optional, Dict
 
+from core.polling_runtime import ConfigGetter, PollingRuntime, PolledSource, configured_source, static_config
+
 
 class FlashscoreScraper:
     """Scraper para Flashscore - Fallback se BLLSport cair."""
 
-    def __init__(self):
-        """Initialize Flashscore scraper."""
+    def __init__(self, runtime: Optional[PollingRuntime] = None, config: Optional[ConfigGetter] = None):
+        """
+        Initialize Flashscore scraper.
+        
+        Args:
+            runtime: PollingRuntime compartilhado entre os scrapers (um loop, um LatestStore)
+            config: ConfigGetter dos tempos (ex.: RuntimeConfig.value); sem ele, os padrões do código
+        """
         self.is_running = False
+        self.runtime = runtime
+        self._owns_runtime = runtime is None
+        self.config = config or static_config
         self.current_score: Dict = {}
 
+    def source(self) -> PolledSource:
+        """Fonte para o PollingRuntime (intervalo/timeout/backoff lidos da config a cada tick)."""
+        return configured_source(
+            "flashscore",
+            self.fetch_score,
+            self.config,
+            prefix="scrapers.flashscore",
+            interval_s=2.0,
+            error_backoff_s=2.0,
+        )
+
     async def start(self):
-        """Inicia loop de captura."""
+        """Inicia captura no PollingRuntime (agenda sem drift, timeout e backoff).
+
+        Com runtime injetado só registra a fonte: quem criou o runtime chama start()/stop() dele.
+        Sem runtime, cria um próprio e roda até stop() (uso standalone).
+        """
         self.is_running = True
-        while self.is_running:
-            try:
-                await self.fetch_score()
-                await asyncio.sleep(2)
-            except Exception as e:
-                print(f"❌ Flashscore error: {e}")
-                await asyncio.sleep(2)
+        if self._owns_runtime:
+            self.runtime = PollingRuntime()
+        self.runtime.add(self.source())
+        if self._owns_runtime:
+            await self.runtime.run()
 
     async def fetch_score(self) -> Optional[Dict]:
         """
@@ -42,6 +66,12 @@ class FlashscoreScraper:
     async def stop(self):
         """Para o loop."""
         self.is_running = False
+        if self.runtime is None:
+            return
+        if self._owns_runtime:
+            await self.runtime.stop()
+        else:
+            await self.runtime.remove("flashscore")
 
 
 if __name__ == "__main__":
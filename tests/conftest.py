@@ -0,0 +1,10 @@
+import os
+import tempfile
+
+# o app lê config/snapshot do disco no import: aponta tudo para um diretório temporário
+_TMP = tempfile.mkdtemp(prefix="oracle-tests-")
+os.environ.setdefault("ORACLE_CONFIG_PATH", os.path.join(_TMP, "config.json"))
+os.environ.setdefault("ORACLE_CONFIG_HISTORY", os.path.join(_TMP, "config_history"))
+os.environ.setdefault("ORACLE_SNAPSHOT_PATH", os.path.join(_TMP, "snapshots", "sessions.json.gz"))
+os.environ.setdefault("ORACLE_SNAPSHOT_INTERVAL_S", "0")
+os.environ.pop("ORACLE_BROKER", None)
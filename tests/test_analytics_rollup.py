@@ -0,0 +1,80 @@
+import json
+import sqlite3
+
+import numpy as np
+
+from backend.analytics_rollup import RollupReader, RollupWriter, _slug
+
+TS = 1_760_000_000.0  # 2025-10-09 UTC
+
+
+def _db(path, rows):
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS events (id INTEGER PRIMARY KEY, ts REAL, event_name TEXT, game TEXT, payload_json TEXT)"
+        )
+        conn.executemany(
+            "INSERT INTO events (id, ts, event_name, game, payload_json) VALUES (?, ?, ?, ?, ?)",
+            [(i, ts, name, game, json.dumps(payload)) for i, ts, name, game, payload in rows],
+        )
+    return path
+
+
+def test_slugs_do_not_collide():
+    assert _slug("Lakers/Celtics") != _slug("Lakers Celtics")
+    assert _slug("Lakers/Celtics") == _slug("Lakers/Celtics")
+
+
+def test_games_with_same_sanitized_name_stay_apart(tmp_path):
+    db = _db(
+        tmp_path / "analytics.db",
+        [
+            (1, TS, "tick", "Lakers/Celtics", {"clock_delta_s": 1.0}),
+            (2, TS, "tick", "Lakers Celtics", {"clock_delta_s": 9.0}),
+        ],
+    )
+    RollupWriter(tmp_path / "out").compact(db)
+    reader = RollupReader(tmp_path / "out")
+    assert reader.games() == ["Lakers Celtics", "Lakers/Celtics"]
+    assert reader.column("clock_delta_s", game="Lakers/Celtics").tolist() == [1.0]
+    assert reader.column("clock_delta_s", game="Lakers Celtics").tolist() == [9.0]
+
+
+def test_incremental_compact_appends(tmp_path):
+    db = _db(tmp_path / "analytics.db", [(1, TS, "tick", "G", {"latency_ms": 10})])
+    out = tmp_path / "out"
+    RollupWriter(out).compact(db)
+    _db(db, [(2, TS + 1, "tick", "G", {"latency_ms": 20})])
+    stats = RollupWriter(out).compact(db)
+    assert stats == {"partitions": 1, "rows": 1, "last_id": 2}
+    assert RollupReader(out).column("latency_ms", game="G").tolist() == [10.0, 20.0]
+
+
+def test_crash_before_state_commit_does_not_duplicate_rows(tmp_path):
+    db = _db(tmp_path / "analytics.db", [(1, TS, "tick", "G", {"latency_ms": 10})])
+    out = tmp_path / "out"
+    RollupWriter(out).compact(db)
+    state = (out / "_state.json").read_bytes()
+
+    # segunda rodada grava as colunas e "morre" antes do _state.json
+    _db(db, [(2, TS + 1, "tick", "G", {"latency_ms": 20})])
+    RollupWriter(out).compact(db)
+    (out / "_state.json").write_bytes(state)
+
+    reader = RollupReader(out)
+    assert reader.column("latency_ms", game="G").tolist() == [10.0]
+
+    RollupWriter(out).compact(db)
+    values = RollupReader(out).column("latency_ms", game="G")
+    assert values.tolist() == [10.0, 20.0]
+    part = next(RollupReader(out).partitions(game="G"))
+    assert len(np.load(part / "ts.npy")) == 2
+
+
+def test_partition_without_committed_rows_is_ignored(tmp_path):
+    db = _db(tmp_path / "analytics.db", [(1, TS, "tick", "G", {"latency_ms": 10})])
+    out = tmp_path / "out"
+    RollupWriter(out).compact(db)
+    (out / "_state.json").unlink()
+    assert RollupReader(out).games() == []
+    assert RollupReader(out).distribution("latency_ms") == {"count": 0}
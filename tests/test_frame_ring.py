@@ -0,0 +1,83 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from core import ocr_engines
+from core.frame_ring import FrameRing
+from core.ocr_engines import OcrEngine, OcrEnginePool
+from core.vision_bllsport import analyze_frame_view
+
+pytest.importorskip("cv2")
+
+
+class StubEngine(OcrEngine):
+    name = "stub"
+    seen: list[tuple[int, ...]] = []
+
+    def recognize(self, image):
+        type(self).seen.append(image.shape)
+        return "91-85 Q4 05:03"
+
+    def recognize_lines(self, image):
+        return [(self.recognize(image), (0, 0, image.shape[1], image.shape[0]))]
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    StubEngine.seen = []
+    pool = OcrEnginePool(StubEngine, size=1)
+    monkeypatch.setattr(ocr_engines, "_pool", pool)
+    monkeypatch.delenv("ORACLE_OCR_BATCH_MS", raising=False)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def ring():
+    ring = FrameRing.create(slots=2, slot_bytes=64 * 48 * 3)
+    yield ring
+    ring.close()
+
+
+def _frame(value=0):
+    frame = np.full((48, 64, 3), value, dtype=np.uint8)
+    frame[10:20, 5:40] = 255
+    return frame
+
+
+def test_latest_wins_and_counts_skipped(ring):
+    for i in range(3):
+        ring.write(_frame(i), game_id="g1")
+    view = ring.latest()
+    assert view.seq == 3 and view.game_id == "g1" and view.array[0, 0, 0] == 2
+    assert ring.latest() is None
+    ring.write(_frame(), game_id="g1")
+    ring.write(_frame(), game_id="g1")
+    assert ring.latest().seq == 5 and ring.skipped == 1
+    assert ring.stats()["overwritten_unread"] >= 1
+
+
+def test_ocr_reads_roi_from_the_slot(ring, pool):
+    ring.write(_frame(), game_id="g1")
+    result = analyze_frame_view(ring.latest(), {"x": 0, "y": 5, "w": 50, "h": 20})
+    assert result.ok and result.placar == {"Home": 91, "Away": 85} and result.tempo_video == "Q4 05:03"
+    assert StubEngine.seen == [(20, 50)]
+
+
+def test_overwritten_slot_is_discarded(ring, pool):
+    ring.write(_frame(), game_id="g1")
+    view = ring.latest()
+    ring.write(_frame(), game_id="g1")
+    ring.write(_frame(), game_id="g1")  # 2 slots: o slot da view foi reaproveitado
+    result = analyze_frame_view(view)
+    assert not result.ok and result.error == "Frame sobrescrito no ring"
+
+
+def test_scraper_ocr_uses_the_ring(ring, pool):
+    from integrations.scrapers.bllsport_scraper import BLLSportScraper
+
+    scraper = BLLSportScraper(frame_ring=ring, crop={"x": 0, "y": 5, "w": 50, "h": 20})
+    scraper.publish_frame(_frame())
+    placar = asyncio.run(scraper.get_placar())
+    assert placar == {"home": 91, "away": 85, "tempo": "Q4 05:03", "error": None}
@@ -0,0 +1,59 @@
+from core.game_clock import GameClock
+
+
+def _running(start="Q1 05:00", then="Q1 04:59"):
+    clock = GameClock()
+    clock.observe(start, observed_at=0.0)
+    clock.observe(then, observed_at=1.0)
+    return clock
+
+
+def test_extrapolates_while_running():
+    clock = _running()
+    assert clock.running
+    assert clock.seconds_at(3.5) == 296.5
+    assert clock.label(3.5) == "Q1 04:57"  # segundo "cheio" do placar
+    # leitura dentro do previsto não muda a estimativa
+    verdict = clock.observe("Q1 04:57", observed_at=3.5)
+    assert verdict.agreed and verdict.drift_s == 0.5 and clock.seconds_at(4.0) == 296.0
+
+
+def test_stops_at_zero_and_expires_without_readings():
+    clock = _running("Q4 00:02", "Q4 00:01")
+    assert clock.seconds_at(1.5) == 0.5
+    assert clock.seconds_at(30.0) == 0.0 and clock.label(30.0) == "Q4 00:00"
+    assert clock.seconds_at(1.0 + clock.max_extrapolation_s + 1) is None
+
+
+def test_repeated_reading_stops_the_clock():
+    clock = _running()
+    verdict = clock.observe("Q1 04:59", observed_at=2.6)
+    assert verdict.agreed and not verdict.running and not clock.running
+    assert clock.seconds_at(60.0) == 299.0
+
+
+def test_period_change_starts_a_new_anchor():
+    clock = _running("Q1 00:02", "Q1 00:01")
+    verdict = clock.observe("Q2 12:00", observed_at=2.0)
+    assert verdict.reason == "NOVO_QUARTO" and verdict.predicted is None
+    assert clock.quarter == 2 and not clock.running
+    assert clock.label(5.0) == "Q2 12:00"
+
+
+def test_backwards_reading_reanchors_and_counts_a_disagreement():
+    clock = _running()
+    verdict = clock.observe("Q1 06:00", observed_at=2.0)
+    assert not verdict.agreed and verdict.reason == "RELOGIO_DIVERGE"
+    assert verdict.drift_s == 62.0 and clock.disagreements == 1
+    assert not clock.running and clock.seconds_at(5.0) == 360.0
+    # volta a correr a partir da nova âncora
+    clock.observe("Q1 05:59", observed_at=3.0)
+    assert clock.running and clock.seconds_at(4.0) == 358.0
+
+
+def test_snapshot_round_trip_keeps_the_anchor():
+    clock = _running()
+    restored = GameClock()
+    restored.restore(clock.snapshot(wall_offset=1000.0), wall_offset=1000.0)
+    assert restored.running and restored.seconds_at(3.5) == clock.seconds_at(3.5)
+    assert restored.stats()["readings"] == 2
@@ -0,0 +1,57 @@
+from core.game_timeline import GameTimeline
+
+
+def test_monotonic_score_and_clock():
+    timeline = GameTimeline()
+    assert timeline.observe("10-8", "Q1 05:00", observed_at=0.0).accepted
+    assert timeline.observe("12-8", "Q1 04:50", observed_at=1.0).accepted
+    verdict = timeline.observe("11-8", "Q1 04:49", observed_at=2.0)
+    assert not verdict.accepted and verdict.reason == "PLACAR_DIMINUIU"
+    assert verdict.score == {"H": 12, "A": 8}
+    assert timeline.observe("19-8", "Q1 04:48", observed_at=3.0).reason == "SALTO_IMPOSSIVEL"
+    assert timeline.observe("12-8", "Q1 06:00", observed_at=4.0).reason == "RELOGIO_VOLTOU"
+
+
+def test_forward_jump_is_held_and_correct_readings_keep_flowing():
+    timeline = GameTimeline()
+    assert timeline.observe("10-8", "Q1 05:00", observed_at=0.0).accepted
+    # OCR leu Q4 no lugar de Q1: segurado como uma regressão
+    assert timeline.observe("10-8", "Q4 05:00", observed_at=0.3).reason == "QUARTO_SALTOU"
+    # relógio pulando minutos em menos de um segundo
+    assert timeline.observe("10-8", "Q1 01:00", observed_at=0.6).reason == "RELOGIO_SALTOU"
+    # as leituras corretas seguem aceitas, sem esperar confirmação
+    assert timeline.observe("10-8", "Q1 04:59", observed_at=1.0).accepted
+    assert timeline.quarter == 1 and timeline.seconds == 299
+
+
+def test_clock_may_advance_as_much_as_real_time():
+    timeline = GameTimeline()
+    timeline.observe("10-8", "Q1 05:00", observed_at=0.0)
+    assert timeline.observe("14-8", "Q1 02:00", observed_at=180.0).accepted
+    assert timeline.observe("14-8", "Q2 12:00", observed_at=300.0).accepted
+
+
+def test_confirmation_needs_score_and_clock_together():
+    timeline = GameTimeline(confirm_after=3)
+    timeline.observe("20-18", "Q2 05:00", observed_at=0.0)
+    # mesmo placar, relógios incoerentes entre si: nunca confirma
+    assert not timeline.observe("18-18", "Q2 04:59", observed_at=1.0).accepted
+    assert not timeline.observe("18-18", "Q2 09:00", observed_at=2.0).accepted
+    assert not timeline.observe("18-18", "Q2 04:57", observed_at=3.0).accepted
+    assert timeline.score == {"H": 20, "A": 18}
+    # placar e relógio coerentes três vezes seguidas: correção aceita (cesta anulada)
+    assert not timeline.observe("18-18", "Q2 04:56", observed_at=4.0).accepted
+    verdict = timeline.observe("18-18", "Q2 04:55", observed_at=5.0)
+    assert verdict.accepted and verdict.reason == "CORRECAO_CONFIRMADA"
+    assert timeline.score == {"H": 18, "A": 18}
+
+
+def test_snapshot_round_trip():
+    timeline = GameTimeline()
+    timeline.observe("10-8", "Q1 05:00", observed_at=10.0)
+    timeline.observe("12-8", "Q1 04:40", observed_at=30.0)
+    restored = GameTimeline()
+    restored.restore(timeline.snapshot(wall_offset=500.0), wall_offset=500.0)
+    assert restored.score == timeline.score
+    assert list(restored.events) == list(timeline.events)
+    assert restored.observe("11-8", "Q1 04:39", observed_at=31.0).reason == "PLACAR_DIMINUIU"
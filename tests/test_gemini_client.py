@@ -0,0 +1,105 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from backend import gemini_knowledge
+from backend.gemini_knowledge import GeminiClient
+
+
+class StubBackend:
+    """Stub do GenerativeServiceClient: conta chamadas e bloqueia até `release`."""
+
+    def __init__(self, text="ok"):
+        self.text = text
+        self.calls = 0
+        self.requests = []
+        self.failing: set[str] = set()
+        self.release = threading.Event()
+        self.release.set()
+
+    def service(self, api_key):
+        return StubService(self, api_key)
+
+
+class StubService:
+    def __init__(self, backend, api_key):
+        self.backend = backend
+        self.api_key = api_key
+
+    def generate_content(self, request):
+        backend = self.backend
+        backend.calls += 1
+        backend.requests.append(request)
+        backend.release.wait(5)
+        if request["model"] in backend.failing:
+            raise RuntimeError("429 quota exceeded")
+        part = SimpleNamespace(text=f"{backend.text}:{self.api_key}")
+        return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))])
+
+
+def make_client(api_key="k1", backend=None):
+    return GeminiClient(api_key, service_factory=(backend or StubBackend()).service)
+
+
+def test_keys_stay_per_client():
+    backend = StubBackend()
+    a = make_client("key-a", backend)
+    b = make_client("key-b", backend)
+    assert a.generate("m", "p") == "ok:key-a"
+    assert b.generate("m", "p") == "ok:key-b"
+
+
+def test_single_flight_survives_first_caller_cancel():
+    async def scenario():
+        backend = StubBackend()
+        backend.release.clear()
+        client = make_client(backend=backend)
+        first = asyncio.create_task(client.ask_async("m", "p", key="k"))
+        second = asyncio.create_task(client.ask_async("m", "p", key="k"))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        await asyncio.sleep(0)
+        backend.release.set()
+        assert await second == "ok:k1"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert backend.calls == 1
+        # resultado foi para o cache mesmo com o primeiro chamador cancelado
+        assert client.cached("k") == "ok:k1"
+        assert await client.ask_async("m", "p", key="k") == "ok:k1"
+        assert backend.calls == 1
+
+    asyncio.run(scenario())
+
+
+def test_rate_limited_model_falls_back():
+    backend = StubBackend()
+    backend.failing.add("models/m")
+    client = make_client(backend=backend)
+    assert client.generate("m", "p") == "ok:k1"
+    assert [r["model"] for r in backend.requests] == ["models/m", "models/gemini-2.5-flash"]
+    assert client._candidates("m")[-1] == "m"
+
+
+def test_payload_contents_become_one_user_turn():
+    backend = StubBackend()
+    make_client(backend=backend).generate("m", ["prefixo", {"mime_type": "image/jpeg", "data": b"jpg"}, "INPUT_JSON"])
+    assert backend.requests[0]["contents"] == [
+        {
+            "role": "user",
+            "parts": [{"text": "prefixo"}, {"inline_data": {"mime_type": "image/jpeg", "data": b"jpg"}}, {"text": "INPUT_JSON"}],
+        }
+    ]
+
+
+def test_shared_clients_are_bounded(monkeypatch):
+    monkeypatch.setattr(gemini_knowledge, "_clients", gemini_knowledge.OrderedDict())
+    monkeypatch.setattr(gemini_knowledge, "_service_client", StubBackend().service)
+    first = gemini_knowledge.get_gemini_client("key-0")
+    for i in range(1, gemini_knowledge.MAX_CLIENTS + 1):
+        gemini_knowledge.get_gemini_client(f"key-{i}")
+    assert len(gemini_knowledge._clients) == gemini_knowledge.MAX_CLIENTS
+    assert "key-0" not in "".join(gemini_knowledge._clients)
+    assert gemini_knowledge.get_gemini_client("key-0") is not first
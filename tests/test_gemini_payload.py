@@ -0,0 +1,69 @@
+import base64
+import io
+import json
+import random
+
+from PIL import Image
+
+from backend.gemini_payload import (
+    FRAME_MAX_BYTES,
+    FRAME_MAX_SIDE,
+    JSON_ONLY_INSTRUCTION,
+    build_gemini_payload,
+    prepare_frame_part,
+)
+
+
+def _frame(width=1280, height=720, *, noise=False):
+    image = Image.new("RGB", (width, height), (30, 60, 30))
+    if noise:
+        # ruído não comprime: força a busca de qualidade e o corte final de resolução
+        rng = random.Random(7)
+        image.putdata([(rng.randrange(256), rng.randrange(256), rng.randrange(256)) for _ in range(width * height)])
+    buf = io.BytesIO()
+    image.save(buf, "PNG")
+    return "data:image/png;base64," + base64.b64encode(buf.getvalue()).decode("ascii")
+
+
+def test_frame_part_is_cropped_resized_jpeg():
+    part = prepare_frame_part(_frame(), {"x": 100, "y": 50, "w": 400, "h": 120})
+    assert part.mime_type == "image/jpeg" and (part.width, part.height) == (400, 120)
+    image = Image.open(io.BytesIO(part.data))
+    assert image.format == "JPEG" and image.size == (400, 120)
+
+    full = prepare_frame_part(_frame())
+    assert max(full.width, full.height) == FRAME_MAX_SIDE
+
+
+def test_frame_part_respects_byte_bound():
+    frame = _frame(640, 360, noise=True)
+    fits = prepare_frame_part(frame, max_bytes=200_000)
+    assert len(fits.data) <= 200_000 and fits.width == 640
+
+    # ruído puro não cabe em nenhuma qualidade: a resolução cai pela metade uma vez
+    shrunk = prepare_frame_part(frame, max_bytes=FRAME_MAX_BYTES)
+    assert len(shrunk.data) <= FRAME_MAX_BYTES and (shrunk.width, shrunk.height) == (320, 180)
+
+
+def test_payload_carries_image_part_not_base64_text():
+    frame = _frame()
+    payload = build_gemini_payload("PROMPT", {"BET365_JSON": {"placar": "1-0"}}, frame_base64=frame)
+    prefix, image, text = payload.contents
+    assert prefix.startswith("PROMPT") and JSON_ONLY_INSTRUCTION in prefix
+    assert image["mime_type"] == "image/jpeg" and image["data"] == payload.frame.data
+    body = json.loads(text.split("\n", 1)[1])
+    assert body["FRAME"].startswith("anexo image/jpeg") and body["BET365_JSON"] == {"placar": "1-0"}
+    assert frame.split(",", 1)[1][:64] not in text
+    assert payload.request_bytes == len(prefix.encode()) + len(image["data"]) + len(text.encode())
+    assert payload.request_bytes < len(frame)
+
+
+def test_payload_hash_and_bad_frame():
+    a = build_gemini_payload("P1", {"x": 1})
+    b = build_gemini_payload("P2", {"x": 1})
+    assert a.payload_sha256 == b.payload_sha256  # o prompt entra na chave do cache à parte
+    assert build_gemini_payload("P", {"x": 2}).payload_sha256 != a.payload_sha256
+
+    bad = build_gemini_payload("P", {}, frame_base64="não é imagem")
+    assert bad.frame is None and bad.frame_error and len(bad.contents) == 2
+    assert "FRAME_ERRO" in bad.contents[-1]
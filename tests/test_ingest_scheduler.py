@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from backend.ingest_scheduler import IngestScheduler, IngestShed, estimate_priority
+
+QUIET = 3  # BAIXA
+
+
+def _recording_handler(delay_s=0.02):
+    seen = []
+
+    async def handler(payload, request_ids):
+        seen.append(payload)
+        await asyncio.sleep(delay_s)
+        return {"tick": payload}
+
+    return seen, handler
+
+
+def test_quiet_ticks_coalesce_into_the_latest():
+    async def scenario():
+        seen, handler = _recording_handler()
+        scheduler = IngestScheduler(handler, workers=1)
+        scheduler.start()
+        results = await asyncio.gather(*(scheduler.submit("g", i, priority=QUIET) for i in range(5)))
+        await scheduler.stop()
+        return seen, results
+
+    seen, results = asyncio.run(scenario())
+    # nenhum tick tinha começado: todos viram o último
+    assert seen == [4]
+    assert [r["tick"] for r in results] == [4, 4, 4, 4, 4]
+
+
+def test_batches_keep_every_tick_in_order():
+    async def scenario():
+        seen, handler = _recording_handler()
+        scheduler = IngestScheduler(handler, workers=2)
+        scheduler.start()
+        results = await asyncio.gather(*(scheduler.submit("g", i, priority=QUIET, coalesce=False) for i in range(5)))
+        metrics = scheduler.metrics()
+        await scheduler.stop()
+        return seen, results, metrics
+
+    seen, results, metrics = asyncio.run(scenario())
+    assert seen == [0, 1, 2, 3, 4]
+    assert [r["tick"] for r in results] == [0, 1, 2, 3, 4]
+    assert metrics["classes"]["BAIXA"]["coalesced"] == 0
+
+
+def test_shedding_drops_empty_queues():
+    async def scenario():
+        gate = asyncio.Event()
+
+        async def handler(payload, request_ids):
+            await gate.wait()
+            return {"tick": payload}
+
+        scheduler = IngestScheduler(handler, workers=1, max_pending=1)
+        scheduler.start()
+        busy = asyncio.create_task(scheduler.submit("busy", 0, priority=0))
+        await asyncio.sleep(0.01)
+        quiet = asyncio.create_task(scheduler.submit("quiet", 1, priority=QUIET, coalesce=False))
+        await asyncio.sleep(0.01)
+        critical = asyncio.create_task(scheduler.submit("hot", 2, priority=0))
+        await asyncio.sleep(0.01)
+        with pytest.raises(IngestShed):
+            await quiet
+        assert "quiet" not in scheduler._queues
+        gate.set()
+        assert (await busy)["tick"] == 0 and (await critical)["tick"] == 2
+        await scheduler.stop()
+
+    asyncio.run(scenario())
+
+
+def test_shedding_the_same_games_last_job_keeps_the_new_one_queued():
+    async def scenario():
+        gate = asyncio.Event()
+
+        async def handler(payload, request_ids):
+            await gate.wait()
+            return {"tick": payload}
+
+        scheduler = IngestScheduler(handler, workers=1, max_pending=1)
+        scheduler.start()
+        busy = asyncio.create_task(scheduler.submit("busy", 0, priority=0))
+        await asyncio.sleep(0.01)
+        # fila cheia com um tick baixo do jogo "g"; o crítico do mesmo jogo o descarta
+        quiet = asyncio.create_task(scheduler.submit("g", 1, priority=QUIET, coalesce=False))
+        await asyncio.sleep(0.01)
+        critical = asyncio.create_task(scheduler.submit("g", 2, priority=0))
+        await asyncio.sleep(0.01)
+        with pytest.raises(IngestShed):
+            await quiet
+        gate.set()
+        result = await asyncio.wait_for(critical, timeout=1.0)
+        await busy
+        pending, queues = scheduler._pending, dict(scheduler._queues)
+        await scheduler.stop()
+        return result, pending, queues
+
+    result, pending, queues = asyncio.run(scenario())
+    assert result["tick"] == 2
+    assert pending == 0 and queues == {}
+
+
+def test_priority_from_latest_diagnosis_and_gap():
+    assert estimate_priority(None) == 3
+    assert estimate_priority(None, score_gap=2) == 1
+    assert estimate_priority(None, score_gap=4) == 0
+    latest = {"diagnostico_saas": {"erro_detectado": True, "severidade": "MEDIA", "tipo": "OUTRO"}}
+    assert estimate_priority(latest) == 2
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from core import line_classifier
+from core.line_classifier import KeywordAutomaton, LineClassifier
+
+
+def _tokens(automaton, text):
+    return [(m.token, m.label) for m in automaton.find(text)]
+
+
+def test_keywords_only_match_on_word_boundaries():
+    automaton = KeywordAutomaton({"CONFIRMACAO": ["ok", "✓"], "1": ["ft"]})
+    assert _tokens(automaton, "bloko left") == []
+    assert _tokens(automaton, "ok, ft!") == [("ok", "CONFIRMACAO"), ("ft", "1")]
+    assert _tokens(automaton, "lance_ft") == []  # "_" conta como parte da palavra
+    # símbolo casa colado em qualquer coisa
+    assert _tokens(automaton, "2pts✓registrou") == [("✓", "CONFIRMACAO")]
+
+
+def test_overlapping_tokens_are_all_reported():
+    automaton = KeywordAutomaton({"3": ["3 pts", "3 pontos"], "X": ["pts"]})
+    assert _tokens(automaton, "cesta de 3 pts") == [("3 pts", "3"), ("pts", "X")]
+    assert [m[:2] for m in automaton.find("3 pontos")] == [(0, 8)]
+
+
+@pytest.mark.parametrize(
+    "line, confirmed, points",
+    [
+        ("Q05:03 R$L Mag 2pts 1.40 ✓REGISTROU", True, 2),
+        ("Lakers 3-pointer 1.85", False, 3),
+        ("Free Throw confirmed", True, 1),
+        ("dunk + 3pts registrado", True, 3),  # mais de um tipo: vale o maior
+        ("Bloko leftover 1.20", False, None),
+    ],
+)
+def test_classify(line, confirmed, points):
+    result = LineClassifier().classify(line)
+    assert (result.confirmed, result.points) == (confirmed, points)
+
+
+def test_vocabulary_file_extends_or_replaces_the_default(tmp_path):
+    path = tmp_path / "vocab.json"
+    path.write_text(json.dumps({"CONFIRMACAO": ["anotado"], "3": ["triplazo"]}), encoding="utf-8")
+
+    extended = LineClassifier.from_file(path)
+    assert extended.classify("Triplazo ANOTADO").points == 3
+    assert extended.classify("2pts ✓").confirmed
+
+    only_file = LineClassifier.from_file(path, extend_default=False)
+    assert only_file.classify("triplazo anotado") == (True, 3, ("triplazo", "anotado"))
+    assert only_file.classify("2pts ✓") == (False, None, ())
+
+
+def test_shared_classifier_reads_the_env_vocabulary(tmp_path, monkeypatch):
+    path = tmp_path / "vocab.json"
+    path.write_text(json.dumps({"2": ["doble"]}), encoding="utf-8")
+    monkeypatch.setenv("ORACLE_LINE_VOCABULARY", str(path))
+    monkeypatch.setattr(line_classifier, "_classifier", None)
+    assert line_classifier.get_line_classifier().classify("doble ok") == (True, 2, ("doble", "ok"))
+    assert line_classifier.get_line_classifier() is line_classifier.get_line_classifier()
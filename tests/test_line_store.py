@@ -0,0 +1,57 @@
+import asyncio
+
+from backend import oracle_api
+from backend.oracle_schema import OracleAnalyzeRequest, tick_from_v1
+from core.line_store import LineStore
+from core.oracle_nba import build_oracle_output
+
+from tests.test_oracle_schema import BASELINE
+
+LINE = "Q05:03 R$L Mag 2pts 1.40 ✓REGISTROU"
+
+
+def _diagnosis(result):
+    d = result["diagnostico_saas"]
+    return d["tipo"], d["severidade"]
+
+
+def test_baseline_payload_with_a_line_store():
+    # "Q05:03" não tem quarto válido: casa pelos segundos com o relógio do vídeo
+    result = build_oracle_output(
+        video_score="93-85",
+        video_clock="Q1 05:03",
+        bet_score="91-85",
+        bet_clock="Q1 05:03",
+        bet_lines=[LINE],
+        line_store=LineStore(),
+    )
+    assert _diagnosis(result) == ("LINHA_OK_PLACAR_ATRASADO", "CRITICA")
+
+
+def test_baseline_payload_through_ingest():
+    tick = tick_from_v1(OracleAnalyzeRequest.model_validate({**BASELINE, "game_id": "baseline-line"}))
+    result = asyncio.run(oracle_api._process_ingest(tick))
+    assert _diagnosis(result) == ("LINHA_OK_PLACAR_ATRASADO", "CRITICA")
+
+
+def test_current_tick_lines_count_even_far_from_the_clock():
+    result = build_oracle_output(
+        video_score="93-85",
+        video_clock="Q3 01:00",
+        bet_score="91-85",
+        bet_clock="Q3 01:00",
+        bet_lines=["Q1 10:00 Mag 2pts ✓REGISTROU"],
+        line_store=LineStore(),
+    )
+    assert _diagnosis(result) == ("LINHA_OK_PLACAR_ATRASADO", "CRITICA")
+
+
+def test_near_by_quarter_and_seconds_only():
+    store = LineStore()
+    store.extend(["Q2 05:00 2pts ✓REGISTROU", "Q3 05:02 3pts ✓REGISTROU", "Q05:10 2pts ✓REGISTROU", "nada"])
+    assert [l.raw for l in store.near(2, 303, 30)] == ["Q2 05:00 2pts ✓REGISTROU", "Q05:10 2pts ✓REGISTROU"]
+    # vídeo sem quarto válido: todas as linhas, pela distância em segundos
+    assert [l.raw[:6] for l in store.near(0, 303, 30)] == ["Q3 05:", "Q2 05:", "Q05:10"]
+    assert store.near(None, 303, 30, limit=1)[0].raw.startswith("Q3")
+    assert store.near(4, 303, 30) == [store.get("Q05:10 2pts ✓REGISTROU")]
+    assert store.confirmed == 3 and len(store) == 4
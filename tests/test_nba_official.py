@@ -0,0 +1,159 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from core import nba_official
+from core.nba_official import BalldontlieClient
+
+GAMES = {
+    1: {"id": 1, "home_team_score": 93, "visitor_team_score": 85, "period": 2, "time": "5:03"},
+    2: {"id": 2, "home_team_score": 40, "visitor_team_score": 42, "period": 1, "time": "0:12"},
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """balldontlie de mentira: /games/<id> (com ETag) e /games?game_ids[]=..."""
+
+    requests: list[str] = []
+    delay_s = 0.0
+
+    def do_GET(self):
+        type(self).requests.append(self.path)
+        time.sleep(type(self).delay_s)
+        url = urlparse(self.path)
+        if url.path == "/games":
+            ids = [int(i) for i in parse_qs(url.query).get("game_ids[]", [])]
+            return self._json({"data": [GAMES[i] for i in ids if i in GAMES]})
+        game_id = int(url.path.rsplit("/", 1)[-1])
+        etag = f'"g{game_id}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self._json({"data": GAMES[game_id]}, etag)
+
+    def _json(self, body, etag=None):
+        raw = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    StubHandler.requests = []
+    StubHandler.delay_s = 0.0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_fetch_game_parses_and_revalidates(server):
+    async def scenario():
+        async with BalldontlieClient(base_url=server, cache_ttl_s=0.0) as client:
+            first = await client.fetch_game(1)
+            second = await client.fetch_game(1)
+        assert first.ok and first.placar == {"Home": 93, "Away": 85} and first.tempo == "Q2 5:03"
+        # segunda busca volta 304 e reaproveita o resultado anterior
+        assert second is first
+
+    asyncio.run(scenario())
+
+
+def test_single_flight_survives_first_caller_cancel(server):
+    StubHandler.delay_s = 0.2
+
+    async def scenario():
+        async with BalldontlieClient(base_url=server) as client:
+            first = asyncio.create_task(client.fetch_game(2))
+            second = asyncio.create_task(client.fetch_game(2))
+            await asyncio.sleep(0.05)
+            first.cancel()
+            result = await second
+            with pytest.raises(asyncio.CancelledError):
+                await first
+        assert result.ok and result.placar == {"Home": 40, "Away": 42}
+        assert StubHandler.requests == ["/games/2"]
+
+    asyncio.run(scenario())
+
+
+def test_fetch_games_batches_and_shares_inflight(server):
+    async def scenario():
+        async with BalldontlieClient(base_url=server) as client:
+            single = asyncio.create_task(client.fetch_game(1))
+            await asyncio.sleep(0)
+            results = await client.fetch_games([1, 2, 3])
+            await single
+        assert results[1].placar == {"Home": 93, "Away": 85}
+        assert results[2].ok
+        assert not results[3].ok
+        assert len(StubHandler.requests) == 2
+
+    asyncio.run(scenario())
+
+
+def test_fetch_balldontlie_game_reuses_client(server):
+    async def scenario():
+        a = await nba_official.fetch_balldontlie_game(base_url=server, api_key=None, game_id=1)
+        client = nba_official.shared_balldontlie_client(base_url=server, api_key=None)
+        transport = client._client
+        b = await nba_official.fetch_balldontlie_game(base_url=server, api_key=None, game_id=2)
+        assert client._client is transport
+        await client.aclose()
+        return a, b
+
+    a, b = asyncio.run(scenario())
+    assert a.ok and b.ok
+
+
+def test_cache_and_etags_are_bounded(server):
+    async def scenario():
+        async with BalldontlieClient(base_url=server, cache_ttl_s=0.0, cache_max_entries=1) as client:
+            await client.fetch_game(1)
+            await client.fetch_game(2)
+            assert list(client._cache) == [2] and list(client._etags) == [2]
+            await client.fetch_game(1)  # saiu do LRU: busca inteira, sem If-None-Match
+        assert list(client._cache) == [1]
+
+    asyncio.run(scenario())
+
+
+def test_fetch_games_pages_at_most_max_per_page(server):
+    ids = list(range(1, nba_official.MAX_PER_PAGE + 51))
+
+    async def scenario():
+        async with BalldontlieClient(base_url=server) as client:
+            return await client.fetch_games(ids)
+
+    results = asyncio.run(scenario())
+    assert set(results) == set(ids) and results[1].ok and results[2].ok and not results[3].ok
+    per_page = sorted(int(parse_qs(urlparse(path).query)["per_page"][0]) for path in StubHandler.requests)
+    assert per_page == [50, nba_official.MAX_PER_PAGE]
+
+
+def test_close_shared_clients_on_shutdown(server):
+    async def scenario():
+        await nba_official.fetch_balldontlie_game(base_url=server, api_key=None, game_id=1)
+        client = nba_official.shared_balldontlie_client(base_url=server, api_key=None)
+        assert client._client is not None
+        await nba_official.close_shared_clients()
+        assert client._client is None
+        assert nba_official.shared_balldontlie_client(base_url=server, api_key=None) is not client
+
+    asyncio.run(scenario())
@@ -0,0 +1,75 @@
+import asyncio
+
+import numpy as np
+
+from core.ocr_batch import OcrBatcher, split_lines, tile_rois
+from core.ocr_engines import OcrEngine, OcrEnginePool
+
+
+class BandEngine(OcrEngine):
+    """OCR de mentira: cada faixa de linhas não brancas vira uma linha cujo texto é o menor tom da faixa."""
+
+    name = "bands"
+
+    def recognize(self, image):
+        return "\n".join(text for text, _ in self.recognize_lines(image))
+
+    def recognize_lines(self, image):
+        inked = (image < 255).any(axis=1)
+        lines, y = [], 0
+        while y < len(inked):
+            if not inked[y]:
+                y += 1
+                continue
+            end = y
+            while end < len(inked) and inked[end]:
+                end += 1
+            cols = np.flatnonzero((image[y:end] < 255).any(axis=0))
+            box = (int(cols[0]), y, int(cols[-1] - cols[0] + 1), end - y)
+            lines.append((str(int(image[y:end].min())), box))
+            y = end
+        return lines
+
+
+def _roi(height, width, *tones):
+    """Fundo branco com uma faixa escura por tom, separadas por 4px de branco."""
+    roi = np.full((height, width), 255, dtype=np.uint8)
+    for i, tone in enumerate(tones):
+        roi[2 + i * 8:6 + i * 8, 2:width - 2] = tone
+    return roi
+
+
+def test_tiles_split_back_into_each_roi_in_order():
+    rois = [_roi(10, 40, 10), _roi(30, 25, 20, 30, 40), _roi(8, 60, 50), _roi(50, 12, 60)]
+    composite, boxes = tile_rois(rois)
+    assert [b[3] for b in boxes] == [10, 30, 8, 50]
+    for roi, (x, y, w, h) in zip(rois, boxes):
+        assert np.array_equal(composite[y:y + h, x:x + w], roi)
+
+    texts = split_lines(BandEngine().recognize_lines(composite), boxes)
+    assert texts == ["10", "20\n30\n40", "50", "60"]
+
+
+def test_dark_rois_are_inverted_and_buffer_is_reused():
+    dark = 255 - _roi(12, 20, 100)
+    composite, boxes = tile_rois([dark, _roi(6, 20, 70)])
+    assert split_lines(BandEngine().recognize_lines(composite), boxes) == ["100", "70"]
+
+    buffer = np.zeros((500, 500), dtype=np.uint8)
+    again, _ = tile_rois([_roi(6, 20, 70)], out=buffer)
+    assert again.base is buffer
+
+
+def test_batcher_sends_one_mosaic_and_answers_each_caller():
+    pool = OcrEnginePool(BandEngine, size=1)
+    batcher = OcrBatcher(pool, window_ms=20)
+    rois = [_roi(10 + 4 * i, 30, 10 * (i + 1)) for i in range(5)]
+
+    async def scenario():
+        return await asyncio.gather(*(batcher.recognize(roi) for roi in rois))
+
+    try:
+        assert asyncio.run(scenario()) == ["10", "20", "30", "40", "50"]
+        assert batcher.batches == 1 and batcher.tiles == 5
+    finally:
+        pool.close()
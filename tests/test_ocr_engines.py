@@ -0,0 +1,91 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from core import ocr_engines
+from core.ocr_engines import OcrEngine, OcrEnginePool, PytesseractEngine, TesserocrEngine
+
+
+class CountingEngine(OcrEngine):
+    name = "counting"
+
+    def __init__(self):
+        self.thread = threading.get_ident()
+        self.calls = 0
+        self.closed = False
+
+    def recognize(self, image):
+        assert threading.get_ident() == self.thread  # nunca compartilhada entre threads
+        self.calls += 1
+        return f"{image}"
+
+    def recognize_lines(self, image):
+        return [(self.recognize(image), (0, 0, 1, 1))]
+
+    def close(self):
+        self.closed = True
+
+
+def test_engine_must_implement_both_methods():
+    class OnlyText(OcrEngine):
+        def recognize(self, image):
+            return ""
+
+    with pytest.raises(TypeError):
+        OnlyText()
+
+
+def test_pool_keeps_one_engine_per_thread_and_closes_them():
+    pool = OcrEnginePool(CountingEngine, size=2)
+
+    async def scenario():
+        return await asyncio.gather(*(pool.run(pool.recognize, i) for i in range(20)))
+
+    assert asyncio.run(scenario()) == [str(i) for i in range(20)]
+    engines = list(pool._engines)
+    assert 1 <= len(engines) <= 2 and sum(e.calls for e in engines) == 20
+    assert len({e.thread for e in engines}) == len(engines)
+
+    # a mesma thread reaproveita a engine (o modelo continua carregado)
+    assert pool.engine() is pool.engine()
+    pool.close()
+    assert all(e.closed for e in engines) and pool._engines == []
+    assert pool.engine() not in engines  # depois do close a thread ganha uma engine nova
+    pool.close()
+
+
+def _fake_pytesseract():
+    return SimpleNamespace(image_to_string=lambda image, lang: f"{lang}:{image}")
+
+
+def test_pool_falls_back_to_pytesseract_without_tesserocr(monkeypatch):
+    monkeypatch.setattr(ocr_engines, "_try_import_tesserocr", lambda: None)
+    monkeypatch.setattr(ocr_engines, "_try_import_pytesseract", _fake_pytesseract)
+    monkeypatch.setattr(ocr_engines, "_pool", None)
+    monkeypatch.delenv("ORACLE_OCR_BACKEND", raising=False)
+
+    with pytest.raises(RuntimeError, match="tesserocr"):
+        TesserocrEngine()
+    assert ocr_engines.available_backends() == ["pytesseract"]
+    pool = ocr_engines.get_ocr_pool()
+    try:
+        assert pool.name == "pytesseract" and pool.factory is PytesseractEngine
+        assert pool.recognize("frame") == "eng:frame"
+        assert ocr_engines.get_ocr_pool() is pool
+    finally:
+        ocr_engines.close_ocr_pool()
+
+
+def test_no_backend_raises_a_clear_error(monkeypatch):
+    monkeypatch.setattr(ocr_engines, "_try_import_tesserocr", lambda: None)
+    monkeypatch.setattr(ocr_engines, "_try_import_pytesseract", lambda: None)
+    monkeypatch.setattr(ocr_engines, "_pool", None)
+    monkeypatch.delenv("ORACLE_OCR_BACKEND", raising=False)
+    with pytest.raises(RuntimeError, match="pytesseract"):
+        ocr_engines.get_ocr_pool()
+
+    monkeypatch.setenv("ORACLE_OCR_BACKEND", "easyocr")
+    with pytest.raises(RuntimeError, match="desconhecido"):
+        ocr_engines.get_ocr_pool()
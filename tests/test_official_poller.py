@@ -0,0 +1,154 @@
+import asyncio
+
+import pytest
+
+from core.nba_official import OfficialResult
+from core.official_poller import OfficialScorePoller, OfficialScoreStore, adaptive_interval
+
+
+def _result(placar=(90, 85), tempo="Q4 2:00", status="4th Qtr", ok=True):
+    home, away = placar
+    return OfficialResult(
+        ok=ok,
+        provider="balldontlie",
+        placar={"Home": home, "Away": away},
+        tempo=tempo,
+        raw={"data": {"status": status}},
+        error=None if ok else "falhou",
+    )
+
+
+@pytest.mark.parametrize(
+    "result, expected",
+    [
+        (None, 10.0),
+        (_result(ok=False), 10.0),
+        (_result(tempo="Q2 5:00"), 10.0),
+        (_result(tempo="Q4 4:59"), 2.0),  # fim apertado
+        (_result(placar=(100, 80), tempo="Q4 2:00"), 5.0),  # fim decidido
+        (_result(tempo="Q4 8:00"), 5.0),
+        (_result(tempo="Q5 1:00"), 2.0),  # prorrogação
+        (_result(status="Final"), 120.0),
+    ],
+)
+def test_adaptive_interval(result, expected):
+    assert adaptive_interval(result) == expected
+
+
+class StubClient:
+    """fetch_games de mentira: devolve o que estiver em `responses` (ou erro)."""
+
+    def __init__(self):
+        self.responses = {}
+        self.calls = []
+
+    async def fetch_games(self, game_ids):
+        self.calls.append(list(game_ids))
+        return {gid: self.responses.get(gid, _result(ok=False)) for gid in game_ids}
+
+
+def test_errors_back_off_exponentially_until_the_cap():
+    client = StubClient()
+    poller = OfficialScorePoller(client, OfficialScoreStore(), max_backoff_s=60.0)
+    game = poller.track("g1", 7)
+
+    async def scenario():
+        intervals = []
+        for _ in range(4):
+            game.next_due = 0.0
+            await poller.poll_once()
+            intervals.append(game.interval_s)
+        return intervals
+
+    # base 10s (nenhum resultado bom ainda) * 2^errors, limitado a max_backoff_s
+    assert asyncio.run(scenario()) == [20.0, 40.0, 60.0, 60.0]
+    assert game.errors == 4 and poller.store.get("g1") is None
+
+    client.responses[7] = _result(tempo="Q4 1:00")
+    game.next_due = 0.0
+    asyncio.run(poller.poll_once())
+    assert game.errors == 0 and game.interval_s == 2.0
+    assert poller.store.as_oracle_input("g1")["placar"] == {"Home": 90, "Away": 85}
+
+
+def test_backoff_grows_from_the_last_good_interval():
+    client = StubClient()
+    client.responses[7] = _result(tempo="Q4 1:00")
+    poller = OfficialScorePoller(client, OfficialScoreStore())
+    game = poller.track("g1", 7)
+    asyncio.run(poller.poll_once())
+    del client.responses[7]
+    game.next_due = 0.0
+    asyncio.run(poller.poll_once())
+    assert game.interval_s == 4.0 and game.last.tempo == "Q4 1:00"
+
+
+def test_only_due_games_are_fetched_in_one_call():
+    client = StubClient()
+    poller = OfficialScorePoller(client, OfficialScoreStore())
+    poller.track("a", 1)
+    poller.track("b", 2)
+    poller.track("c", 3).next_due = float("inf")
+    assert asyncio.run(poller.poll_once()) == 2
+    assert client.calls == [[1, 2]]
+
+
+class FakeBroker:
+    """BrokerClient de mentira: guarda o que foi encaminhado/publicado."""
+
+    connected = True
+
+    def __init__(self, reply=None):
+        self.reply = reply
+        self.requests = []
+        self.published = []
+
+    async def request(self, message, *, request_id, timeout_s):
+        self.requests.append(message)
+        return self.reply
+
+    async def claim(self, request_id):
+        return True
+
+    async def publish(self, message):
+        self.published.append(message)
+        return True
+
+
+@pytest.fixture
+def sharded(monkeypatch):
+    from backend import oracle_api
+
+    monkeypatch.setattr(oracle_api.sessions, "num_shards", 2)
+    monkeypatch.setattr(oracle_api.sessions, "shard_index", 0)
+    game_id = next(f"remote-{i}" for i in range(100) if oracle_api.sessions.shard_of(f"remote-{i}") == 1)
+    yield oracle_api, game_id
+    oracle_api.official_poller.untrack(game_id)
+
+
+def test_track_is_forwarded_to_the_owning_shard(sharded, monkeypatch):
+    oracle_api, game_id = sharded
+    broker = FakeBroker(reply={"tracked": True})
+    monkeypatch.setattr(oracle_api, "broker_client", broker)
+
+    asyncio.run(oracle_api.oracle_official_track(oracle_api.OfficialTrackRequest(game_id=game_id, official_game_id=9)))
+    assert broker.requests == [
+        {"type": "official", "action": "track", "game_id": game_id, "shard": 1, "official_game_id": 9}
+    ]
+    assert all(g.game_id != game_id for g in oracle_api.official_poller.tracked())
+
+
+def test_owner_applies_forwarded_track_and_replies(sharded, monkeypatch):
+    oracle_api, game_id = sharded
+    broker = FakeBroker()
+    monkeypatch.setattr(oracle_api, "broker_client", broker)
+    monkeypatch.setattr(oracle_api.sessions, "shard_index", 1)
+
+    message = {"type": "official", "action": "track", "game_id": game_id, "shard": 1, "official_game_id": 9}
+    asyncio.run(oracle_api._on_broker_message({**message, "request_id": "r1"}))
+    assert [g.official_game_id for g in oracle_api.official_poller.tracked() if g.game_id == game_id] == [9]
+    assert broker.published == [{"type": "official_result", "request_id": "r1", "payload": {"tracked": True}}]
+
+    # o shard mudou de dono: o poller deste worker larga o jogo
+    oracle_api._on_assign(2, 0)
+    assert all(g.game_id != game_id for g in oracle_api.official_poller.tracked())
@@ -0,0 +1,137 @@
+import asyncio
+
+from backend import oracle_api
+from backend.oracle_schema import OracleAnalyzeRequest, tick_from_v1
+
+
+def _tick(game_id, placar="93-85", tempo="Q1 05:03"):
+    return tick_from_v1(
+        OracleAnalyzeRequest(
+            game_id=game_id,
+            video_live={"placar": placar, "tempo": tempo},
+            bet365={"placar_geral": "91-85", "tempo_bet": tempo, "linhas": []},
+        )
+    )
+
+
+def test_analyze_does_not_touch_game_state():
+    result = oracle_api.analyze_tick(_tick("analyze-only"))
+    assert result["diagnostico_saas"]["tipo"]
+    assert oracle_api.sessions.get("analyze-only") is None
+
+
+def test_ingest_feeds_the_game_session():
+    async def scenario():
+        await oracle_api._process_ingest(_tick("ingest-game"))
+        return oracle_api.sessions.get("ingest-game")
+
+    session = asyncio.run(scenario())
+    assert session is not None and session.ticks == 1
+    assert session.fusion.latest("video").score == {"H": 93, "A": 85}
+    assert session.clock.stats()["running"] is not None
+
+
+def test_rejected_reading_does_not_move_the_game_clock():
+    async def scenario():
+        await oracle_api._process_ingest(_tick("clock-game", "10-8", "Q1 05:00"))
+        result = await oracle_api._process_ingest(_tick("clock-game", "10-8", "Q4 00:10"))
+        return oracle_api.sessions.get("clock-game"), result
+
+    session, result = asyncio.run(scenario())
+    assert session.clock.quarter == 1
+    assert session.timeline.quarter == 1
+    assert result["analise_live"]["tempo_video"].startswith("Q1 ")
+
+
+def test_clock_only_reading_anchors_the_game_clock():
+    async def scenario():
+        await oracle_api._process_ingest(_tick("clock-only", "10-8", "Q1 05:00"))
+        tick = tick_from_v1(OracleAnalyzeRequest(game_id="clock-only", video_live={"tempo": "Q2 07:00"}))
+        result = await oracle_api._process_ingest(tick)
+        return oracle_api.sessions.get("clock-only"), result
+
+    session, result = asyncio.run(scenario())
+    assert session.clock.quarter == 2
+    assert result["analise_live"]["tempo_video"].startswith("Q2 ")
+
+
+def test_ocr_raw_text_is_kept_on_the_video_feed(monkeypatch):
+    from core.vision_bllsport import VisionResult
+
+    async def fake_ocr(frame_base64, crop=None):
+        return VisionResult(ok=True, placar={"Home": 50, "Away": 48}, tempo_video="Q3 07:12", raw_text="Q3 07:12 50-48")
+
+    monkeypatch.setattr(oracle_api, "analyze_bllsport_frame_async", fake_ocr)
+    tick = tick_from_v1(OracleAnalyzeRequest(game_id="ocr-game", frame_base64="AAAA"))
+    asyncio.run(oracle_api._process_ingest(tick))
+    assert tick.video.ocr_raw_text == "Q3 07:12 50-48"
+    assert tick.model_dump(mode="json", exclude_defaults=True)["video"]["ocr_raw_text"] == "Q3 07:12 50-48"
+
+    v1 = tick_from_v1(OracleAnalyzeRequest(video_live={"placar": "1-0", "ocr": {"raw_text": "1-0"}}))
+    assert v1.video.ocr_raw_text == "1-0"
+
+
+def test_forwarded_tick_carries_ocr_fields_not_the_frame(monkeypatch):
+    from core.vision_bllsport import VisionResult
+
+    sent = []
+
+    class FakeBroker:
+        connected = True
+
+        async def request(self, message, *, request_id, timeout_s):
+            sent.append(message)
+            return {"ok": True}
+
+    async def fake_ocr(frame_base64, crop=None):
+        return VisionResult(ok=True, placar={"Home": 50, "Away": 48}, tempo_video="Q3 07:12", raw_text="50-48")
+
+    monkeypatch.setattr(oracle_api, "analyze_bllsport_frame_async", fake_ocr)
+    monkeypatch.setattr(oracle_api, "broker_client", FakeBroker())
+    monkeypatch.setattr(oracle_api.sessions, "num_shards", 2)
+    monkeypatch.setattr(oracle_api.sessions, "shard_index", 0)
+    game_id = next(f"remote-{i}" for i in range(100) if oracle_api.sessions.shard_of(f"remote-{i}") == 1)
+
+    tick = tick_from_v1(OracleAnalyzeRequest(game_id=game_id, frame_base64="A" * 100_000))
+    assert asyncio.run(oracle_api._ingest_one(tick)) == {"ok": True}
+    payload = sent[0]["payload"]
+    assert "frame_base64" not in payload and payload["video"]["score"] == {"H": 50, "A": 48}
+    assert payload["latency_ms"] is not None
+    assert oracle_api.OracleTickV2.model_validate(payload).video.ocr_raw_text == "50-48"
+
+
+def test_latest_etag_and_long_poll():
+    import httpx
+
+    url = "/api/oracle/latest"
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=oracle_api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://oracle") as client:
+            await oracle_api._process_ingest(_tick("latest-game"))
+            first = await client.get(url, params={"game_id": "latest-game"})
+            seq = first.json()["seq"]
+            assert first.status_code == 200 and first.headers["etag"] == f'"{oracle_api.WORKER_ID}-{seq}"'
+            assert first.json()["latest"]["game_id"] == "latest-game"
+
+            # nada mudou: o mesmo ETag devolve 304 sem corpo
+            cached = await client.get(url, params={"game_id": "latest-game"}, headers={"If-None-Match": first.headers["etag"]})
+            assert cached.status_code == 304 and cached.content == b""
+
+            # long-poll sem resultado novo: segura até o `wait` e responde 304
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            idle = await client.get(url, params={"game_id": "latest-game", "since": seq, "wait": 150})
+            assert idle.status_code == 304 and loop.time() - started >= 0.14
+
+            # long-poll acordado por um ingest novo, bem antes do `wait`
+            started = loop.time()
+            poll = asyncio.create_task(client.get(url, params={"game_id": "latest-game", "since": seq, "wait": 5000}))
+            await asyncio.sleep(0.05)
+            assert not poll.done()
+            await oracle_api._process_ingest(_tick("latest-game", "95-85"))
+            woke = await asyncio.wait_for(poll, timeout=2.0)
+            assert woke.status_code == 200 and woke.json()["seq"] > seq
+            assert woke.headers["etag"] != first.headers["etag"] and loop.time() - started < 2.0
+
+    asyncio.run(scenario())
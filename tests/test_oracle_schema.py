@@ -0,0 +1,43 @@
+import pytest
+
+from backend.oracle_schema import OracleAnalyzeRequest, OracleTickV2, make_feed, tick_from_v1
+
+# payload do test_oracle_api.py (relógio "Q05:03" sem o número do quarto)
+BASELINE = {
+    "video_live": {"placar": "93-85", "tempo": "Q1 05:03"},
+    "bet365": {
+        "placar_geral": "91-85",
+        "tempo_bet": "Q1 05:03",
+        "linhas": ["Q05:03 R$L Mag 2pts 1.40 ✓REGISTROU"],
+    },
+    "system": {"status_stream": "OK"},
+}
+
+HOSTILE = [
+    BASELINE,
+    {"video_live": {"placar": "93-85", "tempo": "Q05:03"}},
+    {"video_live": {"placar": "93-85", "tempo": "Q1 15:00", "confianca": 7}},
+    {"video_live": {"placar": {"H": 400, "A": 12}, "tempo": "Q1 05:03", "confianca": "alta"}},
+    {"bet365": {"placar": {"Home": -3, "Away": 2}, "tempo": "Q0 01:00"}},
+    {"fallback": {"home": 10, "away": 8, "tempo": "Q9 99:99", "latencia_ms": "lento"}},
+    {"frame_base64": "AAAA", "frame_crop": {"x": -5, "y": "10", "w": 100, "h": 40}},
+    {"frame_base64": "AAAA", "frame_crop": {"x": "a"}},
+    {"system": {"status_stream": 1, "stream_error": 404, "latencia_ms": float("nan")}},
+    {"game_id": "g1", "video_live": {"placar": "1-0", "ocr": {"raw_text": "x" * 5000}}},
+]
+
+
+@pytest.mark.parametrize("payload", HOSTILE)
+def test_v1_ticks_round_trip_through_the_v2_model(payload):
+    tick = tick_from_v1(OracleAnalyzeRequest.model_validate(payload))
+    # mesmo caminho do encaminhamento pelo broker
+    dumped = tick.model_dump(mode="json", exclude_defaults=True)
+    assert OracleTickV2.model_validate(dumped).model_dump(mode="json", exclude_defaults=True) == dumped
+
+
+def test_out_of_range_values_are_dropped_or_clamped():
+    feed = make_feed("93-85", "Q05:03", confidence=7)
+    assert feed.clock is None and feed.clock_raw == "Q05:03"
+    assert feed.confidence == 1.0
+    assert make_feed({"H": 400, "A": 1}, None) is None
+    assert make_feed("10-8", "Q2 11:59").clock.label == "Q2 11:59"
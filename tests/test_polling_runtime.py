@@ -0,0 +1,106 @@
+import asyncio
+import time
+
+from core.polling_runtime import LatestStore, PolledSource, PollingRuntime, configured_source
+from integrations.scrapers.bet365_scraper import Bet365Scraper
+from integrations.scrapers.flashscore_scraper import FlashscoreScraper
+
+
+class FakeSource:
+    """Fonte de mentira: falha nas primeiras `fail` chamadas e anota o instante de cada uma."""
+
+    def __init__(self, fail=0, value="ok", delay_s=0.0):
+        self.fail = fail
+        self.value = value
+        self.delay_s = delay_s
+        self.calls = []
+
+    async def __call__(self):
+        self.calls.append(time.monotonic())
+        if self.delay_s:
+            await asyncio.sleep(self.delay_s)
+        if len(self.calls) <= self.fail:
+            raise RuntimeError("scrape falhou")
+        return self.value
+
+
+async def _run_for(runtime, seconds):
+    runtime.start()
+    await asyncio.sleep(seconds)
+    await runtime.stop()
+
+
+def test_errors_back_off_exponentially_and_are_logged(capsys):
+    fake = FakeSource(fail=3)
+    runtime = PollingRuntime()
+    runtime.add(PolledSource("fake", fake, interval_s=0.5, error_backoff_s=0.02))
+    asyncio.run(_run_for(runtime, 0.3))
+
+    gaps = [b - a for a, b in zip(fake.calls, fake.calls[1:4])]
+    assert [round(g, 2) >= e for g, e in zip(gaps, (0.02, 0.04, 0.08))] == [True, True, True]
+    stats = runtime.stats()["fake"]
+    assert stats["errors"] == 3 and stats["consecutive_errors"] == 0
+    assert runtime.store.value("fake") == "ok"
+    assert capsys.readouterr().out.count("❌ fake error: RuntimeError: scrape falhou") == 3
+
+
+def test_backoff_exponent_is_capped():
+    async def scenario():
+        runtime = PollingRuntime()
+        runtime.add(PolledSource("fake", FakeSource(fail=10**9), error_backoff_s=0.0, max_backoff_s=0.0))
+        runtime._stats["fake"].consecutive_errors = 5000  # 2 ** 4999 estouraria o float
+        runtime.start()
+        await asyncio.sleep(0.05)
+        task = runtime._tasks["fake"]
+        assert not task.done()
+        await runtime.stop()
+        return runtime.stats()["fake"]
+
+    stats = asyncio.run(scenario())
+    assert stats["consecutive_errors"] > 5000
+
+
+def test_timeout_counts_as_error():
+    runtime = PollingRuntime()
+    runtime.add(PolledSource("slow", FakeSource(delay_s=1.0), timeout_s=0.02, error_backoff_s=0.5))
+    asyncio.run(_run_for(runtime, 0.1))
+    stats = runtime.stats()["slow"]
+    assert stats["timeouts"] == 1 and stats["last_error"] == "timeout (0.02s)"
+
+
+def test_interval_comes_from_the_config_getter():
+    settings = {"scrapers.fake.interval_seconds": 0.05}
+    source = configured_source(
+        "fake", FakeSource(), lambda key, default: settings.get(key, default), prefix="scrapers.fake",
+        interval_s=1.0, error_backoff_s=1.0,
+    )
+    runtime = PollingRuntime()
+    runtime.add(source)
+    assert runtime.stats()["fake"]["interval_s"] == 0.05
+    settings["scrapers.fake.interval_seconds"] = 0.2
+    assert runtime.stats()["fake"]["interval_s"] == 0.2
+
+
+def test_scrapers_share_one_injected_runtime():
+    async def scenario():
+        store = LatestStore()
+        runtime = PollingRuntime(store=store)
+        settings = {"scrapers.bet365.interval_seconds": 0.01, "scrapers.flashscore.interval_seconds": 0.01}
+        config = lambda key, default: settings.get(key, default)  # noqa: E731
+        bet365 = Bet365Scraper(runtime=runtime, config=config)
+        flashscore = FlashscoreScraper(runtime=runtime, config=config)
+        bet365.fetch_odds = FakeSource(value={"linhas": []})
+        flashscore.fetch_score = FakeSource(value={"home": 1, "away": 0})
+        runtime.start()
+        await bet365.start()
+        await flashscore.start()
+        await asyncio.sleep(0.05)
+        assert bet365.runtime is flashscore.runtime is runtime
+        assert store.value("bet365") == {"linhas": []}
+        assert store.value("flashscore") == {"home": 1, "away": 0}
+
+        await bet365.stop()  # tira só a fonte dele; o runtime segue com a outra
+        assert set(runtime._tasks) == {"flashscore"}
+        await runtime.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+from backend.prompt_registry import PromptRegistry
+
+
+def _edit(path, data, *, bump_ns=1_000_000_000):
+    # mtime explícito: duas escritas no mesmo tick do relógio do FS teriam o mesmo mtime_ns
+    stat = path.stat()
+    path.write_bytes(data)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + bump_ns))
+
+
+@pytest.fixture
+def registry(tmp_path):
+    path = tmp_path / "ORACLE_PROMPT_PRINCIPAL.txt"
+    path.write_text("versão 1", encoding="utf-8")
+    registry = PromptRegistry(revalidate_interval_s=0.0)
+    registry.register("principal", path)
+    return registry, path
+
+
+def test_edit_is_picked_up_and_old_version_listed(registry):
+    registry, path = registry
+    first = registry.get("principal")
+    assert registry.get("principal") is first  # sem mudança: nada é relido
+
+    _edit(path, "versão 2, mais longa".encode("utf-8"))
+    second = registry.get("principal")
+    assert second.text == "versão 2, mais longa" and second.sha256 != first.sha256
+    assert [v["sha256"] for v in registry.versions("principal")] == [first.sha256, second.sha256]
+    assert registry.version("principal", first.sha256).text == "versão 1"
+
+
+def test_revalidation_is_throttled(registry):
+    registry, path = registry
+    registry.revalidate_interval_s = 3600.0
+    first = registry.get("principal")
+    _edit(path, b"outra coisa")
+    assert registry.get("principal") is first
+
+
+def test_invalid_edit_keeps_last_good_version(registry, capsys):
+    registry, path = registry
+    good = registry.get("principal")
+
+    _edit(path, b"\xff\xfe quebrado")
+    assert registry.get("principal") is good
+    _edit(path, b"   \n", bump_ns=2_000_000_000)
+    assert registry.get("principal") is good
+    assert registry.get("principal") is good
+    assert capsys.readouterr().out.count("❌ Prompt inválido") == 2
+
+    _edit(path, "consertado".encode("utf-8"), bump_ns=3_000_000_000)
+    assert registry.get("principal").text == "consertado"
+
+
+def test_invalid_first_load_and_unknown_name(tmp_path):
+    path = tmp_path / "vazio.txt"
+    path.write_text("", encoding="utf-8")
+    registry = PromptRegistry()
+    registry.register("vazio", path)
+    with pytest.raises(RuntimeError, match="Prompt inválido"):
+        registry.get("vazio")
+    with pytest.raises(KeyError):
+        registry.get("nenhum")
@@ -0,0 +1,180 @@
+import asyncio
+import time
+
+from backend import pubsub_broker
+from backend.pubsub_broker import BrokerClient, PubSubBroker
+
+
+async def _until(predicate, timeout_s=3.0):
+    deadline = time.monotonic() + timeout_s
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condição não atingida a tempo")
+        await asyncio.sleep(0.01)
+
+
+def _client(address, worker_id, on_message=None, **kwargs):
+    async def ignore(message):
+        pass
+
+    return BrokerClient(address, worker_id=worker_id, on_message=on_message or ignore, reconnect_s=0.05, **kwargs)
+
+
+def test_another_worker_takes_over_the_broker(tmp_path):
+    address = f"unix:{tmp_path / 'broker.sock'}"
+
+    async def scenario():
+        first = _client(address, "a", host_shards=2)
+        first.start()
+        await _until(lambda: first.connected)
+        second = _client(address, "b", host_shards=2)
+        second.start()
+        await _until(lambda: second.connected)
+        assert first.hosted is not None and second.hosted is None
+
+        await first.stop()  # host "morreu"
+        await _until(lambda: second.hosted is not None and second.connected)
+        assert second.shard_index == 0
+        await second.stop()
+
+    asyncio.run(scenario())
+
+
+def test_forward_is_acked_once_and_duplicates_are_dropped(tmp_path):
+    address = f"unix:{tmp_path / 'broker.sock'}"
+    handled = []
+
+    async def scenario():
+        async def on_owner(message):
+            if message.get("type") != "ingest":
+                return
+            if not await owner.claim(message["request_id"]):
+                return
+            handled.append(message["request_id"])
+            await owner.publish({"type": "result", "request_id": message["request_id"], "payload": {"ok": True}})
+
+        async def on_sender(message):
+            if message.get("type") == "result":
+                sender.resolve(message["request_id"], message["payload"])
+
+        owner = _client(address, "owner", on_owner, host_shards=2)
+        sender = _client(address, "sender", on_sender)
+        owner.start()
+        await _until(lambda: owner.connected)
+        sender.start()
+        await _until(lambda: sender.connected)
+
+        result = await sender.request({"type": "ingest"}, request_id="r1", timeout_s=2.0)
+        assert result == {"ok": True}
+        # o mesmo id entregue de novo é descartado pelo dono
+        await sender.publish({"type": "ingest", "request_id": "r1"})
+        await asyncio.sleep(0.1)
+        assert handled == ["r1"]
+        await sender.stop()
+        await owner.stop()
+
+    asyncio.run(scenario())
+
+
+def test_unclaimed_forward_is_cancelled(tmp_path):
+    address = f"unix:{tmp_path / 'broker.sock'}"
+
+    async def scenario():
+        sender = _client(address, "sender", host_shards=1)
+        late = _client(address, "late")
+        sender.start()
+        late.start()
+        await _until(lambda: sender.connected and late.connected)
+        # ninguém aceita: volta None (quem chamou processa localmente) e o id fica cancelado
+        assert await sender.request({"type": "ingest"}, request_id="r2", timeout_s=1.0, ack_timeout_s=0.1) is None
+        await asyncio.sleep(0.1)
+        assert not await late.claim("r2")
+        await late.stop()
+        await sender.stop()
+
+    asyncio.run(scenario())
+
+
+class SlowWriter:
+    def __init__(self, delay_s):
+        self.delay_s = delay_s
+        self.lines = []
+        self.closed = False
+
+    def write(self, line):
+        self.lines.append(line)
+
+    async def drain(self):
+        await asyncio.sleep(self.delay_s)
+
+    def close(self):
+        self.closed = True
+
+
+def test_fanout_drains_subscribers_concurrently():
+    async def scenario():
+        broker = PubSubBroker("unix:/unused", drain_timeout_s=0.5)
+        sender = SlowWriter(0.0)
+        slow = [SlowWriter(0.2) for _ in range(4)]
+        stuck = SlowWriter(10.0)
+        for writer in (sender, *slow, stuck):
+            broker._clients[writer] = None
+        started = time.monotonic()
+        await broker._fanout(b"x\n", sender=sender)
+        elapsed = time.monotonic() - started
+        assert elapsed < 0.8  # 4 x 0.2s + 10s se fosse em série
+        assert all(w.lines == [b"x\n"] for w in slow) and not sender.lines
+        # assinante travado é desconectado
+        assert stuck.closed and stuck not in broker._clients
+
+    asyncio.run(scenario())
+
+
+def _echo_pair(address, received):
+    async def on_message(message):
+        received.append(message)
+
+    return _client(address, "sender", host_shards=1), _client(address, "receiver", on_message)
+
+
+def test_payload_larger_than_64k_is_forwarded(tmp_path):
+    address = f"unix:{tmp_path / 'broker.sock'}"
+    received = []
+
+    async def scenario():
+        sender, receiver = _echo_pair(address, received)
+        sender.start()
+        await _until(lambda: sender.connected)
+        receiver.start()
+        await _until(lambda: receiver.connected)
+        big = "x" * (512 * 1024)
+        assert await sender.publish({"type": "ingest", "payload": {"frame_base64": big}})
+        await _until(lambda: received)
+        assert received[0]["payload"]["frame_base64"] == big
+        await receiver.stop()
+        await sender.stop()
+
+    asyncio.run(scenario())
+
+
+def test_line_over_the_limit_is_dropped_and_connection_survives(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(pubsub_broker, "MAX_LINE_BYTES", 128 * 1024)
+    address = f"unix:{tmp_path / 'broker.sock'}"
+    received = []
+
+    async def scenario():
+        sender, receiver = _echo_pair(address, received)
+        sender.start()
+        await _until(lambda: sender.connected)
+        receiver.start()
+        await _until(lambda: receiver.connected)
+        await sender.publish({"type": "ingest", "payload": "x" * (300 * 1024)})
+        await sender.publish({"type": "result", "n": 1})
+        await _until(lambda: received)
+        assert [m["type"] for m in received] == ["result"]
+        assert sender.connected and receiver.connected
+        await receiver.stop()
+        await sender.stop()
+
+    asyncio.run(scenario())
+    assert "linha acima de 131072 bytes descartada" in capsys.readouterr().out
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from backend.runtime_config import DEFAULT_CONFIG, RuntimeConfig
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    return tmp_path / "config.json"
+
+
+def _config(config_path, tmp_path):
+    return RuntimeConfig(config_path, history_dir=tmp_path / "history", poll_interval_s=0)
+
+
+def _write(path, data):
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_start_logs_keys_that_differ_from_defaults(config_path, tmp_path, capsys):
+    _write(config_path, {"gemini_model": "gemini-2.5-pro", "scrapers": {"bet365": {"interval_seconds": 1.0}}})
+    config = _config(config_path, tmp_path)
+    assert config.overrides() == {"gemini_model": "gemini-2.5-pro"}
+    config.start()
+    config.start()
+    out = capsys.readouterr().out
+    assert out.count("difere dos defaults") == 1
+    assert "gemini_model='gemini-2.5-pro'" in out and "bet365" not in out
+
+
+def test_defaults_only_logs_nothing(config_path, tmp_path, capsys):
+    config = _config(config_path, tmp_path)
+    config.start()
+    assert config.overrides() == {}
+    assert config.current.get("gemini_model") == DEFAULT_CONFIG["gemini_model"]
+    assert capsys.readouterr().out == ""
+
+
+def test_reload_swaps_snapshot_and_notifies(config_path, tmp_path, capsys):
+    _write(config_path, {})
+    config = _config(config_path, tmp_path)
+    config.start()
+    seen = []
+    config.subscribe(seen.append)
+    before = config.current
+
+    _write(config_path, {"scrapers": {"bllsport": {"interval_seconds": 0.5}}})
+    assert config.reload(force=True)
+    assert config.current.get("scrapers.bllsport.interval_seconds") == 0.5
+    assert before.get("scrapers.bllsport.interval_seconds") == 0.3  # versão antiga intacta
+    assert [s.version for s in seen] == [before.version, config.current.version]
+    assert "scrapers.bllsport.interval_seconds=0.5" in capsys.readouterr().out
+
+    # JSON inválido mantém a versão anterior
+    config_path.write_text("{", encoding="utf-8")
+    assert not config.reload(force=True)
+    assert config.current.get("scrapers.bllsport.interval_seconds") == 0.5
+    assert config.last_error
+
+
+def test_apply_and_rollback_through_history(config_path, tmp_path):
+    _write(config_path, {"gemini_model": "a"})
+    config = _config(config_path, tmp_path)
+    first = config.history.entries()[0]["version"]
+    config.apply({"gemini_model": "b"})
+    assert config.current.get("gemini_model") == "b"
+    config.rollback(first)
+    assert config.current.get("gemini_model") == "a"
+    assert json.loads(config_path.read_text(encoding="utf-8")) == {"gemini_model": "a"}
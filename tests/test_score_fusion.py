@@ -0,0 +1,38 @@
+from core.score_fusion import ScoreFusion
+
+
+def test_agreeing_sources_outvote_a_single_reader():
+    fusion = ScoreFusion()
+    fusion.update("video", "93-85", "Q2 05:03", observed_at=100.0)
+    fusion.update("official", {"H": 91, "A": 85}, "Q2 05:10", observed_at=100.0)
+    fusion.update("fallback", "91-85", None, observed_at=100.0)
+    fused = fusion.fuse(now=100.0)
+    assert fused.score == {"H": 91, "A": 85}
+    assert fused.clock == "Q2 05:10"
+    assert sorted(fused.sources) == ["fallback", "official"]
+    assert 0.5 < fused.confidence < 1.0
+
+
+def test_stale_sources_drop_out_of_the_vote():
+    fusion = ScoreFusion(stale_after_s=30.0)
+    fusion.update("official", "91-85", observed_at=0.0)
+    fusion.update("video", "93-85", observed_at=40.0)
+    fused = fusion.fuse(now=40.0)
+    assert fused.score == {"H": 93, "A": 85}
+    assert fused.weights["official"] == 0.0
+
+
+def test_tie_prefers_the_higher_score():
+    fusion = ScoreFusion(reliability={"video": 1.0, "official": 1.0})
+    fusion.update("video", "93-85", observed_at=0.0)
+    fusion.update("official", "91-85", observed_at=0.0)
+    assert fusion.fuse(now=0.0).score == {"H": 93, "A": 85}
+
+
+def test_snapshot_round_trip():
+    fusion = ScoreFusion()
+    fusion.update("video", "10-8", "Q1 10:00", observed_at=5.0, confidence=0.8)
+    restored = ScoreFusion()
+    restored.restore(fusion.snapshot(wall_offset=1000.0), wall_offset=1000.0)
+    assert restored.latest("video") == fusion.latest("video")
+    assert restored.fuse(now=5.0).score == fusion.fuse(now=5.0).score
@@ -0,0 +1,73 @@
+import asyncio
+
+from backend.game_sessions import GameSessionManager, shard_for
+from backend.session_snapshot import SessionSnapshotter, read_snapshot, shard_path
+
+
+def _games_per_shard(num_shards):
+    games = {}
+    i = 0
+    while len(games) < num_shards:
+        game_id = f"game-{i}"
+        games.setdefault(shard_for(game_id, num_shards), game_id)
+        i += 1
+    return [games[s] for s in range(num_shards)]
+
+
+def _worker(base, shard):
+    sessions = GameSessionManager(num_shards=shard[0], shard_index=shard[1])
+    return sessions, SessionSnapshotter(sessions, base, interval_s=0, shard=shard)
+
+
+def test_each_shard_writes_its_own_file_with_its_own_games(tmp_path):
+    base = tmp_path / "sessions.json.gz"
+    g0, g1 = _games_per_shard(2)
+    for index in (0, 1):
+        sessions, snapshotter = _worker(base, (2, index))
+        # o worker também guarda o último resultado dos jogos do outro shard (vindo do broker)
+        for game_id in (g0, g1):
+            sessions.record(game_id, {"game_id": game_id})
+        sessions.session(game_id).timeline.observe("10-8", "Q1 05:00", observed_at=1.0)
+        asyncio.run(snapshotter.save())
+
+    for index, game_id in enumerate((g0, g1)):
+        state = read_snapshot(shard_path(base, index))
+        assert [g["game_id"] for g in state["sessions"]["games"]] == [game_id]
+    assert not base.exists()
+
+
+def test_restore_brings_back_only_owned_games(tmp_path):
+    base = tmp_path / "sessions.json.gz"
+    g0, g1 = _games_per_shard(2)
+    for index, game_id in enumerate((g0, g1)):
+        sessions, snapshotter = _worker(base, (2, index))
+        sessions.record(game_id, {"game_id": game_id, "placar": index})
+        asyncio.run(snapshotter.save())
+
+    sessions = GameSessionManager(num_shards=2, shard_index=None)
+    snapshotter = SessionSnapshotter(sessions, base, interval_s=0, shard=None)
+    assert snapshotter.restore() == 0  # shard ainda não chegou do broker
+    assert snapshotter.assign(2, 1) == 1
+    assert sessions.get(g1).latest == {"game_id": g1, "placar": 1}
+    assert sessions.get(g0) is None
+    assert snapshotter.path == shard_path(base, 1)
+
+
+def test_restore_after_resharding_and_keeps_live_sessions(tmp_path):
+    base = tmp_path / "sessions.json.gz"
+    games = _games_per_shard(2)
+    sessions, snapshotter = _worker(base, (2, 0))
+    for game_id in games:
+        sessions.record(game_id, {"game_id": game_id, "old": True})
+    snapshotter.shard = (1, 0)  # um worker só: todos os jogos são dele
+    asyncio.run(snapshotter.save())
+
+    sessions, snapshotter = _worker(base, (2, 1))
+    sessions.record(games[1], {"game_id": games[1], "old": False})
+    assert snapshotter.restore() == 0  # o jogo do shard 1 já tem sessão viva
+    assert sessions.get(games[1]).latest["old"] is False
+    assert sessions.get(games[0]) is None
+
+    fresh, snapshotter = _worker(base, (2, 1))
+    assert snapshotter.restore() == 1  # veio do arquivo do shard 0 da configuração antiga
+    assert fresh.get(games[1]).latest["old"] is True